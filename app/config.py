@@ -62,6 +62,12 @@ class Settings(BaseSettings):
     # ---- Scheduling ----
     check_interval_hours: int = 24
 
+    # ---- Scraping ----
+    fast_html_extractor: bool = False  # lxml walker instead of html2text
+
+    # ---- Diffs ----
+    store_full_diff: bool = True  # False keeps only the unified-diff excerpt
+
     # ---- Rate Limiting ----
     rate_limit_requests: int = 60  # Max requests per window
     rate_limit_window: int = 60  # Window in seconds
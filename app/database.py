@@ -100,12 +100,13 @@ def _col_default_sql(col) -> str:
 
 
 def _auto_migrate_sqlite():
-    """Add missing columns to existing SQLite tables.
+    """Add missing columns and indexes to existing SQLite tables.
 
     SQLAlchemy's ``create_all`` only creates new tables — it won't add
-    columns to tables that already exist.  This function inspects the
-    model metadata and issues ``ALTER TABLE ADD COLUMN`` for any columns
-    missing from the live schema.  Safe to call on every startup.
+    columns or indexes to tables that already exist.  This function
+    inspects the model metadata and issues ``ALTER TABLE ADD COLUMN`` /
+    ``CREATE INDEX`` for anything missing from the live schema.  Safe to
+    call on every startup.
     """
     from sqlalchemy import inspect as sa_inspect, text
 
@@ -124,6 +125,12 @@ def _auto_migrate_sqlite():
                 sql = f'ALTER TABLE {table_name} ADD COLUMN {col.name} {col_type} {nullable}{default}'
                 logger.info(f"Auto-migrate: {sql}")
                 conn.execute(text(sql))
+
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table_name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    logger.info(f"Auto-migrate: CREATE INDEX {index.name}")
+                    index.create(conn)
         conn.commit()
 
 
@@ -24,6 +24,8 @@ from app.routers.auth import router as auth_router
 from app.routers.users import router as users_router
 from app.services.scheduler import start_scheduler, stop_scheduler
 from app.services.pipeline import check_all_policies
+from app.services.notifier import close_notifier
+from app.services.scraper import init_scraper, close_scraper
 from app.middleware.request_logging import RequestLoggingMiddleware
 
 # Configure logging
@@ -44,6 +46,7 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown lifecycle."""
     logger.info("PolicyDiff starting up...")
     init_db()
+    init_scraper()
 
     if settings.api_key:
         logger.info("Authentication enabled (API_KEY is set)")
@@ -55,6 +58,8 @@ async def lifespan(app: FastAPI):
     yield
 
     stop_scheduler()
+    await close_notifier()
+    await close_scraper()
     logger.info("PolicyDiff shut down")
 
 
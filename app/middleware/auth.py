@@ -55,7 +55,7 @@ def _verify_bearer(token: str) -> Optional[str]:
     settings = get_settings()
 
     # Direct API key match
-    if settings.api_key and token == settings.api_key:
+    if settings.api_key and hmac.compare_digest(token, settings.api_key):
         return "api-key"
 
     # HMAC-based bearer token (issued by API key login or Google OAuth)
@@ -14,8 +14,9 @@ from sqlalchemy import (
     Boolean,
     Float,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.database import Base
 from app.utils.datetime_helpers import utcnow
@@ -93,6 +94,12 @@ class Policy(Base):
     __tablename__ = "policies"
     __table_args__ = (
         UniqueConstraint("url", "owner_id", name="uq_policy_url_owner"),
+        # Partial index for the scheduler's "due active policies" scan
+        Index(
+            "ix_policies_active_next_check", "next_check_at",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -106,6 +113,7 @@ class Policy(Base):
     is_active = Column(Boolean, default=True, index=True)
     check_interval_hours = Column(Integer, default=24)
     next_check_at = Column(DateTime(timezone=True), nullable=True)  # Per-policy scheduling
+    consecutive_failures = Column(Integer, default=0)  # Failed checks in a row (retry backoff)
     seed_status = Column(
         String(20), default="none"
     )  # none | seeding | seeded | seed_failed
@@ -138,16 +146,29 @@ class Snapshot(Base):
     __table_args__ = (
         Index("ix_snapshots_policy_captured", "policy_id", "captured_at"),
         Index("ix_snapshots_content_hash", "content_hash"),
+        Index("ix_snapshots_policy_hash", "policy_id", "content_hash"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
     policy_id = Column(Integer, ForeignKey("policies.id"), nullable=False, index=True)
-    content_text = Column(Text, nullable=False)
+    # Deferred: listings and timelines only need metadata, so the full text
+    # (often 10-100KB per row) is loaded only when explicitly accessed
+    content_text = deferred(Column(Text, nullable=False))
     content_hash = Column(String(64), nullable=False)
     content_length = Column(Integer, default=0)
     discovered_links = Column(Text, nullable=True)  # JSON array
     captured_at = Column(DateTime(timezone=True), default=utcnow)
     is_seed = Column(Boolean, default=False)
+    # HTTP validators from the live fetch, sent back as If-None-Match /
+    # If-Modified-Since so an unchanged page costs a bodiless 304
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    # SHA-256 of the fetched HTML bytes: an identical body means identical
+    # extracted text, so the next check can skip parsing entirely
+    raw_hash = Column(String(64), nullable=True)
+    # CDX digest of the archived capture a Wayback seed came from, so later
+    # seeds skip captures that are already stored
+    wayback_digest = Column(String(64), nullable=True)
 
     # Relationships
     policy = relationship("Policy", back_populates="snapshots")
@@ -209,3 +230,36 @@ class Diff(Base):
     old_snapshot = relationship("Snapshot", foreign_keys=[old_snapshot_id], back_populates="diffs_as_old")
     new_snapshot = relationship("Snapshot", foreign_keys=[new_snapshot_id], back_populates="diffs_as_new")
     policy = relationship("Policy")
+
+
+class AnalysisCache(Base):
+    """An LLM analysis keyed by a hash of exactly what the LLM was shown.
+
+    Lets identical diffs (a change rolled out across regional copies of a
+    policy, or a change that is reverted and re-applied) skip the LLM call.
+    """
+
+    __tablename__ = "analysis_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 hex of the analysis inputs
+    summary = Column(Text)
+    severity = Column(String(20))
+    severity_score = Column(Float)
+    key_changes = Column(Text)  # JSON
+    recommendation = Column(Text)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+
+
+class WaybackExtraction(Base):
+    """Extracted text of an archived Wayback capture, keyed by its CDX digest.
+
+    Archived captures never change, so a re-seed can reuse the text instead
+    of fetching and parsing the page again.
+    """
+
+    __tablename__ = "wayback_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 hex of digest + URL + extractor
+    content_text = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
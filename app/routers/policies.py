@@ -21,6 +21,7 @@ from app.middleware.auth import require_auth, get_user_id
 from app.middleware.rate_limit import rate_limit
 from app.models import Policy, Snapshot, Diff
 from app.schemas import PolicyCreate, PolicyUpdate, PolicyResponse
+from app.services.differ import clear_diff_cache
 from app.services.wayback import seed_from_wayback
 
 logger = logging.getLogger(__name__)
@@ -208,6 +209,7 @@ def delete_policy(
 
     db.delete(policy)
     db.commit()
+    clear_diff_cache()
 
 
 @router.post("/{policy_id}/seed-wayback")
@@ -6,7 +6,7 @@ All routes use synchronous ``def`` to avoid blocking the event loop with DB call
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from app.database import get_db
 from app.middleware.auth import require_auth, get_user_id
@@ -51,6 +51,7 @@ def get_snapshot(
     """Get a snapshot with full content."""
     snapshot = (
         db.query(Snapshot)
+        .options(undefer(Snapshot.content_text))
         .filter(Snapshot.id == snapshot_id, Snapshot.policy_id == policy_id)
         .first()
     )
@@ -29,6 +29,7 @@ from app.schemas import (
     GDPRExportResponse,
     PolicyResponse,
 )
+from app.services.differ import clear_diff_cache
 from app.utils.security import generate_bearer_token
 from app.utils.datetime_helpers import utcnow
 
@@ -490,6 +491,7 @@ def delete_account(request: Request, db: Session = Depends(get_db)):
     # Cascade delete handles follows + preferences
     db.delete(user)
     db.commit()
+    clear_diff_cache()
 
     logger.info(f"User account deleted (GDPR erasure): {email}")
     return {
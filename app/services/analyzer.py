@@ -4,17 +4,23 @@ Features:
   - Retry logic with exponential backoff (3 attempts) for transient OpenAI failures
   - Global semaphore for LLM burst control (configurable via LLM_MAX_CONCURRENT)
   - Increased truncation limits for better analysis of large policy changes
+  - Batch mode: several policies' diffs analysed in one completion request
+  - Exact-match response cache (analysis_cache table) keyed on the LLM inputs
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import random
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
 from openai import AsyncOpenAI
 
 from app.config import settings
+from app.database import get_scoped_session
+from app.models import AnalysisCache
+from app.services.differ import changed_lines
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +57,69 @@ Severity guide:
 - "concerning" (0.3-0.7): Changes that expand data collection, modify user rights, alter sharing practices, or weaken protections
 - "action-needed" (0.7-1.0): Major changes requiring user action — new data selling, removed opt-out rights, mandatory arbitration, significant privacy erosion
 
-Always be specific about WHAT changed and WHY it matters. Avoid legal jargon. Write as if explaining to a friend."""
+Always be specific about WHAT changed and WHY it matters. Avoid legal jargon. Write as if explaining to a friend.
+
+## Reference examples
+
+The examples below show the expected tone, level of detail, and severity calibration. They are illustrative only — never copy their wording, and base every analysis strictly on the changes you are given.
+
+Example 1 — a wording cleanup:
+Changes: The "Contact Us" section was rewritten to list a new mailing address and a support email. The "Definitions" section fixed several typos and reordered two definitions alphabetically. No clauses about data collection, sharing, or user rights were touched.
+Response:
+{
+  "summary": "The company updated its contact details and tidied up the wording of its definitions. Nothing about what data they collect, how they use it, or what rights you have has changed.",
+  "severity": "informational",
+  "severity_score": 0.1,
+  "key_changes": [
+    "New mailing address and support email for privacy questions",
+    "Typos fixed and definitions reordered — meaning unchanged"
+  ],
+  "recommendation": "No action needed. You may want to note the new contact email if you ever need to reach their privacy team."
+}
+
+Example 2 — expanded data collection and sharing:
+Changes: A new clause states the service now collects precise location data "to improve recommendations". The "How We Share Information" section adds "advertising and analytics partners" to the list of recipients. The data retention period changed from "12 months" to "as long as necessary for business purposes".
+Response:
+{
+  "summary": "The company now collects your precise location and shares your information with advertising and analytics partners. They also replaced a clear 12-month retention limit with an open-ended one, so your data may be kept indefinitely.",
+  "severity": "concerning",
+  "severity_score": 0.6,
+  "key_changes": [
+    "Precise location data is now collected to personalise recommendations",
+    "Your information can now be shared with advertising and analytics partners",
+    "Data retention changed from 12 months to 'as long as necessary' — no fixed limit"
+  ],
+  "recommendation": "Review your location permissions for this app and check whether it offers an advertising opt-out in its privacy settings."
+}
+
+Example 3 — loss of rights and new AI training use:
+Changes: A new "Dispute Resolution" section requires binding individual arbitration and waives participation in class actions. The "Your Choices" section removed the sentence "You may opt out of the sale of your personal information at any time." A new clause says user content "may be used to train our machine learning models".
+Response:
+{
+  "summary": "You can no longer take the company to court or join a class action — disputes must go through private arbitration. The option to opt out of the sale of your data was removed, and your content can now be used to train their AI models.",
+  "severity": "action-needed",
+  "severity_score": 0.9,
+  "key_changes": [
+    "Mandatory individual arbitration added; class-action lawsuits are waived",
+    "The right to opt out of the sale of your personal information was removed",
+    "Your content may now be used to train the company's AI models"
+  ],
+  "recommendation": "Check whether the company offers an arbitration opt-out window (often 30 days) and act on it, and consider deleting content you do not want used for AI training."
+}
+
+## Calibration notes
+
+- Judge severity by the effect on the user, not by the amount of text that changed. A one-sentence removal of an opt-out right outweighs pages of reformatting.
+- When several changes are present, the most serious one sets the overall severity.
+- If the diff contains only navigation text, boilerplate, or formatting noise, say so plainly and rate it informational.
+- Mention concrete data types (location, contacts, biometrics, payment details) and concrete recipients (advertisers, affiliates, government) whenever the policy names them.
+- Keep each key change to a single sentence and list at most eight of them."""
+
+# SYSTEM_PROMPT must stay a byte-identical module constant: OpenAI caches
+# prompt prefixes of 1024+ tokens, and the examples above keep it past that
+# threshold.  All per-call data (company, counts, clauses, diff) belongs in
+# the user message built from ANALYSIS_PROMPT_TEMPLATE — never template the
+# system prompt, or every call becomes a cache miss.
 
 
 ANALYSIS_PROMPT_TEMPLATE = """Analyze the following changes to the {policy_type} for {company} ({policy_name}).
@@ -97,30 +165,39 @@ async def analyze_diff(
         logger.warning("No OpenAI API key configured — returning default analysis")
         return _fallback_analysis(clauses_added, clauses_removed, clauses_modified)
 
+    key = analysis_cache_key(policy_type, diff_text, clauses_added, clauses_removed, clauses_modified)
+    cached = await asyncio.to_thread(_load_cached_analyses, [key])
+    if key in cached:
+        logger.info(f"Analysis cache hit for {policy_name}")
+        return cached[key]
+
     # Acquire semaphore to limit concurrent LLM calls
     sem = _get_llm_semaphore()
     await sem.acquire()
     try:
-        return await _call_llm(
+        result = await _call_llm(
             policy_name, company, policy_type, diff_text,
             clauses_added, clauses_removed, clauses_modified,
         )
     finally:
         sem.release()
 
+    if result is None:
+        return _fallback_analysis(clauses_added, clauses_removed, clauses_modified)
+    await asyncio.to_thread(_store_analyses, {key: result})
+    return result
 
-async def _call_llm(
+
+def _build_prompt(
     policy_name: str, company: str, policy_type: str, diff_text: str,
     clauses_added: str, clauses_removed: str, clauses_modified: str,
-) -> Dict:
-    """Internal LLM call with retry logic. Called under semaphore."""
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-
+) -> str:
+    """Render the per-policy user message from ANALYSIS_PROMPT_TEMPLATE."""
     added = json.loads(clauses_added) if clauses_added else []
     removed = json.loads(clauses_removed) if clauses_removed else []
     modified = json.loads(clauses_modified) if clauses_modified else []
 
-    prompt = ANALYSIS_PROMPT_TEMPLATE.format(
+    return ANALYSIS_PROMPT_TEMPLATE.format(
         policy_type=policy_type.replace("_", " ").title(),
         company=company,
         policy_name=policy_name,
@@ -130,7 +207,34 @@ async def _call_llm(
         clauses_added=_truncate(json.dumps(added, indent=2)) if added else "None",
         clauses_removed=_truncate(json.dumps(removed, indent=2)) if removed else "None",
         clauses_modified=_truncate(json.dumps(modified, indent=2)) if modified else "None",
-        diff_excerpt=_truncate(diff_text, 3000),
+        diff_excerpt=_truncate("\n".join(changed_lines(diff_text.splitlines())), 3000),
+    )
+
+
+def _normalize_result(result: Dict) -> Dict:
+    """Validate and normalize one analysis object returned by the LLM."""
+    result["severity"] = str(result.get("severity", "informational")).lower()
+    if result["severity"] not in ("informational", "concerning", "action-needed"):
+        result["severity"] = "informational"
+
+    result["severity_score"] = max(0.0, min(1.0, float(result.get("severity_score", 0.0))))
+    result["key_changes"] = json.dumps(result.get("key_changes", []))
+    return result
+
+
+async def _call_llm(
+    policy_name: str, company: str, policy_type: str, diff_text: str,
+    clauses_added: str, clauses_removed: str, clauses_modified: str,
+) -> Optional[Dict]:
+    """Internal LLM call with retry logic. Called under semaphore.
+
+    Returns None once every attempt has failed.
+    """
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+
+    prompt = _build_prompt(
+        policy_name, company, policy_type, diff_text,
+        clauses_added, clauses_removed, clauses_modified,
     )
 
     for attempt in range(1, LLM_MAX_RETRIES + 1):
@@ -146,15 +250,7 @@ async def _call_llm(
                 response_format={"type": "json_object"},
             )
 
-            result = json.loads(response.choices[0].message.content)
-
-            # Validate and normalize
-            result["severity"] = result.get("severity", "informational").lower()
-            if result["severity"] not in ("informational", "concerning", "action-needed"):
-                result["severity"] = "informational"
-
-            result["severity_score"] = max(0.0, min(1.0, float(result.get("severity_score", 0.0))))
-            result["key_changes"] = json.dumps(result.get("key_changes", []))
+            result = _normalize_result(json.loads(response.choices[0].message.content))
 
             logger.info(f"LLM analysis complete for {policy_name}: severity={result['severity']}")
             return result
@@ -173,7 +269,190 @@ async def _call_llm(
                     f"{policy_name}: {e}. Falling back to basic analysis."
                 )
 
-    return _fallback_analysis(clauses_added, clauses_removed, clauses_modified)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Batch analysis — one completion request for several policies
+# ---------------------------------------------------------------------------
+
+# Diffs per batched request; each diff contributes up to ~18k chars of
+# clauses + excerpt, so larger batches risk the context and output limits.
+ANALYSIS_BATCH_SIZE = 8
+
+BATCH_PROMPT_HEADER = """You will analyze changes to {count} separate policy documents. Analyze each one independently, exactly as you would on its own.
+
+Respond with a JSON object of the form {{"analyses": [...]}} containing exactly {count} analysis objects, one per policy and in the same order, each matching the schema above."""
+
+
+def _build_batch_prompt(items: List[Dict]) -> str:
+    """Join several per-policy prompts into one user message."""
+    parts = [BATCH_PROMPT_HEADER.format(count=len(items))]
+    for i, item in enumerate(items, 1):
+        parts.append(f"# Policy {i} of {len(items)}\n\n" + _build_prompt(**item))
+    return "\n\n".join(parts)
+
+
+async def analyze_diffs_batch(items: List[Dict]) -> List[Dict]:
+    """Analyze several policy diffs with as few LLM requests as possible.
+
+    Each item holds the keyword arguments of ``analyze_diff``.  Items are sent
+    ANALYSIS_BATCH_SIZE at a time in a single completion request (the system
+    prompt is unchanged, so its cached prefix is still reused).  A batch whose
+    response is malformed falls back to per-item ``analyze_diff`` calls.
+
+    Returns one analysis dict per item, in input order.
+    """
+    if not items:
+        return []
+    if not settings.openai_api_key or len(items) == 1:
+        return [await analyze_diff(**item) for item in items]
+
+    keys = [_item_cache_key(item) for item in items]
+    cached = await asyncio.to_thread(_load_cached_analyses, keys)
+    misses = [item for item, key in zip(items, keys) if key not in cached]
+    if len(misses) < len(items):
+        logger.info(f"Analysis cache hits: {len(items) - len(misses)}/{len(items)}")
+
+    batches = [
+        misses[i:i + ANALYSIS_BATCH_SIZE]
+        for i in range(0, len(misses), ANALYSIS_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(*(_analyze_batch(batch) for batch in batches))
+    fresh = iter([analysis for batch_result in results for analysis in batch_result])
+    return [cached[key] if key in cached else next(fresh) for key in keys]
+
+
+async def _analyze_batch(items: List[Dict]) -> List[Dict]:
+    """Analyze one batch in a single request, falling back to per-item calls."""
+    if len(items) == 1:
+        return [await analyze_diff(**items[0])]
+
+    sem = _get_llm_semaphore()
+    await sem.acquire()
+    try:
+        analyses = await _call_llm_batch(items)
+    finally:
+        sem.release()
+
+    if analyses is None:
+        return list(await asyncio.gather(*(analyze_diff(**item) for item in items)))
+    await asyncio.to_thread(
+        _store_analyses, {_item_cache_key(item): a for item, a in zip(items, analyses)},
+    )
+    return analyses
+
+
+async def _call_llm_batch(items: List[Dict]) -> Optional[List[Dict]]:
+    """Single batched LLM request with retry logic. Called under semaphore.
+
+    Returns None if the model's answer cannot be used for every item.
+    """
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    prompt = _build_batch_prompt(items)
+    names = ", ".join(item["policy_name"] for item in items)
+
+    for attempt in range(1, LLM_MAX_RETRIES + 1):
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.3,
+                max_tokens=1000 * len(items),
+                response_format={"type": "json_object"},
+            )
+
+            analyses = json.loads(response.choices[0].message.content).get("analyses")
+            if not isinstance(analyses, list) or len(analyses) != len(items):
+                raise ValueError(
+                    f"expected {len(items)} analyses, got "
+                    f"{len(analyses) if isinstance(analyses, list) else 'none'}"
+                )
+            results = [_normalize_result(a) for a in analyses]
+
+            logger.info(f"Batched LLM analysis complete for {len(items)} policies: {names}")
+            return results
+
+        except Exception as e:
+            if attempt < LLM_MAX_RETRIES:
+                wait = (2 ** attempt) + random.uniform(0, 1)
+                logger.warning(
+                    f"Batched LLM analysis attempt {attempt}/{LLM_MAX_RETRIES} failed "
+                    f"for {names}: {e}. Retrying in {wait:.1f}s..."
+                )
+                await asyncio.sleep(wait)
+            else:
+                logger.error(
+                    f"Batched LLM analysis failed after {LLM_MAX_RETRIES} attempts "
+                    f"for {names}: {e}. Falling back to per-policy analysis."
+                )
+
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Response cache — identical inputs reuse the stored analysis
+# ---------------------------------------------------------------------------
+
+_CACHED_FIELDS = ("summary", "severity", "severity_score", "key_changes", "recommendation")
+
+
+def analysis_cache_key(
+    policy_type: str, diff_text: str,
+    clauses_added: str, clauses_removed: str, clauses_modified: str,
+) -> str:
+    """SHA-256 over the diff-dependent parts of the prompt.
+
+    Policy and company names are left out on purpose, so the same change
+    published on several regional copies of a policy is analysed once.
+    """
+    h = hashlib.sha256()
+    for part in (policy_type, diff_text, clauses_added, clauses_removed, clauses_modified):
+        h.update((part or "").encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _item_cache_key(item: Dict) -> str:
+    """Cache key for one analyze_diffs_batch() item."""
+    return analysis_cache_key(
+        item["policy_type"], item["diff_text"],
+        item["clauses_added"], item["clauses_removed"], item["clauses_modified"],
+    )
+
+
+def _load_cached_analyses(keys: Iterable[str]) -> Dict[str, Dict]:
+    """Fetch cached analyses for ``keys`` (blocking; run via to_thread)."""
+    try:
+        with get_scoped_session() as db:
+            rows = db.query(AnalysisCache).filter(AnalysisCache.key.in_(list(keys))).all()
+            return {
+                row.key: {field: getattr(row, field) for field in _CACHED_FIELDS}
+                for row in rows
+            }
+    except Exception as e:
+        logger.warning(f"Analysis cache lookup failed: {e}")
+        return {}
+
+
+def _store_analyses(analyses: Dict[str, Dict]) -> None:
+    """Persist fresh LLM analyses (blocking; run via to_thread).
+
+    A failed write (e.g. a concurrent insert of the same key) only costs a
+    future cache miss, so errors are logged and swallowed.
+    """
+    try:
+        with get_scoped_session() as db:
+            for key, analysis in analyses.items():
+                db.merge(AnalysisCache(
+                    key=key, **{field: analysis.get(field) for field in _CACHED_FIELDS},
+                ))
+            db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to store {len(analyses)} analyses in cache: {e}")
 
 
 def _fallback_analysis(clauses_added: str, clauses_removed: str, clauses_modified: str) -> Dict:
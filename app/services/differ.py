@@ -4,80 +4,68 @@ Improvements over the basic version:
   - Extended heading detection: dotted numbers (1.1, 1.1.1), lettered sub-
     sections (a), (b), Roman numerals (i, ii, iii), definition patterns
     ("Term" means...), and bold/emphasis markdown.
-  - Fuzzy matching via SequenceMatcher (threshold 0.6) so renamed or
-    reordered sections are detected as modifications, not remove+add.
+  - Fuzzy matching (threshold 0.6) so renamed or reordered sections are
+    detected as modifications, not remove+add.  Pairwise scores come from
+    RapidFuzz's multi-threaded ``cdist`` when installed, else from a
+    pure-Python scorer computing the same Indel similarity.
   - Per-clause significance scoring based on privacy-sensitive keywords.
+
+The per-line string work lives in ``differ_core`` so it can be compiled
+with mypyc; it is re-exported here unchanged.
 """
 
 import difflib
+import hashlib
 import json
-import re
 import html
-from typing import List, Dict, Tuple, Optional
+import logging
+import os
+import threading
+from collections import OrderedDict
+from itertools import zip_longest
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, asdict, field
 
+try:
+    import numpy as np
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional accelerator — fall back to pure Python
+    np = None
+    process = None
 
-# ---------------------------------------------------------------------------
-# Significance scoring — keywords that make a clause more important
-# ---------------------------------------------------------------------------
+from app.config import settings
+from app.services import differ_core
+from app.services.differ_core import (  # noqa: F401 — re-exported
+    SIGNIFICANCE_KEYWORDS,
+    _compute_significance,
+    _detect_heading,
+    _sanitize_preview,
+    _split_into_clauses,
+)
 
-SIGNIFICANCE_KEYWORDS: Dict[str, float] = {
-    # High significance (0.3+ each)
-    "sell": 0.35,
-    "selling": 0.35,
-    "sold": 0.35,
-    "third party": 0.30,
-    "third-party": 0.30,
-    "third parties": 0.30,
-    "arbitration": 0.35,
-    "class action": 0.30,
-    "waive": 0.30,
-    "waiver": 0.30,
-    "ai training": 0.35,
-    "train our models": 0.35,
-    "machine learning": 0.25,
-    "law enforcement": 0.30,
-    "government": 0.25,
-    "subpoena": 0.25,
-    # Medium significance (0.15-0.25 each)
-    "opt-out": 0.25,
-    "opt out": 0.25,
-    "consent": 0.20,
-    "withdraw consent": 0.25,
-    "data sharing": 0.20,
-    "share your": 0.20,
-    "retention": 0.20,
-    "retain": 0.15,
-    "delete": 0.15,
-    "deletion": 0.15,
-    "advertising": 0.20,
-    "profiling": 0.25,
-    "automated decision": 0.25,
-    "biometric": 0.25,
-    "geolocation": 0.20,
-    "tracking": 0.20,
-    "cookie": 0.15,
-    "transfer": 0.15,
-    "cross-border": 0.20,
-    "encrypt": 0.15,
-    "security": 0.15,
-    "breach": 0.25,
-    "children": 0.20,
-    "minor": 0.20,
-    "sensitive": 0.20,
-}
-
-
-def _compute_significance(text: str) -> float:
-    """Compute a significance score (0.0–1.0) for a clause based on keyword matches."""
-    if not text:
-        return 0.0
-    lower = text.lower()
-    score = 0.0
-    for keyword, weight in SIGNIFICANCE_KEYWORDS.items():
-        if keyword in lower:
-            score += weight
-    return min(1.0, round(score, 2))
+logger = logging.getLogger(__name__)
+
+
+def _log_core_implementation():
+    """Say whether differ_core is the mypyc build, and warn if it is stale.
+
+    A compiled extension shadows differ_core.py, so edits to the source are
+    silently ignored until scripts/build_differ_core.py is re-run.
+    """
+    path = differ_core.__file__ or ""
+    if path.endswith(".py"):
+        logger.info("differ_core: pure Python")
+        return
+    logger.info(f"differ_core: compiled extension {os.path.basename(path)}")
+    source = os.path.join(os.path.dirname(path), "differ_core.py")
+    if os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(path):
+        logger.warning(
+            "differ_core.py is newer than its compiled extension, which is the "
+            "version in use; rebuild with scripts/build_differ_core.py or delete it"
+        )
+
+
+_log_core_implementation()
 
 
 # ---------------------------------------------------------------------------
@@ -92,125 +80,50 @@ class ClauseChange:
     new_text: str
     change_type: str  # "added" | "removed" | "modified"
     significance_score: float = 0.0
+    # Modified clauses only: the full old/new contents differ in whitespace
+    # alone (old_text/new_text are truncated previews, so can't tell)
+    whitespace_only: bool = False
 
 
 # ---------------------------------------------------------------------------
-# Heading detection — extended patterns
+# Fuzzy matching for renamed / reordered sections
 # ---------------------------------------------------------------------------
 
-# Precompiled regex for heading patterns
-_RE_MARKDOWN_HEADING = re.compile(r'^#{1,6}\s+')
-_RE_NUMBERED = re.compile(r'^\d+\.\s+[A-Z]')
-_RE_DOTTED_NUMBERED = re.compile(r'^\d+(\.\d+)+\.?\s+\S')
-_RE_LETTERED = re.compile(r'^\([a-z]\)\s+\S', re.IGNORECASE)
-_RE_ROMAN = re.compile(r'^\((i{1,3}|iv|v|vi{0,3}|ix|x)\)\s+\S', re.IGNORECASE)
-_RE_DEFINITION = re.compile(r'^["\u201c].+?["\u201d]\s+means\b', re.IGNORECASE)
-_RE_BOLD_EMPHASIS = re.compile(r'^(\*\*|__).+?(\*\*|__)\s*$')
-
-
-def _detect_heading(line: str) -> Optional[str]:
-    """Detect if a line is a heading.  Returns the cleaned heading text or None."""
-    stripped = line.strip()
-    if not stripped:
-        return None
-
-    # 1. Markdown headings: # Title, ## Title, etc.
-    if _RE_MARKDOWN_HEADING.match(stripped):
-        return stripped.lstrip('#').strip()
-
-    # 2. ALL-CAPS short lines (>3 chars, ≤100 chars, ≤10 words)
-    if (
-        len(stripped) > 3
-        and len(stripped) < 100
-        and stripped.isupper()
-        and len(stripped.split()) <= 10
-    ):
-        return stripped
-
-    # 3. Simple numbered: "1. Title"
-    if _RE_NUMBERED.match(stripped):
-        return stripped
-
-    # 4. Dotted numbered: "1.1 Title", "1.1.1 Title"
-    if _RE_DOTTED_NUMBERED.match(stripped):
-        return stripped
-
-    # 5. Lettered subsections: "(a) Title"
-    if _RE_LETTERED.match(stripped) and len(stripped) < 150:
-        return stripped
-
-    # 6. Roman numeral subsections: "(i) Title", "(ii) Title"
-    if _RE_ROMAN.match(stripped) and len(stripped) < 150:
-        return stripped
-
-    # 7. Definition-style: "Term" means...
-    if _RE_DEFINITION.match(stripped):
-        # Use just the defined term as heading
-        match = re.match(r'^["\u201c](.+?)["\u201d]', stripped)
-        if match:
-            return f'Definition: {match.group(1)}'
-
-    # 8. Bold/emphasis markdown as heading: **Heading** at line start
-    if _RE_BOLD_EMPHASIS.match(stripped):
-        cleaned = stripped.strip('*').strip('_').strip()
-        if len(cleaned) > 2 and len(cleaned) < 100:
-            return cleaned
-
-    return None
-
-
-# ---------------------------------------------------------------------------
-# Clause splitting
-# ---------------------------------------------------------------------------
+FUZZY_THRESHOLD = 0.6  # combined similarity threshold (0-1)
 
-def _sanitize_preview(text: str, max_len: int = 500) -> str:
-    """Sanitize text for display in clause previews."""
-    text = ''.join(
-        c for c in text
-        if c.isprintable() or c in ('\n', '\t')
-    )
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n{2,}', '\n', text)
-    text = text.strip()
-    if len(text) > max_len:
-        text = text[:max_len] + '...'
-    return text
+# Combined score is 0.4 * heading + 0.6 * content, so a pair can only reach
+# FUZZY_THRESHOLD when content similarity is at least this (0-100 scale).
+# RapidFuzz uses it to abandon hopeless comparisons early.
+_CONTENT_SCORE_CUTOFF = int((FUZZY_THRESHOLD - 0.4) / 0.6 * 100)
 
 
-def _split_into_clauses(text: str) -> List[Dict[str, str]]:
-    """Split policy text into structured clauses/sections.
+def _indel_ratio(a: str, b: str) -> float:
+    """Pure-Python twin of RapidFuzz's ``fuzz.ratio`` (0-100).
 
-    Returns list of dicts with 'heading' and 'content' keys.
+    Normalized Indel similarity, 2 * LCS / (len(a) + len(b)).  The LCS
+    length comes from Hyyrö's bit-parallel algorithm on Python ints, one
+    pass over ``b``.  difflib's SequenceMatcher.ratio() is a different,
+    lower measure (greedy blocks, autojunk on long text), so using it here
+    would pair clauses differently depending on whether RapidFuzz is
+    installed.
     """
-    clauses = []
-    current_heading = "Introduction"
-    current_lines: List[str] = []
-
-    for line in text.split("\n"):
-        heading = _detect_heading(line)
-
-        if heading and current_lines:
-            content = "\n".join(current_lines).strip()
-            if content:
-                clauses.append({"heading": current_heading, "content": content})
-            current_heading = heading
-            current_lines = []
-        else:
-            current_lines.append(line)
-
-    # Don't forget the last section
-    content = "\n".join(current_lines).strip()
-    if content:
-        clauses.append({"heading": current_heading, "content": content})
-
-    return clauses
-
-
-# ---------------------------------------------------------------------------
-# Fuzzy matching for renamed / reordered sections
-# ---------------------------------------------------------------------------
-
-FUZZY_THRESHOLD = 0.6  # SequenceMatcher ratio threshold
+    lensum = len(a) + len(b)
+    if not lensum:
+        return 100.0
+    if not a or not b:
+        return 0.0
+    masks: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    for ch in b:
+        m = masks.get(ch)
+        if m:
+            u = v & m
+            v = ((v + u) | (v - u)) & full
+    lcs = len(a) - v.bit_count()
+    return 100.0 * (1.0 - (lensum - 2 * lcs) / lensum)
 
 
 def _find_best_match(
@@ -220,24 +133,25 @@ def _find_best_match(
 ) -> Optional[str]:
     """Find the best matching heading from candidates using fuzzy matching.
 
-    Considers both heading similarity and content similarity.
+    Considers both heading similarity and content similarity, scored
+    exactly as the RapidFuzz path in _fuzzy_match_pairs() does.
     Returns the matched heading or None if no match exceeds the threshold.
     """
     best_heading = None
     best_score = 0.0
+    heading = heading.lower()
+    content = content[:2000]
 
     for cand_heading, cand_content in candidates.items():
         # Heading similarity (weighted 40%)
-        heading_sim = difflib.SequenceMatcher(
-            None, heading.lower(), cand_heading.lower()
-        ).ratio()
+        heading_sim = _indel_ratio(heading, cand_heading.lower())
 
         # Content similarity (weighted 60%)
-        content_sim = difflib.SequenceMatcher(
-            None, content[:2000], cand_content[:2000]
-        ).ratio()
+        content_sim = _indel_ratio(content, cand_content[:2000])
+        if content_sim < _CONTENT_SCORE_CUTOFF:
+            content_sim = 0.0
 
-        combined = 0.4 * heading_sim + 0.6 * content_sim
+        combined = (0.4 * heading_sim + 0.6 * content_sim) / 100.0
 
         if combined > best_score:
             best_score = combined
@@ -248,6 +162,63 @@ def _find_best_match(
     return None
 
 
+def _fuzzy_match_pairs(
+    old_headings: List[str],
+    old_contents: List[str],
+    new_headings: List[str],
+    new_contents: List[str],
+) -> List[Tuple[int, int]]:
+    """Greedily pair unmatched old clauses with their best unmatched new clause.
+
+    Old clauses are visited in document order and each claims the
+    highest-scoring new clause that is still free, provided the combined
+    score reaches FUZZY_THRESHOLD.  Returns (old_index, new_index) pairs
+    into the given parallel lists.
+    """
+    if not old_headings or not new_headings:
+        return []
+
+    if process is None:
+        pairs = []
+        remaining = dict(zip(new_headings, new_contents))
+        new_index = {h: j for j, h in enumerate(new_headings)}
+        for i, heading in enumerate(old_headings):
+            if not remaining:
+                break
+            best = _find_best_match(heading, old_contents[i], remaining)
+            if best:
+                pairs.append((i, new_index[best]))
+                del remaining[best]
+        return pairs
+
+    # Whole score matrices in two C calls; RapidFuzz releases the GIL and
+    # spreads rows across all cores (workers=-1).
+    heading_sim = process.cdist(
+        [h.lower() for h in old_headings],
+        [h.lower() for h in new_headings],
+        scorer=fuzz.ratio, dtype=np.float64, workers=-1,
+    )
+    content_sim = process.cdist(
+        [c[:2000] for c in old_contents],
+        [c[:2000] for c in new_contents],
+        scorer=fuzz.ratio, dtype=np.float64, workers=-1,
+        score_cutoff=_CONTENT_SCORE_CUTOFF,
+    )
+    combined = (0.4 * heading_sim + 0.6 * content_sim) / 100.0
+
+    taken = np.zeros(len(new_headings), dtype=bool)
+    pairs = []
+    for i in range(len(old_headings)):
+        if taken.all():
+            break
+        row = np.where(taken, -1.0, combined[i])
+        j = int(row.argmax())
+        if row[j] >= FUZZY_THRESHOLD:
+            taken[j] = True
+            pairs.append((i, j))
+    return pairs
+
+
 # ---------------------------------------------------------------------------
 # Core clause-change computation
 # ---------------------------------------------------------------------------
@@ -260,78 +231,94 @@ def compute_clause_changes(
     Returns (added, removed, modified) clause lists, each item including
     a significance_score field.
     """
+    # Duplicate headings collapse to their last occurrence, as before.
     old_clauses = {c["heading"]: c["content"] for c in _split_into_clauses(old_text)}
     new_clauses = {c["heading"]: c["content"] for c in _split_into_clauses(new_text)}
 
+    # Parallel heading/content lists plus a matched mask per side
+    old_headings = list(old_clauses)
+    old_contents = list(old_clauses.values())
+    new_headings = list(new_clauses)
+    new_contents = list(new_clauses.values())
+    old_matched = bytearray(len(old_headings))
+    new_matched = bytearray(len(new_headings))
+
     added = []
     removed = []
     modified = []
 
-    matched_old: set = set()  # old headings that have been matched
-    matched_new: set = set()  # new headings that have been matched
-
     # Pass 1: Exact heading matches
-    for heading in list(old_clauses.keys()):
-        if heading in new_clauses:
-            matched_old.add(heading)
-            matched_new.add(heading)
-            if old_clauses[heading] != new_clauses[heading]:
-                sig = max(
-                    _compute_significance(old_clauses[heading]),
-                    _compute_significance(new_clauses[heading]),
-                )
-                modified.append(ClauseChange(
-                    section=heading,
-                    old_text=_sanitize_preview(old_clauses[heading]),
-                    new_text=_sanitize_preview(new_clauses[heading]),
-                    change_type="modified",
-                    significance_score=sig,
-                ))
-
-    # Pass 2: Fuzzy matching for unmatched sections
-    unmatched_old = {h: c for h, c in old_clauses.items() if h not in matched_old}
-    unmatched_new = {h: c for h, c in new_clauses.items() if h not in matched_new}
-
-    # Try to match each unmatched old clause to an unmatched new clause
-    for old_heading, old_content in list(unmatched_old.items()):
-        if not unmatched_new:
-            break
-        best = _find_best_match(old_heading, old_content, unmatched_new)
-        if best:
+    new_index = {h: j for j, h in enumerate(new_headings)}
+    for i, heading in enumerate(old_headings):
+        j = new_index.get(heading)
+        if j is None:
+            continue
+        old_matched[i] = new_matched[j] = 1
+        old_content = old_contents[i]
+        new_content = new_contents[j]
+        if old_content != new_content:
             sig = max(
                 _compute_significance(old_content),
-                _compute_significance(unmatched_new[best]),
-            )
-            section_label = (
-                f"{old_heading} → {best}" if old_heading != best else old_heading
+                _compute_significance(new_content),
             )
             modified.append(ClauseChange(
-                section=section_label,
+                section=heading,
                 old_text=_sanitize_preview(old_content),
-                new_text=_sanitize_preview(unmatched_new[best]),
+                new_text=_sanitize_preview(new_content),
                 change_type="modified",
                 significance_score=sig,
+                whitespace_only=old_content.split() == new_content.split(),
             ))
-            matched_old.add(old_heading)
-            matched_new.add(best)
-            del unmatched_new[best]
-            del unmatched_old[old_heading]
+
+    # Pass 2: Fuzzy matching over the still-unmatched indices only
+    old_free = [i for i, m in enumerate(old_matched) if not m]
+    new_free = [j for j, m in enumerate(new_matched) if not m]
+
+    fuzzy_pairs = _fuzzy_match_pairs(
+        [old_headings[i] for i in old_free],
+        [old_contents[i] for i in old_free],
+        [new_headings[j] for j in new_free],
+        [new_contents[j] for j in new_free],
+    )
+    for a, b in fuzzy_pairs:
+        i = old_free[a]
+        j = new_free[b]
+        old_heading = old_headings[i]
+        best = new_headings[j]
+        sig = max(
+            _compute_significance(old_contents[i]),
+            _compute_significance(new_contents[j]),
+        )
+        section_label = (
+            f"{old_heading} → {best}" if old_heading != best else old_heading
+        )
+        modified.append(ClauseChange(
+            section=section_label,
+            old_text=_sanitize_preview(old_contents[i]),
+            new_text=_sanitize_preview(new_contents[j]),
+            change_type="modified",
+            significance_score=sig,
+            whitespace_only=old_contents[i].split() == new_contents[j].split(),
+        ))
+        old_matched[i] = new_matched[j] = 1
 
     # Pass 3: Remaining unmatched = pure additions and removals
-    for heading, content in unmatched_old.items():
-        if heading not in matched_old:
+    for i, m in enumerate(old_matched):
+        if not m:
+            content = old_contents[i]
             removed.append(ClauseChange(
-                section=heading,
+                section=old_headings[i],
                 old_text=_sanitize_preview(content),
                 new_text="",
                 change_type="removed",
                 significance_score=_compute_significance(content),
             ))
 
-    for heading, content in unmatched_new.items():
-        if heading not in matched_new:
+    for j, m in enumerate(new_matched):
+        if not m:
+            content = new_contents[j]
             added.append(ClauseChange(
-                section=heading,
+                section=new_headings[j],
                 old_text="",
                 new_text=_sanitize_preview(content),
                 change_type="added",
@@ -369,6 +356,62 @@ def compute_unified_diff(old_text: str, new_text: str) -> str:
     return "\n".join(diff)
 
 
+# Budget for the diff excerpt sent to the LLM (matches the analyzer's cut).
+DIFF_EXCERPT_CHARS = 3000
+
+
+def changed_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield only the hunk headers and +/- lines of a unified diff.
+
+    Context lines and the ---/+++ file headers carry no signal for the
+    LLM.  Runs of identical whitespace-only changes are collapsed.
+    """
+    prev = None
+    for line in lines:
+        line = line.rstrip("\r\n")  # difflib keeps each source line's ending
+        if line == "... [truncated]":  # keep an upstream truncation marker
+            yield line
+            continue
+        if not line.startswith(("+", "-", "@@")) or line.startswith(("+++", "---")):
+            continue
+        if line == prev and not line[1:].strip():
+            continue
+        prev = line
+        yield line
+
+
+def compute_unified_diff_excerpt(
+    old_text: str,
+    new_text: str,
+    max_chars: int = DIFF_EXCERPT_CHARS,
+    changes_only: bool = False,
+) -> str:
+    """Return the first ``max_chars`` of the unified diff.
+
+    Consumes difflib's generator only until the budget is exceeded, so
+    large policies never materialize the full diff.  The result equals
+    ``_truncate(compute_unified_diff(...), max_chars)`` in the analyzer;
+    with ``changes_only`` the diff is first passed through changed_lines().
+    """
+    diff: Iterable[str] = difflib.unified_diff(
+        old_text.splitlines(keepends=True),
+        new_text.splitlines(keepends=True),
+        fromfile="Previous Version",
+        tofile="Current Version",
+        lineterm="",
+    )
+    if changes_only:
+        diff = changed_lines(diff)
+    out: List[str] = []
+    total = -1  # no separator before the first line
+    for line in diff:
+        out.append(line)
+        total += len(line) + 1
+        if total > max_chars:
+            return "\n".join(out)[:max_chars] + "\n... [truncated]"
+    return "\n".join(out)
+
+
 # ---------------------------------------------------------------------------
 # HTML side-by-side diff (dark-theme custom table)
 # ---------------------------------------------------------------------------
@@ -380,8 +423,11 @@ def _escape(text: str) -> str:
 
 def compute_html_diff(old_text: str, new_text: str) -> str:
     """Generate a custom dark-theme side-by-side HTML diff."""
-    old_lines = old_text.splitlines()
-    new_lines = new_text.splitlines()
+    # Escape each document once up front.  Escaping never adds or removes
+    # line breaks and is injective, so the escaped lines line up 1:1 with
+    # the originals and SequenceMatcher produces identical opcodes.
+    old_lines = _escape(old_text).splitlines()
+    new_lines = _escape(new_text).splitlines()
 
     sm = difflib.SequenceMatcher(None, old_lines, new_lines)
     opcodes = sm.get_opcodes()
@@ -392,36 +438,35 @@ def compute_html_diff(old_text: str, new_text: str) -> str:
             lines = list(zip(old_lines[i1:i2], new_lines[j1:j2]))
             if len(lines) > 6:
                 for idx, (ol, nl) in enumerate(lines[:3]):
-                    rows.append(_diff_row(i1 + idx + 1, _escape(ol), j1 + idx + 1, _escape(nl), 'ctx'))
+                    rows.append(_diff_row(i1 + idx + 1, ol, j1 + idx + 1, nl, 'ctx'))
                 rows.append(_diff_separator(f'... {len(lines) - 6} unchanged lines ...'))
                 for idx, (ol, nl) in enumerate(lines[-3:]):
                     real_i = i2 - 3 + idx
                     real_j = j2 - 3 + idx
-                    rows.append(_diff_row(real_i + 1, _escape(ol), real_j + 1, _escape(nl), 'ctx'))
+                    rows.append(_diff_row(real_i + 1, ol, real_j + 1, nl, 'ctx'))
             else:
                 for idx, (ol, nl) in enumerate(lines):
-                    rows.append(_diff_row(i1 + idx + 1, _escape(ol), j1 + idx + 1, _escape(nl), 'ctx'))
+                    rows.append(_diff_row(i1 + idx + 1, ol, j1 + idx + 1, nl, 'ctx'))
 
         elif tag == 'replace':
-            max_len = max(i2 - i1, j2 - j1)
-            for k in range(max_len):
-                old_idx = i1 + k if k < (i2 - i1) else None
-                new_idx = j1 + k if k < (j2 - j1) else None
-                old_line = _escape(old_lines[old_idx]) if old_idx is not None else ''
-                new_line = _escape(new_lines[new_idx]) if new_idx is not None else ''
-                old_num = (old_idx + 1) if old_idx is not None else ''
-                new_num = (new_idx + 1) if new_idx is not None else ''
-                old_cls = 'del' if old_idx is not None else 'empty'
-                new_cls = 'add' if new_idx is not None else 'empty'
-                rows.append(_diff_row_split(old_num, old_line, old_cls, new_num, new_line, new_cls))
+            # Pair old/new lines side by side; the shorter side is padded with None
+            rows.extend(
+                _diff_row_split(
+                    i1 + k + 1 if ol is not None else '', ol if ol is not None else '',
+                    'del' if ol is not None else 'empty',
+                    j1 + k + 1 if nl is not None else '', nl if nl is not None else '',
+                    'add' if nl is not None else 'empty',
+                )
+                for k, (ol, nl) in enumerate(zip_longest(old_lines[i1:i2], new_lines[j1:j2]))
+            )
 
         elif tag == 'delete':
             for k in range(i1, i2):
-                rows.append(_diff_row_split(k + 1, _escape(old_lines[k]), 'del', '', '', 'empty'))
+                rows.append(_diff_row_split(k + 1, old_lines[k], 'del', '', '', 'empty'))
 
         elif tag == 'insert':
             for k in range(j1, j2):
-                rows.append(_diff_row_split('', '', 'empty', k + 1, _escape(new_lines[k]), 'add'))
+                rows.append(_diff_row_split('', '', 'empty', k + 1, new_lines[k], 'add'))
 
     table_html = '\n'.join(rows)
 
@@ -468,15 +513,48 @@ def _diff_separator(message):
 # Public API
 # ---------------------------------------------------------------------------
 
-def compute_full_diff(old_text: str, new_text: str) -> Dict:
-    """Compute all diff formats for a pair of snapshots.
+# LRU cache of compute_full_diff results keyed by content digests.  The
+# function is pure, so retries and re-renders of the same snapshot pair hit
+# the cache.  Guarded by a lock because callers run it in worker threads.
+DIFF_CACHE_SIZE = 256
+_diff_cache: "OrderedDict[Tuple[bytes, bytes], Dict]" = OrderedDict()
+_diff_cache_lock = threading.Lock()
+
+
+def _content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def clear_diff_cache() -> None:
+    """Drop all memoized diffs (call after snapshots are deleted)."""
+    with _diff_cache_lock:
+        _diff_cache.clear()
+
+
+def _compute_full_diff_uncached(old_text: str, new_text: str) -> Dict:
+    if old_text == new_text:
+        # Unchanged content: no clause matching or unified diffs to compute
+        return {
+            "diff_text": "",
+            "diff_excerpt": "",
+            "diff_html": compute_html_diff(old_text, new_text),
+            "clauses_added": "[]",
+            "clauses_removed": "[]",
+            "clauses_modified": "[]",
+            "change_summary": {"added_count": 0, "removed_count": 0, "modified_count": 0},
+        }
 
-    Returns a dict with all diff data.
-    """
     added, removed, modified = compute_clause_changes(old_text, new_text)
 
+    diff_excerpt = compute_unified_diff_excerpt(old_text, new_text, changes_only=True)
+    if settings.store_full_diff:
+        diff_text = compute_unified_diff(old_text, new_text)
+    else:
+        diff_text = compute_unified_diff_excerpt(old_text, new_text)
+
     return {
-        "diff_text": compute_unified_diff(old_text, new_text),
+        "diff_text": diff_text,
+        "diff_excerpt": diff_excerpt,
         "diff_html": compute_html_diff(old_text, new_text),
         "clauses_added": json.dumps(added),
         "clauses_removed": json.dumps(removed),
@@ -487,3 +565,27 @@ def compute_full_diff(old_text: str, new_text: str) -> Dict:
             "modified_count": len(modified),
         },
     }
+
+
+def compute_full_diff(old_text: str, new_text: str) -> Dict:
+    """Compute all diff formats for a pair of snapshots.
+
+    Returns a dict with all diff data.  Results are memoized by content
+    hash; callers get their own top-level dict and must not mutate the
+    nested values.
+    """
+    key = (_content_key(old_text), _content_key(new_text))
+    with _diff_cache_lock:
+        cached = _diff_cache.get(key)
+        if cached is not None:
+            _diff_cache.move_to_end(key)
+            return dict(cached)
+
+    result = _compute_full_diff_uncached(old_text, new_text)
+
+    with _diff_cache_lock:
+        _diff_cache[key] = result
+        _diff_cache.move_to_end(key)
+        while len(_diff_cache) > DIFF_CACHE_SIZE:
+            _diff_cache.popitem(last=False)
+    return dict(result)
@@ -0,0 +1,201 @@
+"""Compiled-friendly core of the differ: heading detection, clause splitting,
+preview sanitizing, and significance scoring.
+
+Kept free of optional imports and fully annotated so it can be compiled
+with mypyc (``python scripts/build_differ_core.py``).  The compiled
+extension shadows this file, so rebuild it after editing here; without it
+the pure-Python module is used unchanged.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+
+# ---------------------------------------------------------------------------
+# Significance scoring — keywords that make a clause more important
+# ---------------------------------------------------------------------------
+
+SIGNIFICANCE_KEYWORDS: Dict[str, float] = {
+    # High significance (0.3+ each)
+    "sell": 0.35,
+    "selling": 0.35,
+    "sold": 0.35,
+    "third party": 0.30,
+    "third-party": 0.30,
+    "third parties": 0.30,
+    "arbitration": 0.35,
+    "class action": 0.30,
+    "waive": 0.30,
+    "waiver": 0.30,
+    "ai training": 0.35,
+    "train our models": 0.35,
+    "machine learning": 0.25,
+    "law enforcement": 0.30,
+    "government": 0.25,
+    "subpoena": 0.25,
+    # Medium significance (0.15-0.25 each)
+    "opt-out": 0.25,
+    "opt out": 0.25,
+    "consent": 0.20,
+    "withdraw consent": 0.25,
+    "data sharing": 0.20,
+    "share your": 0.20,
+    "retention": 0.20,
+    "retain": 0.15,
+    "delete": 0.15,
+    "deletion": 0.15,
+    "advertising": 0.20,
+    "profiling": 0.25,
+    "automated decision": 0.25,
+    "biometric": 0.25,
+    "geolocation": 0.20,
+    "tracking": 0.20,
+    "cookie": 0.15,
+    "transfer": 0.15,
+    "cross-border": 0.20,
+    "encrypt": 0.15,
+    "security": 0.15,
+    "breach": 0.25,
+    "children": 0.20,
+    "minor": 0.20,
+    "sensitive": 0.20,
+}
+
+
+def _compute_significance(text: str) -> float:
+    """Compute a significance score (0.0–1.0) for a clause based on keyword matches."""
+    if not text:
+        return 0.0
+    lower = text.lower()
+    score = 0.0
+    for keyword, weight in SIGNIFICANCE_KEYWORDS.items():
+        if keyword in lower:
+            score += weight
+    return min(1.0, round(score, 2))
+
+
+# ---------------------------------------------------------------------------
+# Heading detection — extended patterns
+# ---------------------------------------------------------------------------
+
+# Precompiled regex for heading patterns
+_RE_MARKDOWN_HEADING = re.compile(r'^#{1,6}\s+')
+_RE_NUMBERED = re.compile(r'^\d+\.\s+[A-Z]')
+_RE_DOTTED_NUMBERED = re.compile(r'^\d+(\.\d+)+\.?\s+\S')
+_RE_LETTERED = re.compile(r'^\([a-z]\)\s+\S', re.IGNORECASE)
+_RE_ROMAN = re.compile(r'^\((i{1,3}|iv|v|vi{0,3}|ix|x)\)\s+\S', re.IGNORECASE)
+_RE_DEFINITION = re.compile(r'^["\u201c].+?["\u201d]\s+means\b', re.IGNORECASE)
+_RE_BOLD_EMPHASIS = re.compile(r'^(\*\*|__).+?(\*\*|__)\s*$')
+
+
+def _detect_heading(line: str) -> Optional[str]:
+    """Detect if a line is a heading.  Returns the cleaned heading text or None."""
+    stripped = line.strip()
+    if not stripped:
+        return None
+
+    # 1. Markdown headings: # Title, ## Title, etc.
+    if _RE_MARKDOWN_HEADING.match(stripped):
+        return stripped.lstrip('#').strip()
+
+    # 2. ALL-CAPS short lines (>3 chars, ≤100 chars, ≤10 words)
+    if (
+        len(stripped) > 3
+        and len(stripped) < 100
+        and stripped.isupper()
+        and len(stripped.split()) <= 10
+    ):
+        return stripped
+
+    # 3. Simple numbered: "1. Title"
+    if _RE_NUMBERED.match(stripped):
+        return stripped
+
+    # 4. Dotted numbered: "1.1 Title", "1.1.1 Title"
+    if _RE_DOTTED_NUMBERED.match(stripped):
+        return stripped
+
+    # 5. Lettered subsections: "(a) Title"
+    if _RE_LETTERED.match(stripped) and len(stripped) < 150:
+        return stripped
+
+    # 6. Roman numeral subsections: "(i) Title", "(ii) Title"
+    if _RE_ROMAN.match(stripped) and len(stripped) < 150:
+        return stripped
+
+    # 7. Definition-style: "Term" means...
+    if _RE_DEFINITION.match(stripped):
+        # Use just the defined term as heading
+        match = re.match(r'^["\u201c](.+?)["\u201d]', stripped)
+        if match:
+            return f'Definition: {match.group(1)}'
+
+    # 8. Bold/emphasis markdown as heading: **Heading** at line start
+    if _RE_BOLD_EMPHASIS.match(stripped):
+        cleaned = stripped.strip('*').strip('_').strip()
+        if len(cleaned) > 2 and len(cleaned) < 100:
+            return cleaned
+
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Clause splitting
+# ---------------------------------------------------------------------------
+
+# Non-printable code points (Cc, Cf, Cs, Co, Zs/Zl/Zp except space), keeping
+# newline and tab.  Matches str.isprintable() for every assigned code point,
+# but runs in the C regex engine instead of a per-character Python loop.
+_RE_NON_PRINTABLE = re.compile(
+    '['
+    '\x00-\x08\x0b-\x1f\x7f-\xa0\xad'
+    '\u0600-\u0605\u061c\u06dd\u070f\u0890\u0891\u08e2'
+    '\u1680\u180e\u2000-\u200f\u2028-\u202f\u205f-\u2064\u2066-\u206f'
+    '\u3000' r'\ud800-\uf8ff' '\ufeff\ufff9-\ufffb'  # surrogates escaped for re
+    '\U000110bd\U000110cd\U00013430-\U00013438\U0001bca0-\U0001bca3'
+    '\U0001d173-\U0001d17a\U000e0001\U000e0020-\U000e007f'
+    '\U000f0000-\U000ffffd\U00100000-\U0010fffd'
+    ']'
+)
+_RE_HSPACE_RUN = re.compile(r'[ \t]+')
+_RE_BLANK_LINES = re.compile(r'\n{2,}')
+
+
+def _sanitize_preview(text: str, max_len: int = 500) -> str:
+    """Sanitize text for display in clause previews."""
+    text = _RE_NON_PRINTABLE.sub('', text)
+    text = _RE_HSPACE_RUN.sub(' ', text)
+    text = _RE_BLANK_LINES.sub('\n', text)
+    text = text.strip()
+    if len(text) > max_len:
+        text = text[:max_len] + '...'
+    return text
+
+
+def _split_into_clauses(text: str) -> List[Dict[str, str]]:
+    """Split policy text into structured clauses/sections.
+
+    Returns list of dicts with 'heading' and 'content' keys.
+    """
+    clauses: List[Dict[str, str]] = []
+    current_heading = "Introduction"
+    current_lines: List[str] = []
+
+    for line in text.split("\n"):
+        heading = _detect_heading(line)
+
+        if heading and current_lines:
+            content = "\n".join(current_lines).strip()
+            if content:
+                clauses.append({"heading": current_heading, "content": content})
+            current_heading = heading
+            current_lines = []
+        else:
+            current_lines.append(line)
+
+    # Don't forget the last section
+    content = "\n".join(current_lines).strip()
+    if content:
+        clauses.append({"heading": current_heading, "content": content})
+
+    return clauses
@@ -6,16 +6,21 @@ Supports:
   - send_alert() dispatches to all configured channels
 """
 
-import json
+import asyncio
+import email.policy
+import io
 import logging
+import string
+from email.generator import BytesGenerator
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import aiosmtplib
 import httpx
 
 from app.config import settings
+from app.utils import json_helpers
 
 logger = logging.getLogger(__name__)
 
@@ -36,20 +41,23 @@ SEVERITY_EMOJI = {
 # Email notifications
 # ---------------------------------------------------------------------------
 
-def _build_email_html(
-    policy_name: str, company: str, severity: str,
-    summary: str, key_changes: str, recommendation: str, diff_id: int,
-) -> str:
-    """Build a beautiful HTML email for a policy change alert."""
-    color = SEVERITY_COLORS.get(severity, "#6B7280")
-    emoji = SEVERITY_EMOJI.get(severity, "")
-    changes = json.loads(key_changes) if key_changes else []
+# Per-operation SMTP timeout so a slow mail server cannot stall the checks
+# sharing the event loop for long
+SMTP_TIMEOUT = 30.0
+
+
+def _smtp_client() -> aiosmtplib.SMTP:
+    """Create an unconnected SMTP client (STARTTLS on connect)."""
+    return aiosmtplib.SMTP(
+        hostname=settings.smtp_host,
+        port=settings.smtp_port,
+        start_tls=True,
+        timeout=SMTP_TIMEOUT,
+    )
 
-    changes_html = ""
-    for change in changes:
-        changes_html += f'<li style="margin-bottom:8px;color:#374151;">{change}</li>'
 
-    return f"""
+# Static skeleton of the alert email; only the {placeholders} vary per call.
+_EMAIL_TEMPLATE = """
     <div style="font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;max-width:600px;margin:0 auto;padding:20px;">
         <div style="background:linear-gradient(135deg,#1e293b,#334155);border-radius:12px;padding:24px;margin-bottom:20px;">
             <h1 style="color:white;margin:0;font-size:24px;">PolicyDiff Alert</h1>
@@ -67,7 +75,7 @@ def _build_email_html(
                 <h3 style="color:#111827;margin:0 0 8px 0;font-size:15px;">Summary</h3>
                 <p style="color:#374151;margin:0;font-size:14px;line-height:1.6;">{summary}</p>
             </div>
-            {"<div style='margin-bottom:16px;'><h3 style='color:#111827;margin:0 0 8px 0;font-size:15px;'>Key Changes</h3><ul style='margin:0;padding-left:20px;'>" + changes_html + "</ul></div>" if changes_html else ""}
+            {changes_block}
             <div style="background:#eff6ff;border-radius:8px;padding:16px;">
                 <h3 style="color:#1e40af;margin:0 0 8px 0;font-size:15px;">Recommendation</h3>
                 <p style="color:#1e40af;margin:0;font-size:14px;">{recommendation}</p>
@@ -79,10 +87,77 @@ def _build_email_html(
     </div>
     """
 
+_CHANGES_BLOCK_OPEN = (
+    "<div style='margin-bottom:16px;'><h3 style='color:#111827;margin:0 0 8px 0;"
+    "font-size:15px;'>Key Changes</h3><ul style='margin:0;padding-left:20px;'>"
+)
+_CHANGES_BLOCK_CLOSE = "</ul></div>"
+
+_LI_PREFIX = '<li style="margin-bottom:8px;color:#374151;">'
+_LI_SUFFIX = "</li>"
+_LI_SEPARATOR = _LI_SUFFIX + _LI_PREFIX
+
+def _compile_template(template: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a format template once into (literal, field_name) parts."""
+    return [(literal, field) for literal, field, _, _ in string.Formatter().parse(template)]
+
+
+def _render_template(parts: List[Tuple[str, Optional[str]]], fields: Dict[str, str]) -> str:
+    """Render precompiled template parts; avoids re-parsing the skeleton per call."""
+    out = []
+    for literal, field in parts:
+        out.append(literal)
+        if field:
+            out.append(fields[field])
+    return "".join(out)
+
+
+# Per-severity compiled templates with color/emoji/severity pre-substituted
+_SEVERITY_EMAIL_TEMPLATES = {
+    severity: _compile_template(
+        _EMAIL_TEMPLATE
+        .replace("{color}", SEVERITY_COLORS[severity])
+        .replace("{emoji}", SEVERITY_EMOJI[severity])
+        .replace("{severity}", severity)
+    )
+    for severity in SEVERITY_COLORS
+}
+_GENERIC_EMAIL_TEMPLATE = _compile_template(_EMAIL_TEMPLATE)
+
+
+def _build_email_html(
+    policy_name: str, company: str, severity: str,
+    summary: str, changes: List[str], recommendation: str, diff_id: int,
+) -> str:
+    """Build a beautiful HTML email for a policy change alert."""
+    # One join: items are separated by "</li><li ...>" and wrapped once
+    changes_html = (
+        _LI_PREFIX + _LI_SEPARATOR.join(map(str, changes)) + _LI_SUFFIX if changes else ""
+    )
+    fields = {
+        "policy_name": policy_name,
+        "company": company,
+        "summary": summary,
+        "changes_block": (
+            _CHANGES_BLOCK_OPEN + changes_html + _CHANGES_BLOCK_CLOSE if changes_html else ""
+        ),
+        "recommendation": recommendation,
+    }
+
+    parts = _SEVERITY_EMAIL_TEMPLATES.get(severity)
+    if parts is None:
+        parts = _GENERIC_EMAIL_TEMPLATE
+        fields.update(
+            color=SEVERITY_COLORS.get(severity, "#6B7280"),
+            emoji=SEVERITY_EMOJI.get(severity, ""),
+            severity=severity,
+        )
+    return _render_template(parts, fields)
+
 
 async def _send_email(
     policy_name: str, company: str, severity: str,
-    summary: str, key_changes: str, recommendation: str, diff_id: int,
+    summary: str, changes: List[str], recommendation: str, diff_id: int,
 ) -> bool:
     """Send an email alert asynchronously. Returns True on success."""
     if not all([settings.smtp_user, settings.smtp_password, settings.alert_to_email]):
@@ -107,18 +182,13 @@ Recommendation: {recommendation}
         msg.attach(MIMEText(plain, "plain"))
 
         html = _build_email_html(
-            policy_name, company, severity, summary, key_changes, recommendation, diff_id
+            policy_name, company, severity, summary, changes, recommendation, diff_id
         )
         msg.attach(MIMEText(html, "html"))
 
-        await aiosmtplib.send(
-            msg,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user,
-            password=settings.smtp_password,
-            start_tls=True,
-        )
+        async with _smtp_client() as smtp:
+            await smtp.login(settings.smtp_user, settings.smtp_password)
+            await smtp.send_message(msg)
 
         logger.info(f"[email] alert sent for {policy_name} (severity: {severity})")
         return True
@@ -134,7 +204,7 @@ Recommendation: {recommendation}
 
 def _build_webhook_payload(
     policy_name: str, company: str, severity: str,
-    summary: str, key_changes: str, recommendation: str, diff_id: int,
+    summary: str, changes: List[str], recommendation: str, diff_id: int,
 ) -> dict:
     """Build a JSON payload compatible with Slack, Discord, and generic webhooks.
 
@@ -142,7 +212,6 @@ def _build_webhook_payload(
     For generic webhooks, a simple JSON body is sent.
     """
     emoji = SEVERITY_EMOJI.get(severity, "")
-    changes = json.loads(key_changes) if key_changes else []
     changes_text = "\n".join(f"  • {c}" for c in changes[:5])
 
     # Detect if it looks like a Slack or Discord webhook
@@ -196,9 +265,65 @@ def _build_webhook_payload(
         }
 
 
+# Shared keep-alive client so repeated alerts reuse the TLS connection.  Its
+# connection pool belongs to the event loop that created it; alerts sent from
+# another loop (the Wayback seeder runs in its own asyncio.run()) get a
+# private client instead, as in scraper._get_client().
+_webhook_client: Optional[httpx.AsyncClient] = None
+_webhook_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+try:
+    import h2  # noqa: F401 — enables httpx's HTTP/2 support
+    _WEBHOOK_HTTP2 = True
+except ImportError:  # optional — fall back to HTTP/1.1 keep-alive
+    _WEBHOOK_HTTP2 = False
+
+
+def _new_webhook_client(shared: bool = True) -> httpx.AsyncClient:
+    """Build a webhook client.
+
+    On the shared client HTTP/2 lets concurrent alerts to Slack/Discord
+    multiplex over one connection instead of each taking a pooled HTTP/1.1
+    connection.  A private client sends a single alert, so it uses plain
+    HTTP/1.1 and keeps no idle connections.
+    """
+    if not shared:
+        return httpx.AsyncClient(timeout=10.0, limits=httpx.Limits(max_keepalive_connections=0))
+    return httpx.AsyncClient(
+        http2=_WEBHOOK_HTTP2,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=20, keepalive_expiry=120),
+    )
+
+
+def _get_webhook_client() -> Tuple[httpx.AsyncClient, bool]:
+    """Return ``(client, owned)`` for the running loop.
+
+    ``owned`` is True when the caller got a private client (a different event
+    loop than the shared one) and must close it when done.
+    """
+    global _webhook_client, _webhook_client_loop
+    loop = asyncio.get_running_loop()
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = _new_webhook_client()
+        _webhook_client_loop = loop
+    if _webhook_client_loop is loop:
+        return _webhook_client, False
+    return _new_webhook_client(shared=False), True
+
+
+async def close_notifier() -> None:
+    """Close the shared webhook client (called on application shutdown)."""
+    global _webhook_client, _webhook_client_loop
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+        _webhook_client = None
+        _webhook_client_loop = None
+
+
 async def _send_webhook(
     policy_name: str, company: str, severity: str,
-    summary: str, key_changes: str, recommendation: str, diff_id: int,
+    summary: str, changes: List[str], recommendation: str, diff_id: int,
 ) -> bool:
     """Send a webhook notification. Returns True on success."""
     if not settings.webhook_url:
@@ -206,17 +331,21 @@ async def _send_webhook(
         return False
 
     payload = _build_webhook_payload(
-        policy_name, company, severity, summary, key_changes, recommendation, diff_id
+        policy_name, company, severity, summary, changes, recommendation, diff_id
     )
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        client, owned = _get_webhook_client()
+        try:
             resp = await client.post(
                 settings.webhook_url,
-                json=payload,
+                content=json_helpers.dumps_bytes(payload),
                 headers={"Content-Type": "application/json"},
             )
-            resp.raise_for_status()
+        finally:
+            if owned:
+                await client.aclose()
+        resp.raise_for_status()
 
         logger.info(f"[webhook] alert sent for {policy_name} (severity: {severity})")
         return True
@@ -233,22 +362,28 @@ async def _send_webhook(
 SEVERITY_RANK = {"informational": 0, "concerning": 1, "action-needed": 2}
 
 
-async def _send_user_email(
-    to_email: str, policy_name: str, company: str, severity: str,
-    summary: str, key_changes: str, recommendation: str, diff_id: int,
-) -> bool:
-    """Send an email alert to a specific user asynchronously. Returns True on success."""
-    if not all([settings.smtp_user, settings.smtp_password]):
-        return False
+# Messages sent over one SMTP session before reconnecting (provider limits)
+SMTP_MESSAGES_PER_CONNECTION = 100
 
-    try:
-        msg = MIMEMultipart("alternative")
-        emoji = SEVERITY_EMOJI.get(severity, "")
-        msg["Subject"] = f"{emoji} PolicyDiff: {company} {severity.title()} — {policy_name}"
-        msg["From"] = settings.alert_from_email or settings.smtp_user
-        msg["To"] = to_email
+# Concurrent SMTP sessions used for follower alerts (keeps server load bounded)
+_SMTP_POOL_SIZE = 5
 
-        plain = f"""PolicyDiff Alert — {severity.upper()}
+# No ESMTP PIPELINING (RFC 2920): aiosmtplib's protocol parses exactly one
+# reply per awaited command and discards bytes that arrive while a reply is
+# still pending pickup, so writing MAIL/RCPT/DATA back-to-back would lose
+# the RCPT/DATA replies.  Each message therefore costs MAIL, RCPT, DATA and
+# body round trips; throughput comes from session reuse instead.
+
+
+def _build_user_email(
+    policy_name: str, company: str, severity: str,
+    summary: str, changes: List[str], recommendation: str, diff_id: int,
+) -> Tuple[str, str, str]:
+    """Build the (subject, plain, html) parts shared by every follower alert."""
+    emoji = SEVERITY_EMOJI.get(severity, "")
+    subject = f"{emoji} PolicyDiff: {company} {severity.title()} — {policy_name}"
+
+    plain = f"""PolicyDiff Alert — {severity.upper()}
 
 {policy_name} ({company})
 
@@ -260,33 +395,94 @@ Recommendation: {recommendation}
 You're receiving this because you follow this policy on PolicyDiff.
 To unsubscribe, visit your notification preferences in the app.
 """
-        msg.attach(MIMEText(plain, "plain"))
+    html = _build_email_html(
+        policy_name, company, severity, summary, changes, recommendation, diff_id
+    )
+    return subject, plain, html
 
-        html = _build_email_html(
-            policy_name, company, severity, summary, key_changes, recommendation, diff_id
-        )
-        msg.attach(MIMEText(html, "html"))
 
-        await aiosmtplib.send(
-            msg,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user,
-            password=settings.smtp_password,
-            start_tls=True,
-        )
+def _serialize_user_email(from_addr: str, subject: str, plain: str, html: str) -> bytes:
+    """Serialize a follower alert once, without its To header.
 
-        logger.info(f"[email] user alert sent to {to_email} for {policy_name}")
-        return True
+    Only the To header differs between followers, so the multipart body is
+    flattened a single time and reused for every recipient.
+    """
+    policy = email.policy.SMTP
+    msg = MIMEMultipart("alternative", policy=policy)
+    msg["Subject"] = subject
+    msg["From"] = from_addr
+    msg.attach(MIMEText(plain, "plain", policy=policy))
+    msg.attach(MIMEText(html, "html", policy=policy))
 
-    except Exception as e:
-        logger.error(f"[email] failed to send user alert to {to_email}: {e}")
-        return False
+    buf = io.BytesIO()
+    BytesGenerator(buf, policy=policy).flatten(msg)
+    return buf.getvalue()
+
+
+async def _send_user_email_prebuilt(
+    smtp: aiosmtplib.SMTP, to_email: str, from_addr: str, body: bytes,
+) -> None:
+    """Send a pre-serialized follower alert to ``to_email`` on ``smtp``."""
+    to_header = email.policy.SMTP.fold_binary("To", to_email)
+    await smtp.sendmail(from_addr, [to_email], to_header + body)
+
+
+async def _drain_shard(shard: List[str], from_addr: str, body: bytes) -> int:
+    """Send to one shard of recipients over its own SMTP session(s).
+
+    Rotates the connection every SMTP_MESSAGES_PER_CONNECTION messages.
+    A failure for one recipient is logged and does not abort the shard.
+    Returns the sent count.
+    """
+    sent_count = 0
+
+    for start in range(0, len(shard), SMTP_MESSAGES_PER_CONNECTION):
+        batch = shard[start:start + SMTP_MESSAGES_PER_CONNECTION]
+        try:
+            async with _smtp_client() as smtp:
+                await smtp.login(settings.smtp_user, settings.smtp_password)
+
+                for to_email in batch:
+                    try:
+                        await _send_user_email_prebuilt(smtp, to_email, from_addr, body)
+                        sent_count += 1
+                        logger.info(f"[email] user alert sent to {to_email}")
+                    except Exception as e:
+                        logger.error(f"[email] failed to send user alert to {to_email}: {e}")
+
+        except Exception as e:
+            logger.error(f"[email] SMTP session failed for {len(batch)} user alerts: {e}")
+
+    return sent_count
+
+
+async def _send_bulk_user_emails(
+    recipients: List[str], subject: str, plain: str, html: str,
+) -> int:
+    """Send one follower alert to many recipients over a small SMTP pool.
+
+    Recipients are split round-robin into at most _SMTP_POOL_SIZE shards,
+    each drained concurrently over its own reused session, so STARTTLS and
+    login happen once per connection rather than once per recipient.
+    Returns the sent count.
+    """
+    if not recipients or not all([settings.smtp_user, settings.smtp_password]):
+        return 0
+
+    from_addr = settings.alert_from_email or settings.smtp_user
+    pool_size = min(_SMTP_POOL_SIZE, len(recipients))
+    shards = [recipients[i::pool_size] for i in range(pool_size)]
+    body = _serialize_user_email(from_addr, subject, plain, html)
+
+    counts = await asyncio.gather(*[
+        _drain_shard(shard, from_addr, body) for shard in shards
+    ])
+    return sum(counts)
 
 
 async def notify_policy_followers(
     policy_id: int, policy_name: str, company: str, severity: str,
-    summary: str, key_changes: str, recommendation: str, diff_id: int,
+    summary: str, changes: List[str], recommendation: str, diff_id: int,
 ) -> int:
     """Send email notifications to all users following a specific policy.
 
@@ -296,48 +492,50 @@ async def notify_policy_followers(
     from app.database import get_scoped_session
     from app.models import UserPageFollow, User, EmailPreference
 
-    sent_count = 0
-
-    with get_scoped_session() as db:
-        follows = (
-            db.query(UserPageFollow)
-            .filter(UserPageFollow.policy_id == policy_id)
-            .all()
-        )
-
-        if not follows:
-            logger.debug(f"No followers for policy {policy_id} — skipping user notifications")
-            return 0
+    recipients: List[str] = []
 
-        user_ids = [f.user_id for f in follows]
-        users = db.query(User).filter(User.id.in_(user_ids), User.is_active == True).all()
+    alert_severity = SEVERITY_RANK.get(severity, 0)
 
-        for user in users:
-            # Check email preferences
-            prefs = (
-                db.query(EmailPreference)
-                .filter(EmailPreference.user_id == user.id)
-                .first()
+    with get_scoped_session() as db:
+        # One covering query: active followers (a user follows a policy at
+        # most once) with their optional preferences, streamed as plain rows
+        rows = (
+            db.query(
+                User.email,
+                EmailPreference.id,
+                EmailPreference.email_enabled,
+                EmailPreference.unsubscribed_at,
+                EmailPreference.severity_threshold,
             )
+            .join(UserPageFollow, UserPageFollow.user_id == User.id)
+            .outerjoin(EmailPreference, EmailPreference.user_id == User.id)
+            .filter(UserPageFollow.policy_id == policy_id, User.is_active == True)
+            .yield_per(200)
+        )
 
-            # Skip if email disabled or unsubscribed
-            if prefs and (not prefs.email_enabled or prefs.unsubscribed_at):
-                continue
+        for user_email, prefs_id, email_enabled, unsubscribed_at, threshold in rows:
+            if prefs_id is not None:
+                # Skip if email disabled or unsubscribed
+                if not email_enabled or unsubscribed_at:
+                    continue
 
-            # Skip if severity is below user's threshold
-            if prefs and prefs.severity_threshold:
-                user_threshold = SEVERITY_RANK.get(prefs.severity_threshold, 0)
-                alert_severity = SEVERITY_RANK.get(severity, 0)
-                if alert_severity < user_threshold:
+                # Skip if severity is below user's threshold
+                if threshold and alert_severity < SEVERITY_RANK.get(threshold, 0):
                     continue
 
             # TODO: Handle frequency (daily/weekly digest) — for now, all are immediate
-            ok = await _send_user_email(
-                user.email, policy_name, company, severity,
-                summary, key_changes, recommendation, diff_id,
-            )
-            if ok:
-                sent_count += 1
+            recipients.append(user_email)
+
+    if not recipients:
+        logger.debug(f"No eligible followers for policy {policy_id} — skipping user notifications")
+        return 0
+
+    # The alert is identical for every follower — render it once.
+    # Send outside the session so no DB connection is held during SMTP I/O.
+    subject, plain, html = _build_user_email(
+        policy_name, company, severity, summary, changes, recommendation, diff_id,
+    )
+    sent_count = await _send_bulk_user_emails(recipients, subject, plain, html)
 
     logger.info(f"[notify] sent {sent_count} user emails for policy {policy_id} ({policy_name})")
     return sent_count
@@ -356,30 +554,54 @@ async def send_alert(
 
     Returns True if at least one channel succeeded.
     """
-    results = []
-
-    # Global email (ALERT_TO_EMAIL — admin notification)
-    email_ok = await _send_email(
-        policy_name, company, severity, summary, key_changes, recommendation, diff_id
-    )
-    results.append(email_ok)
-
-    # Webhook
-    webhook_ok = await _send_webhook(
-        policy_name, company, severity, summary, key_changes, recommendation, diff_id
-    )
-    results.append(webhook_ok)
+    has_smtp = bool(settings.smtp_user and settings.smtp_password)
+    has_email = has_smtp and bool(settings.alert_to_email)
+    has_webhook = bool(settings.webhook_url)
+    has_followers = has_smtp and bool(policy_id)
+
+    # Nothing configured: skip parsing, rendering and the follower query
+    if not (has_email or has_webhook or has_followers):
+        logger.info(f"No notification channels configured for {policy_name}")
+        return False
 
-    # Per-user follower notifications
-    if policy_id:
-        user_count = await notify_policy_followers(
+    # Parse key_changes once for every channel and recipient
+    try:
+        changes = json_helpers.loads(key_changes) if key_changes else []
+    except ValueError:
+        logger.warning(f"Invalid key_changes JSON for {policy_name} — sending without it")
+        changes = []
+
+    # Only configured channels get a coroutine.  They are independent, so run
+    # them concurrently: latency is the slowest channel, not the sum.
+    channels = {}
+    if has_email:
+        # Global email (ALERT_TO_EMAIL — admin notification)
+        channels["email"] = _send_email(
+            policy_name, company, severity, summary, changes, recommendation, diff_id
+        )
+    if has_webhook:
+        channels["webhook"] = _send_webhook(
+            policy_name, company, severity, summary, changes, recommendation, diff_id
+        )
+    if has_followers:
+        # Per-user follower notifications
+        channels["followers"] = notify_policy_followers(
             policy_id, policy_name, company, severity,
-            summary, key_changes, recommendation, diff_id,
+            summary, changes, recommendation, diff_id,
         )
-        results.append(user_count > 0)
+
+    outcomes = await asyncio.gather(*channels.values(), return_exceptions=True)
+
+    results = []
+    for channel, outcome in zip(channels, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"[{channel}] notification raised for {policy_name}: {outcome}")
+            results.append(False)
+        else:
+            results.append(bool(outcome))
 
     if not any(results):
-        logger.info(f"No notification channels configured or all failed for {policy_name}")
+        logger.info(f"No notifications delivered for {policy_name}")
 
     return any(results)
 
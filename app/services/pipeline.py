@@ -1,29 +1,97 @@
 """Core pipeline: scrape -> diff -> analyze -> notify.
 
 Each concurrent policy check gets its own database session to prevent
-session corruption when multiple coroutines run in parallel.
+session corruption when multiple coroutines run in parallel.  Database
+work runs in short transactions on worker threads (``asyncio.to_thread``)
+so queries never block the event loop.
 """
 
 import asyncio
-import json
 import logging
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import List
+from itertools import chain, zip_longest
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session, load_only
 
+from app.config import settings
 from app.database import get_scoped_session
 from app.models import Policy, Snapshot, Diff
-from app.services.scraper import scrape_policy, compute_hash
+from app.services.scraper import scrape_policy_if_modified
 from app.services.differ import compute_full_diff
-from app.services.analyzer import analyze_diff
+from app.services.analyzer import analyze_diff, analyze_diffs_batch
 from app.services.notifier import send_alert
+from app.utils import json_helpers
 from app.utils.datetime_helpers import utcnow
 
 logger = logging.getLogger(__name__)
 
-# Maximum concurrent policy checks (limits HTTP + LLM parallelism)
-MAX_CONCURRENT_CHECKS = 5
+# Per-stage concurrency limits.  Each stage of check_policy() is gated by
+# its own semaphore, so scrapes for some policies overlap with LLM calls
+# and alerts for others.  LLM calls are already capped by the analyzer's
+# global semaphore (LLM_MAX_CONCURRENT).
+MAX_CONCURRENT_SCRAPES = 50
+MAX_CONCURRENT_NOTIFICATIONS = 10
+
+_scrape_semaphore: Optional[asyncio.Semaphore] = None
+_notify_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_scrape_semaphore() -> asyncio.Semaphore:
+    """Lazy-init the scrape semaphore (must be created inside an event loop)."""
+    global _scrape_semaphore
+    if _scrape_semaphore is None:
+        _scrape_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+    return _scrape_semaphore
+
+
+def _get_notify_semaphore() -> asyncio.Semaphore:
+    """Lazy-init the notification semaphore (must be created inside an event loop)."""
+    global _notify_semaphore
+    if _notify_semaphore is None:
+        _notify_semaphore = asyncio.Semaphore(MAX_CONCURRENT_NOTIFICATIONS)
+    return _notify_semaphore
+
+# Log scheduled-check progress every N completed policies
+PROGRESS_LOG_EVERY = 50
+
+# A failed check is retried after FAILURE_BACKOFF, doubling with each
+# consecutive failure, but never later than the policy's own interval.
+FAILURE_BACKOFF = timedelta(minutes=15)
+MAX_BACKOFF_DOUBLINGS = 8
+
+
+@dataclass
+class PendingAnalysis:
+    """A changed policy whose diff is ready for LLM analysis.
+
+    Nothing is written yet: ``_save_diffs`` inserts the new snapshot together
+    with its Diff in one transaction.  If the check fails, is cancelled or
+    the process dies before then, no diff-less snapshot is left behind and
+    the next check detects the same change again.
+    """
+    policy_id: int
+    policy_name: str
+    policy_company: str
+    policy_type: str
+    old_snapshot_id: int
+    snapshot: Dict  # column values for the new Snapshot row
+    diff_data: Dict[str, str]
+
+    def analysis_request(self) -> dict:
+        """Keyword arguments for analyze_diff() / one analyze_diffs_batch() item."""
+        return {
+            "policy_name": self.policy_name,
+            "company": self.policy_company,
+            "policy_type": self.policy_type,
+            "diff_text": self.diff_data["diff_excerpt"],
+            "clauses_added": self.diff_data["clauses_added"],
+            "clauses_removed": self.diff_data["clauses_removed"],
+            "clauses_modified": self.diff_data["clauses_modified"],
+        }
 
 
 async def check_policy(policy_id: int, policy_url: str, policy_name: str,
@@ -36,61 +104,52 @@ async def check_policy(policy_id: int, policy_url: str, policy_name: str,
 
     Returns a status dict.
     """
-    with get_scoped_session() as db:
-        try:
-            # Step 1: Scrape
-            text, content_hash, discovered_links = await scrape_policy(policy_url)
+    prepared = await _prepare_check(
+        policy_id, policy_url, policy_name, policy_company, policy_type,
+    )
+    if not isinstance(prepared, PendingAnalysis):
+        return prepared
 
-            # Step 2: Check if content has changed
-            latest = (
-                db.query(Snapshot)
-                .filter(Snapshot.policy_id == policy_id)
-                .order_by(Snapshot.captured_at.desc())
-                .first()
-            )
+    try:
+        analysis = await analyze_diff(**prepared.analysis_request())
+    except Exception as e:
+        return await _pipeline_error(prepared.policy_id, prepared.policy_name, e)
+    return await _finalize_check(prepared, analysis)
 
-            if latest and latest.content_hash == content_hash:
-                # Update next_check_at even on unchanged
-                _update_next_check(db, policy_id)
-                logger.info(f"No changes detected for {policy_name}")
-                return {
-                    "policy_id": policy_id,
-                    "status": "unchanged",
-                    "message": f"No changes detected for {policy_name}",
-                }
-
-            # Step 3: Idempotency — check if snapshot with same hash already exists
-            existing_snap = (
-                db.query(Snapshot)
-                .filter(Snapshot.policy_id == policy_id, Snapshot.content_hash == content_hash)
-                .first()
-            )
-            if existing_snap:
-                logger.info(f"Duplicate snapshot detected for {policy_name} (hash collision)")
-                return {
-                    "policy_id": policy_id,
-                    "status": "unchanged",
-                    "message": f"Content already captured for {policy_name}",
-                }
-
-            # Step 4: Save new snapshot
-            links_json = json.dumps(discovered_links) if discovered_links else None
-            new_snapshot = Snapshot(
-                policy_id=policy_id,
-                content_text=text,
-                content_hash=content_hash,
-                content_length=len(text),
-                discovered_links=links_json,
-            )
-            db.add(new_snapshot)
-            db.flush()
 
-            if not latest:
-                _update_next_check(db, policy_id)
-                db.commit()
-                logger.info(f"First snapshot captured for {policy_name}")
+async def _prepare_check(policy_id: int, policy_url: str, policy_name: str,
+                         policy_company: str, policy_type: str) -> Union[dict, PendingAnalysis]:
+    """Phase 1: scrape, detect changes and compute the diff.
 
-                # Notify followers that the policy is now being tracked
+    Returns a terminal status dict (unchanged / first_snapshot / error) or a
+    PendingAnalysis for a changed policy, whose snapshot is not stored yet.
+    """
+    try:
+        # Step 1: Conditional scrape (no session held during network I/O).
+        # The latest capture's ETag / Last-Modified let the server answer a
+        # bodiless 304, and its raw HTML hash skips parsing an identical body.
+        previous = await asyncio.to_thread(_latest_validators, policy_id)
+        async with _get_scrape_semaphore():
+            scraped = await scrape_policy_if_modified(policy_url, **previous)
+
+        if scraped is None:
+            await asyncio.to_thread(_mark_checked, policy_id)
+            return _unchanged(policy_id, policy_name)
+        text, content_hash, discovered_links, validators = scraped
+        snapshot = _snapshot_row(policy_id, text, content_hash, discovered_links, validators)
+
+        # Transaction A: change detection (in a worker thread so the event
+        # loop keeps serving other checks during DB I/O)
+        recorded = await asyncio.to_thread(_record_snapshot, snapshot)
+        if recorded is None:
+            return _unchanged(policy_id, policy_name)
+        old_snapshot_id, old_text = recorded
+
+        if old_snapshot_id is None:
+            logger.info(f"First snapshot captured for {policy_name}")
+
+            # Notify followers that the policy is now being tracked
+            async with _get_notify_semaphore():
                 await send_alert(
                     policy_name=policy_name,
                     company=policy_company,
@@ -102,108 +161,326 @@ async def check_policy(policy_id: int, policy_url: str, policy_name: str,
                     policy_id=policy_id,
                 )
 
-                return {
-                    "policy_id": policy_id,
-                    "status": "first_snapshot",
-                    "message": f"First snapshot captured for {policy_name} ({len(text)} chars)",
-                }
-
-            # Step 5: Idempotency — check if diff already exists for this snapshot pair
-            existing_diff = (
-                db.query(Diff)
-                .filter(
-                    Diff.old_snapshot_id == latest.id,
-                    Diff.new_snapshot_id == new_snapshot.id,
-                )
-                .first()
-            )
-            if existing_diff:
-                db.commit()
-                return {
-                    "policy_id": policy_id,
-                    "status": "changed",
-                    "message": "Change already recorded",
-                    "diff_id": existing_diff.id,
-                }
-
-            # Step 6: Compute diff
-            diff_data = compute_full_diff(latest.content_text, text)
-
-            # Step 7: Analyze with LLM
-            analysis = await analyze_diff(
-                policy_name=policy_name,
-                company=policy_company,
-                policy_type=policy_type,
-                diff_text=diff_data["diff_text"],
-                clauses_added=diff_data["clauses_added"],
-                clauses_removed=diff_data["clauses_removed"],
-                clauses_modified=diff_data["clauses_modified"],
-            )
+            return {
+                "policy_id": policy_id,
+                "status": "first_snapshot",
+                "message": f"First snapshot captured for {policy_name} ({len(text)} chars)",
+            }
 
-            # Step 8: Save diff record
-            diff_record = Diff(
-                policy_id=policy_id,
-                old_snapshot_id=latest.id,
-                new_snapshot_id=new_snapshot.id,
-                diff_html=diff_data["diff_html"],
-                diff_text=diff_data["diff_text"],
-                clauses_added=diff_data["clauses_added"],
-                clauses_removed=diff_data["clauses_removed"],
-                clauses_modified=diff_data["clauses_modified"],
-                summary=analysis.get("summary"),
-                severity=analysis.get("severity", "informational"),
-                severity_score=analysis.get("severity_score", 0.0),
-                key_changes=analysis.get("key_changes"),
-                recommendation=analysis.get("recommendation"),
-            )
-            db.add(diff_record)
-            db.flush()
-
-            # Step 9: Send notifications — track success/failure accurately
-            alert_ok = await send_alert(
-                policy_name=policy_name,
-                company=policy_company,
-                severity=diff_record.severity,
-                summary=diff_record.summary or "",
-                key_changes=diff_record.key_changes or "[]",
-                recommendation=diff_record.recommendation or "",
-                diff_id=diff_record.id,
-                policy_id=policy_id,
-            )
-            diff_record.email_sent = alert_ok
-            if alert_ok:
-                diff_record.email_sent_at = utcnow()
+        # Step 6: diff (CPU-bound, off the event loop) with no session held
+        diff_data = await asyncio.to_thread(compute_full_diff, old_text, text)
 
-            _update_next_check(db, policy_id)
-            db.commit()
+        return PendingAnalysis(
+            policy_id=policy_id,
+            policy_name=policy_name,
+            policy_company=policy_company,
+            policy_type=policy_type,
+            old_snapshot_id=old_snapshot_id,
+            snapshot=snapshot,
+            diff_data=diff_data,
+        )
 
-            logger.info(
-                f"Change detected for {policy_name}: severity={diff_record.severity}, "
-                f"diff_id={diff_record.id}, notified={alert_ok}"
-            )
+    except Exception as e:
+        return await _pipeline_error(policy_id, policy_name, e)
 
-            return {
-                "policy_id": policy_id,
-                "status": "changed",
-                "message": f"Change detected: {analysis.get('summary', 'See diff for details')}",
-                "diff_id": diff_record.id,
-            }
 
+async def _finalize_check(pending: PendingAnalysis, analysis: Dict) -> dict:
+    """Phase 3: save the snapshot and Diff, send notifications, record delivery.
+
+    Commits in its own sessions, so one policy's failure never rolls back
+    another's results.
+    """
+    try:
+        # Transaction B: Step 8 — save the snapshot and its diff record
+        (diff_id,) = await asyncio.to_thread(_save_diffs, [pending], [analysis])
+
+        # Step 9: Send notifications (no session held) — track success/failure accurately
+        alert_ok = await _notify_change(pending, analysis, diff_id)
+
+        # Transaction C: record delivery
+        if alert_ok:
+            await asyncio.to_thread(_mark_notified, [diff_id])
+
+        return _changed_result(pending, analysis, diff_id, alert_ok)
+
+    except Exception as e:
+        return await _pipeline_error(pending.policy_id, pending.policy_name, e)
+
+
+async def _finalize_batch(pending: List[PendingAnalysis], analyses: List[Dict]) -> List[dict]:
+    """Phase 3 for a whole tick: one transaction for every new snapshot and
+    Diff row, one for every delivery flag, notifications in between.
+
+    If the bulk insert fails, each policy is finalized on its own so one
+    bad row cannot lose the others' results.
+    """
+    try:
+        diff_ids = await asyncio.to_thread(_save_diffs, pending, analyses)
+    except Exception as e:
+        logger.warning(f"Bulk diff insert failed ({e}); saving diffs one by one")
+        return list(await asyncio.gather(*(
+            _finalize_check(p, analysis) for p, analysis in zip(pending, analyses)
+        )))
+
+    async def _notify(p: PendingAnalysis, analysis: Dict, diff_id: int):
+        try:
+            return await _notify_change(p, analysis, diff_id)
         except Exception as e:
-            db.rollback()
-            logger.error(f"Pipeline error for {policy_name}: {e}", exc_info=True)
-            return {
-                "policy_id": policy_id,
-                "status": "error",
-                "message": str(e),
+            return await _pipeline_error(p.policy_id, p.policy_name, e)
+
+    outcomes = await asyncio.gather(*(
+        _notify(p, analysis, diff_id)
+        for p, analysis, diff_id in zip(pending, analyses, diff_ids)
+    ))
+
+    delivered = [diff_id for diff_id, ok in zip(diff_ids, outcomes) if ok is True]
+    if delivered:
+        try:
+            await asyncio.to_thread(_mark_notified, delivered)
+        except Exception as e:
+            logger.error(f"Failed to record delivery for {len(delivered)} diffs: {e}")
+
+    return [
+        outcome if isinstance(outcome, dict)
+        else _changed_result(p, analysis, diff_id, outcome)
+        for p, analysis, diff_id, outcome in zip(pending, analyses, diff_ids, outcomes)
+    ]
+
+
+async def _notify_change(pending: PendingAnalysis, analysis: Dict, diff_id: int) -> bool:
+    """Send the change alert for a saved diff; returns whether it was delivered."""
+    async with _get_notify_semaphore():
+        return await send_alert(
+            policy_name=pending.policy_name,
+            company=pending.policy_company,
+            severity=analysis.get("severity", "informational"),
+            summary=analysis.get("summary") or "",
+            key_changes=analysis.get("key_changes") or "[]",
+            recommendation=analysis.get("recommendation") or "",
+            diff_id=diff_id,
+            policy_id=pending.policy_id,
+        )
+
+
+def _changed_result(pending: PendingAnalysis, analysis: Dict, diff_id: int, alert_ok: bool) -> dict:
+    """Log and build the status dict for a recorded change."""
+    logger.info(
+        f"Change detected for {pending.policy_name}: "
+        f"severity={analysis.get('severity', 'informational')}, "
+        f"diff_id={diff_id}, notified={alert_ok}"
+    )
+    return {
+        "policy_id": pending.policy_id,
+        "status": "changed",
+        "message": f"Change detected: {analysis.get('summary', 'See diff for details')}",
+        "diff_id": diff_id,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Blocking transactions — each runs in a worker thread via asyncio.to_thread
+# with its own session, so no query ever blocks the event loop.
+# ---------------------------------------------------------------------------
+
+def _unchanged(policy_id: int, policy_name: str) -> dict:
+    """Log and build the status dict for a policy with no new content."""
+    logger.info(f"No changes detected for {policy_name}")
+    return {
+        "policy_id": policy_id,
+        "status": "unchanged",
+        "message": f"No changes detected for {policy_name}",
+    }
+
+
+# Snapshot columns that let the next check skip an unchanged page
+_VALIDATOR_COLUMNS = (Snapshot.etag, Snapshot.last_modified, Snapshot.raw_hash)
+
+
+def _latest_validators(policy_id: int) -> Dict[str, Optional[str]]:
+    """Return the latest snapshot's etag / last_modified / raw_hash."""
+    with get_scoped_session() as db:
+        row = (
+            db.query(*_VALIDATOR_COLUMNS)
+            .filter(Snapshot.policy_id == policy_id)
+            .order_by(Snapshot.captured_at.desc())
+            .first()
+        )
+    return {col.key: (getattr(row, col.key) if row else None) for col in _VALIDATOR_COLUMNS}
+
+
+def _mark_checked(policy_id: int):
+    """Schedule the next check for a page known to be unchanged."""
+    with get_scoped_session() as db:
+        _update_next_check(db, policy_id)
+        db.commit()
+
+
+def _snapshot_row(
+    policy_id: int, text: str, content_hash: str, discovered_links: List[str],
+    validators: Dict[str, Optional[str]],
+) -> Dict:
+    """Column values for a newly scraped Snapshot."""
+    return {
+        "policy_id": policy_id,
+        "content_text": text,
+        "content_hash": content_hash,
+        "content_length": len(text),
+        "discovered_links": json_helpers.dumps(discovered_links) if discovered_links else None,
+        "captured_at": utcnow(),
+        **validators,
+    }
+
+
+def _record_snapshot(snapshot: Dict) -> Optional[Tuple[Optional[int], Optional[str]]]:
+    """Transaction A: detect whether the scraped content is new.
+
+    Returns None when unchanged.  A policy's first snapshot is stored here
+    and ``(None, None)`` returned.  Otherwise returns ``(old_snapshot_id,
+    old_text)`` for the diff; the new snapshot is NOT stored here but by
+    _save_diffs(), together with its Diff.
+    """
+    policy_id = snapshot["policy_id"]
+    with get_scoped_session() as db:
+        # Has this exact content been captured before?  A hash-only lookup on
+        # (policy_id, content_hash) — no snapshot text is loaded.  Covers both
+        # "unchanged since last check" and a revert to an earlier version.
+        already_captured = db.query(
+            db.query(Snapshot.id)
+            .filter(Snapshot.policy_id == policy_id, Snapshot.content_hash == snapshot["content_hash"])
+            .exists()
+        ).scalar()
+
+        if already_captured:
+            # Same content, but the server may have issued new validators
+            # (or none before): keep the latest snapshot's current so the
+            # next check can be answered with a 304
+            latest_id = (
+                db.query(Snapshot.id)
+                .filter(Snapshot.policy_id == policy_id)
+                .order_by(Snapshot.captured_at.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+            db.query(Snapshot).filter(
+                Snapshot.id == latest_id,
+                or_(*(col.is_distinct_from(snapshot[col.key]) for col in _VALIDATOR_COLUMNS)),
+            ).update(
+                {col: snapshot[col.key] for col in _VALIDATOR_COLUMNS},
+                synchronize_session=False,
+            )
+            # Update next_check_at even on unchanged
+            _update_next_check(db, policy_id)
+            db.commit()
+            return None
+
+        # Content changed — load only the latest snapshot's id and text,
+        # which the diff needs
+        latest = (
+            db.query(Snapshot)
+            .options(load_only(Snapshot.id, Snapshot.content_text))
+            .filter(Snapshot.policy_id == policy_id)
+            .order_by(Snapshot.captured_at.desc())
+            .first()
+        )
+        if latest is not None:
+            return latest.id, latest.content_text
+
+        # First snapshot: there is no diff to wait for, so store it now
+        db.execute(insert(Snapshot), [snapshot])
+        _update_next_check(db, policy_id)
+        db.commit()
+        return None, None
+
+
+def _save_diffs(pending: List[PendingAnalysis], analyses: List[Dict]) -> List[int]:
+    """Transaction B: insert the new snapshots and their Diff rows, and
+    schedule each policy's next check.
+
+    A snapshot is only ever committed together with its Diff.  One
+    executemany INSERT ... RETURNING per table and one policy lookup for the
+    whole list, in a single transaction.  Returns the new diff ids in input
+    order.
+    """
+    with get_scoped_session() as db:
+        snapshot_ids = db.execute(
+            insert(Snapshot).returning(Snapshot.id, sort_by_parameter_order=True),
+            [p.snapshot for p in pending],
+        ).scalars().all()
+        rows = [
+            {
+                "policy_id": p.policy_id,
+                "old_snapshot_id": p.old_snapshot_id,
+                "new_snapshot_id": snapshot_id,
+                "diff_html": p.diff_data["diff_html"],
+                "diff_text": p.diff_data["diff_text"],
+                "clauses_added": p.diff_data["clauses_added"],
+                "clauses_removed": p.diff_data["clauses_removed"],
+                "clauses_modified": p.diff_data["clauses_modified"],
+                "summary": analysis.get("summary"),
+                "severity": analysis.get("severity", "informational"),
+                "severity_score": analysis.get("severity_score", 0.0),
+                "key_changes": analysis.get("key_changes"),
+                "recommendation": analysis.get("recommendation"),
             }
+            for p, analysis, snapshot_id in zip(pending, analyses, snapshot_ids)
+        ]
+        diff_ids = db.execute(
+            insert(Diff).returning(Diff.id, sort_by_parameter_order=True), rows,
+        ).scalars().all()
+        _update_next_check(db, [p.policy_id for p in pending])
+        db.commit()
+    return list(diff_ids)
 
 
-def _update_next_check(db: Session, policy_id: int):
-    """Update the next_check_at timestamp based on the policy's interval."""
-    policy = db.query(Policy).filter(Policy.id == policy_id).first()
-    if policy:
-        policy.next_check_at = utcnow() + timedelta(hours=policy.check_interval_hours)
+def _mark_notified(diff_ids: List[int]):
+    """Transaction C: record that the alerts for these diffs were delivered."""
+    with get_scoped_session() as db:
+        db.query(Diff).filter(Diff.id.in_(diff_ids)).update(
+            {Diff.email_sent: True, Diff.email_sent_at: utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+
+
+async def _pipeline_error(policy_id: int, policy_name: str, error: Exception) -> dict:
+    """Log a pipeline failure, schedule a backed-off retry, and return the error dict."""
+    logger.error(f"Pipeline error for {policy_name}: {error}", exc_info=error)
+    try:
+        await asyncio.to_thread(_record_failure, policy_id)
+    except Exception as e:
+        logger.warning(f"Could not reschedule {policy_name} after failure: {e}")
+    return {
+        "policy_id": policy_id,
+        "status": "error",
+        "message": str(error),
+    }
+
+
+def _record_failure(policy_id: int):
+    """Push a failed policy's next_check_at forward with exponential backoff.
+
+    Without this the policy would stay due, and the scheduler would retry
+    the broken site on every wake-up.
+    """
+    with get_scoped_session() as db:
+        policy = db.get(Policy, policy_id)
+        if policy is None:
+            return
+        failures = (policy.consecutive_failures or 0) + 1
+        backoff = FAILURE_BACKOFF * 2 ** min(failures - 1, MAX_BACKOFF_DOUBLINGS)
+        policy.consecutive_failures = failures
+        policy.next_check_at = utcnow() + min(backoff, timedelta(hours=policy.check_interval_hours))
+        db.commit()
+
+
+def _update_next_check(db: Session, policy_ids: Union[int, List[int]]):
+    """Update next_check_at for one or more policies based on their interval."""
+    if isinstance(policy_ids, int):
+        policy_ids = [policy_ids]
+    now = utcnow()
+    for policy in db.query(Policy).filter(Policy.id.in_(policy_ids)):
+        policy.next_check_at = now + timedelta(hours=policy.check_interval_hours)
+        policy.consecutive_failures = 0
 
 
 async def check_policy_from_orm(policy: Policy) -> dict:
@@ -221,82 +498,113 @@ async def check_policy_from_orm(policy: Policy) -> dict:
     )
 
 
-async def check_all_policies(owner_id: int = None):
-    """Check all active policies concurrently with independent sessions.
-
-    Each policy check gets its own database session via check_policy().
-    The policy list is fetched in a separate session that is closed before
-    any concurrent work begins.
-
-    If owner_id is provided, only policies owned by that user are checked.
-    If owner_id is None, all active policies are checked (scheduler mode).
-    """
+def _due_policies(owner_id: Optional[int]) -> List[dict]:
+    """Load the active policies whose next check is due, as plain dicts."""
+    # Only due policies, and only the columns check_policy() needs; the
+    # partial index ix_policies_active_next_check serves the due filter.
     with get_scoped_session() as db:
-        query = db.query(Policy).filter(Policy.is_active == True)
+        query = db.query(
+            Policy.id, Policy.url, Policy.name, Policy.company, Policy.policy_type,
+        ).filter(
+            Policy.is_active == True,
+            or_(Policy.next_check_at.is_(None), Policy.next_check_at <= utcnow()),
+        )
         if owner_id is not None:
             query = query.filter(Policy.owner_id == owner_id)
-        policies = query.all()
-        # Extract primitives before closing the session
-        policy_data = [
+        return [
             {
-                "id": p.id,
-                "url": p.url,
-                "name": p.name,
-                "company": p.company,
-                "policy_type": p.policy_type,
-                "next_check_at": p.next_check_at,
+                "id": row.id,
+                "url": row.url,
+                "name": row.name,
+                "company": row.company,
+                "policy_type": row.policy_type,
             }
-            for p in policies
+            for row in query
         ]
 
-    # Filter to only policies that are due for a check
-    now = utcnow()
-    due_policies = [
-        p for p in policy_data
-        if p["next_check_at"] is None or p["next_check_at"] <= now
-    ]
 
-    if not due_policies:
-        logger.info("No policies due for checking")
-        return []
+def _interleave_by_host(policies: List[dict]) -> List[dict]:
+    """Order policies round-robin across hosts.
 
-    logger.info(
-        f"Starting scheduled check for {len(due_policies)} policies "
-        f"(of {len(policy_data)} total active)"
-    )
+    Each host's pages are fetched over one shared (HTTP/2) connection, gated
+    by the scraper's per-host semaphore.  Semaphores are FIFO, so starting
+    the checks in this order keeps one company's dozens of subpages from
+    filling every scrape slot while other hosts wait behind them.
+    """
+    by_host: Dict[str, List[dict]] = {}
+    for p in policies:
+        by_host.setdefault(urlparse(p["url"]).netloc.lower(), []).append(p)
+    if len(by_host) == len(policies):
+        return policies
+    rounds = zip_longest(*by_host.values())
+    return [p for p in chain.from_iterable(rounds) if p is not None]
 
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
 
-    async def _check_with_semaphore(p: dict):
-        async with semaphore:
-            return await check_policy(
-                policy_id=p["id"],
-                policy_url=p["url"],
-                policy_name=p["name"],
-                policy_company=p["company"],
-                policy_type=p["policy_type"],
-            )
+async def check_all_policies(owner_id: int = None):
+    """Check all active policies concurrently with independent sessions.
 
-    results = await asyncio.gather(
-        *[_check_with_semaphore(p) for p in due_policies],
-        return_exceptions=True,
-    )
+    Runs check_policy() in three phases so changed policies share LLM
+    requests: scrape + diff everything, analyze all diffs in batches
+    (analyze_diffs_batch), then save each new snapshot with its Diff and
+    notify.  Changed snapshots are not written until that last phase, so a
+    tick that dies midway leaves every change to be detected again on the
+    next one.  Every step uses its own database session.  The policy list
+    is fetched in a separate session that is closed before any concurrent
+    work begins.
+
+    If owner_id is provided, only policies owned by that user are checked.
+    If owner_id is None, all active policies are checked (scheduler mode).
+    """
+    due_policies = await asyncio.to_thread(_due_policies, owner_id)
+
+    if not due_policies:
+        logger.info("No policies due for checking")
+        return []
+
+    total = len(due_policies)
+    logger.info(f"Starting scheduled check for {total} due policies")
 
+    # Phase 1: scrape + diff every policy.  No outer gate: each stage is
+    # limited by its own semaphore.  Results are consumed as they finish so
+    # each check's data can be released without waiting for the slowest.
     final_results: List[dict] = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            final_results.append({
-                "policy_id": due_policies[i]["id"],
-                "status": "error",
-                "message": str(result),
-            })
+    pending: List[PendingAnalysis] = []
+    prepares = [
+        _prepare_check(p["id"], p["url"], p["name"], p["company"], p["policy_type"])
+        for p in _interleave_by_host(due_policies)
+    ]
+    # Every result carries its own policy_id, so nothing pairs results back
+    # to this list; drop it rather than pinning it for the whole tick.
+    del due_policies
+    for done in asyncio.as_completed(prepares):
+        prepared = await done
+        if isinstance(prepared, PendingAnalysis):
+            pending.append(prepared)
+            continue
+        final_results.append(prepared)
+        if len(final_results) % PROGRESS_LOG_EVERY == 0:
+            logger.info(f"Scheduled check progress: {len(final_results)}/{total}")
+
+    if pending:
+        # Phase 2: analyse every changed policy together — one LLM request per
+        # ANALYSIS_BATCH_SIZE diffs instead of one per policy.
+        logger.info(f"Analyzing {len(pending)} changed policies in batches")
+        try:
+            analyses = await analyze_diffs_batch([p.analysis_request() for p in pending])
+        except Exception as e:
+            final_results.extend(await asyncio.gather(*(
+                _pipeline_error(p.policy_id, p.policy_name, e)
+                for p in pending
+            )))
         else:
-            final_results.append(result)
+            # Phase 3: save every Diff in one transaction, then notify
+            final_results.extend(await _finalize_batch(pending, analyses))
 
     changes = [r for r in final_results if r["status"] == "changed"]
     errors = [r for r in final_results if r["status"] == "error"]
     logger.info(
         f"Scheduled check complete: {len(changes)} changes, {len(errors)} errors "
-        f"(concurrent limit: {MAX_CONCURRENT_CHECKS})"
+        f"(limits: {MAX_CONCURRENT_SCRAPES} scrapes, {settings.llm_max_concurrent} LLM, "
+        f"{MAX_CONCURRENT_NOTIFICATIONS} notifications)"
     )
     return final_results
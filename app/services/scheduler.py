@@ -1,49 +1,98 @@
-"""APScheduler-based periodic policy checking.
+"""In-process periodic policy checking.
 
-The scheduler runs a single job at a fixed base interval (e.g. every hour).
-Each run calls ``check_all_policies()`` which respects per-policy
-``next_check_at`` timestamps, so policies with different intervals are
-handled correctly without needing individual APScheduler jobs.
+A single asyncio task sleeps until the soonest ``next_check_at`` among
+active policies, then calls ``check_all_policies()``, which fetches only
+the policies that are due.  A policy is checked when its interval elapses
+rather than on the next fixed tick.  While nothing is due the loop still
+wakes every MAX_SLEEP_SECS, to notice policies added or rescheduled in the
+meantime.  Failed checks back off by pushing their own ``next_check_at``
+forward (see pipeline._record_failure).
 """
 
+import asyncio
+import datetime
 import logging
+from typing import Awaitable, Callable, Optional
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import func
+
+from app.database import get_scoped_session
+from app.models import Policy
+from app.utils.datetime_helpers import utcnow
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+_task: Optional[asyncio.Task] = None
+
+# Longest uninterrupted sleep.  Policies added or re-scheduled while the
+# loop sleeps do not wake it, so it re-reads the soonest due time at least
+# this often.
+MAX_SLEEP_SECS = 15 * 60
+
+# Pause after each run.  Only a safety net: failed checks reschedule
+# themselves, but a policy whose rescheduling also failed (e.g. the
+# database was unavailable) would otherwise be retried in a tight loop.
+MIN_RUN_GAP_SECS = 60
+
+
+def _seconds_until_next_due(session_factory=get_scoped_session) -> Optional[float]:
+    """Seconds until the soonest active policy is due (<= 0 if one is due now).
 
-# Base tick interval — the scheduler wakes up this often and checks
-# which policies are due.  Individual policy intervals are honoured
-# via the ``next_check_at`` column (see pipeline.check_all_policies).
-BASE_TICK_HOURS = 1
+    Returns None when there are no active policies.
+    """
+    with session_factory() as db:
+        active = db.query(Policy.id).filter(Policy.is_active == True)
+        if active.filter(Policy.next_check_at.is_(None)).first() is not None:
+            return 0.0
+        # Served by the partial index ix_policies_active_next_check.
+        next_due = active.with_entities(func.min(Policy.next_check_at)).scalar()
+    if next_due is None:
+        return None
+    if next_due.tzinfo is None:  # SQLite drops the offset; values are UTC
+        next_due = next_due.replace(tzinfo=datetime.timezone.utc)
+    return (next_due - utcnow()).total_seconds()
+
+
+async def scheduler_loop(check_callback: Callable[[], Awaitable], session_factory=get_scoped_session):
+    """Run ``check_callback`` whenever a policy is due, sleeping in between."""
+    while True:
+        try:
+            delay = await asyncio.to_thread(_seconds_until_next_due, session_factory)
+        except Exception as e:
+            logger.error(f"Scheduler could not read next due time: {e}")
+            delay = MAX_SLEEP_SECS
+        if delay is None:
+            delay = MAX_SLEEP_SECS
+        if delay > 0:
+            await asyncio.sleep(min(delay, MAX_SLEEP_SECS))
+            continue
 
+        try:
+            await check_callback()
+        except Exception as e:
+            logger.error(f"Scheduled check failed: {e}", exc_info=True)
+        await asyncio.sleep(MIN_RUN_GAP_SECS)
 
-def start_scheduler(check_callback, interval_hours: int = BASE_TICK_HOURS):
-    """Start the background scheduler for periodic policy checks.
+
+def start_scheduler(check_callback, session_factory=get_scoped_session):
+    """Start the background scheduler task for periodic policy checks.
 
     ``check_callback`` should be an async callable (no arguments) that
-    invokes ``check_all_policies()``.
+    invokes ``check_all_policies()``.  Must be called from a running loop.
     """
-    scheduler.add_job(
-        check_callback,
-        trigger=IntervalTrigger(hours=interval_hours),
-        id="policy_check",
-        name="Periodic Policy Check",
-        replace_existing=True,
-        max_instances=1,  # Prevent overlapping runs
-    )
-    scheduler.start()
-    logger.info(
-        f"Scheduler started — base tick every {interval_hours}h "
-        f"(per-policy intervals honoured via next_check_at)"
+    global _task
+    if _task is not None and not _task.done():
+        return
+    _task = asyncio.get_running_loop().create_task(
+        scheduler_loop(check_callback, session_factory), name="policy_check",
     )
+    logger.info("Scheduler started — waking for each policy's next_check_at")
 
 
 def stop_scheduler():
-    """Shut down the scheduler gracefully."""
-    if scheduler.running:
-        scheduler.shutdown(wait=False)
+    """Stop the scheduler task (an in-flight check is cancelled)."""
+    global _task
+    if _task is not None and not _task.done():
+        _task.cancel()
         logger.info("Scheduler stopped")
+    _task = None
@@ -17,12 +17,23 @@ import logging
 import random
 import re
 import unicodedata
-from typing import Tuple, Optional, List
+import weakref
+from typing import Dict, Tuple, Optional, List
 from urllib.parse import urljoin, urlparse
 
 import httpx
 from bs4 import BeautifulSoup
 import html2text
+import soupsieve
+from lxml import etree
+import lxml.html
+
+try:
+    import numpy as np
+except ImportError:  # optional accelerator — fall back to the per-line loop
+    np = None
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +51,46 @@ USER_AGENTS = [
 
 MIN_CONTENT_LENGTH = 200
 
+# Concurrency limits: at most N in-flight httpx fetches per target host (many
+# tracked policies share a domain), and a separate, tighter cap on headless
+# Chromium, where each instance costs ~150MB of RAM.  Over HTTP/2 the
+# fetches to one host are multiplexed as streams on a single connection
+# (one DNS lookup + TLS handshake per host), so a host can take more of
+# them at once without opening more sockets.
+MAX_REQUESTS_PER_HOST = 2
+MAX_STREAMS_PER_HOST_HTTP2 = 6
+MAX_CONCURRENT_BROWSERS = 2
+
+# asyncio semaphores belong to one event loop, and the Wayback seeder scrapes
+# from its own asyncio.run() loop, so the limits are kept per loop.  Entries
+# go away with their loop.
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_browser_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_host_semaphore(url: str) -> asyncio.Semaphore:
+    """Return the running loop's semaphore for ``url``'s host (created on first use)."""
+    host = urlparse(url).netloc.lower()
+    semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    sem = semaphores.get(host)
+    if sem is None:
+        limit = MAX_STREAMS_PER_HOST_HTTP2 if _SCRAPER_HTTP2 else MAX_REQUESTS_PER_HOST
+        sem = semaphores.setdefault(host, asyncio.Semaphore(limit))
+    return sem
+
+
+def _get_browser_semaphore() -> asyncio.Semaphore:
+    """Return the running loop's Playwright semaphore (created on first use)."""
+    loop = asyncio.get_running_loop()
+    sem = _browser_semaphores.get(loop)
+    if sem is None:
+        sem = _browser_semaphores.setdefault(loop, asyncio.Semaphore(MAX_CONCURRENT_BROWSERS))
+    return sem
+
 REMOVE_TAGS = [
     "script", "style", "nav", "header", "footer", "aside",
     "noscript", "iframe", "svg", "canvas", "video", "audio",
@@ -66,8 +117,12 @@ INVISIBLE_CHARS = re.compile(
     ']'
 )
 
-# Regex for collapsing 3+ consecutive newlines (used in _clean_text)
+# Regexes used by _clean_text, compiled once
 _RE_MULTI_NEWLINE = re.compile(r'\n{3,}')
+_RE_EMPTY_LINK = re.compile(r'\[]\([^)]*\)')
+_RE_MULTISPACE = re.compile(r'[ \t]{2,}')
+_RE_ESCAPED_HEADING = re.compile(r'^(#{1,6}\s+\d+)\\(\.)', re.MULTILINE)
+_RE_EMPTY_HEADING = re.compile(r'^#{1,6}\s*$', re.MULTILINE)
 
 CONTENT_SELECTORS = [
     "article", "[role='main']", "main",
@@ -76,6 +131,10 @@ CONTENT_SELECTORS = [
     ".entry-content", ".post-content", ".page-content", ".body-content",
 ]
 
+# Selectors compiled once at import instead of re-parsed on every page
+_SR_ONLY_SELECTOR = soupsieve.compile(",".join(f".{cls}" for cls in SR_ONLY_CLASSES))
+_CONTENT_SELECTORS_COMPILED = [soupsieve.compile(sel) for sel in CONTENT_SELECTORS]
+
 COOKIE_BANNER_SELECTORS = [
     "#onetrust-accept-btn-handler", "#accept-cookies", ".cookie-accept",
     "[data-testid='cookie-accept']", ".cc-accept", ".cc-btn.cc-allow",
@@ -89,6 +148,16 @@ COOKIE_BUTTON_TEXTS = [
     "Got it", "OK", "Allow all", "Allow All",
 ]
 
+# One locator query per strategy instead of one CDP round-trip per entry.
+# Only visible matches count, so a hidden consent button earlier in the DOM
+# cannot shadow the one actually shown.  Button/link names must *start*
+# with one of the texts so a union containing "OK" does not match e.g.
+# "Cookie settings" ahead of a real accept button.
+_COOKIE_SELECTOR_UNION = ", ".join(COOKIE_BANNER_SELECTORS) + " >> visible=true"
+_COOKIE_TEXT_RE = re.compile(
+    r"^\s*(?:" + "|".join(map(re.escape, COOKIE_BUTTON_TEXTS)) + r")\b", re.IGNORECASE,
+)
+
 # Path patterns that suggest a page is policy/legal content
 POLICY_PATH_PATTERNS = re.compile(
     r"/(privacy|policy|policies|legal|terms|tos|gdpr|ccpa|cookie|data-protection|"
@@ -96,25 +165,115 @@ POLICY_PATH_PATTERNS = re.compile(
     r"data-processing|subprocessors|security|compliance)", re.IGNORECASE
 )
 
+# Signs that a page only renders its content with JavaScript (or sits behind
+# a JS bot challenge), so the Playwright fallback is worth launching:
+# "enable JavaScript" notices, SPA mount points / framework markers, and
+# Cloudflare-style interstitials.
+_BROWSER_MARKERS = re.compile(
+    r"<noscript[^>]*>[^<]{0,300}?(?:enable|turn on|requires?|need)\s[^<]{0,40}?javascript"
+    r"|\bid=[\"'](?:__next|__nuxt|root|app|ember-application)[\"']"
+    r"|\bng-version=|\bdata-reactroot\b|\bdata-server-rendered\b|__NEXT_DATA__"
+    r"|cf-browser-verification|challenge-platform|<title>\s*Just a moment",
+    re.IGNORECASE,
+)
+_SCRIPT_BODY = re.compile(r"<script\b[^>]*>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+# Pages whose bytes are mostly inline script are client-rendered
+BROWSER_SCRIPT_RATIO = 0.5
+
+
+# Headers that never change between requests live on the shared client
+COMMON_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
 
 def _random_headers() -> dict:
+    """Per-request headers: only the rotating parts."""
     return {
         "User-Agent": random.choice(USER_AGENTS),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate",
     }
 
 
+# ---------------------------------------------------------------------------
+# Shared HTTP client — one connection pool for every scrape attempt
+# ---------------------------------------------------------------------------
+
+_client: Optional[httpx.AsyncClient] = None
+# Pooled connections belong to the event loop that opened them; the Wayback
+# seeder runs in its own loop (BackgroundTasks thread), so remember ours.
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+try:
+    import h2  # noqa: F401 — enables httpx's HTTP/2 support
+    _SCRAPER_HTTP2 = True
+except ImportError:  # optional — fall back to HTTP/1.1 keep-alive
+    _SCRAPER_HTTP2 = False
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Build a client with the scraper's pool limits and common headers."""
+    return httpx.AsyncClient(
+        http2=_SCRAPER_HTTP2,
+        headers=COMMON_HEADERS,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        follow_redirects=True,
+    )
+
+
+def init_scraper() -> httpx.AsyncClient:
+    """Create the shared scraper client (called on application startup).
+
+    Retries and repeat checks of the same site reuse pooled connections
+    instead of redoing DNS + TCP + TLS for every attempt.
+    """
+    global _client, _client_loop
+    if _client is None or _client.is_closed:
+        _client = _new_client()
+        try:
+            _client_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _client_loop = None
+    return _client
+
+
+def _get_client() -> Tuple[httpx.AsyncClient, bool]:
+    """Return ``(client, owned)`` for the running loop.
+
+    ``owned`` is True when the caller got a private client (a different event
+    loop than the shared one) and must close it when done.
+    """
+    global _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed:
+        init_scraper()
+    if _client_loop is None:
+        _client_loop = loop
+    if _client_loop is loop:
+        return _client, False
+    return _new_client(), True
+
+
+async def close_scraper() -> None:
+    """Close the shared scraper client and browser (called on application shutdown)."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
+    await close_playwright()
+
+
 # ---------------------------------------------------------------------------
 # HTML preprocessing — runs before html2text conversion
 # ---------------------------------------------------------------------------
 
 def _strip_sr_only(soup: BeautifulSoup) -> None:
     """Remove screen-reader-only and decorative aria-hidden elements."""
-    for cls in SR_ONLY_CLASSES:
-        for elem in soup.select(f".{cls}"):
-            elem.decompose()
+    for elem in _SR_ONLY_SELECTOR.select(soup):
+        elem.decompose()
     for elem in soup.find_all(attrs={"aria-hidden": "true"}):
         if elem.name in ("span", "i", "svg", "img") or len(elem.get_text(strip=True)) < 3:
             elem.decompose()
@@ -146,9 +305,9 @@ def _remove_empty_headings(soup: BeautifulSoup) -> None:
             h.decompose()
 
 
-def _promote_table_headers(soup: BeautifulSoup) -> None:
+def _promote_table_headers(soup: BeautifulSoup, tables: Optional[list] = None) -> None:
     """Promote first-row <td> cells styled as bold to <th> for proper markdown."""
-    for table in soup.find_all("table"):
+    for table in soup.find_all("table") if tables is None else tables:
         first_row = table.find("tr")
         if not first_row:
             continue
@@ -199,14 +358,14 @@ def _build_table_replacement(data_rows, headers):
     return replacement
 
 
-def _flatten_complex_tables(soup: BeautifulSoup) -> None:
+def _flatten_complex_tables(soup: BeautifulSoup, tables: Optional[list] = None) -> None:
     """Convert tables with rich cell content into structured sections.
 
     Markdown tables only support single-line cell content. When a table cell
     contains block elements (lists, multiple paragraphs), we replace the
     entire table with a column-per-section layout that html2text can handle.
     """
-    for table in soup.find_all("table"):
+    for table in soup.find_all("table") if tables is None else tables:
         data_rows = table.find_all("tr")[1:]  # skip header row
         if not _table_has_block_content(data_rows):
             continue
@@ -230,8 +389,12 @@ def _preprocess_html(soup: BeautifulSoup, url: str = "") -> BeautifulSoup:
         _resolve_relative_links(soup, url)
     _strip_invisible_unicode(soup)
     _remove_empty_headings(soup)
-    _promote_table_headers(soup)
-    _flatten_complex_tables(soup)
+    # Most policy pages have no tables: one scan decides, and is shared by
+    # both table passes instead of each walking the tree again.
+    tables = soup.find_all("table")
+    if tables:
+        _promote_table_headers(soup, tables)
+        _flatten_complex_tables(soup, tables)
     return soup
 
 
@@ -239,56 +402,108 @@ def _preprocess_html(soup: BeautifulSoup, url: str = "") -> BeautifulSoup:
 # Text cleaning
 # ---------------------------------------------------------------------------
 
+class _ControlCharTable(dict):
+    """``str.translate`` table mapping Unicode control/format chars ("C*") to a space.
+
+    Entries are filled in on first sight of each code point, so the
+    per-character ``unicodedata`` lookup happens once per distinct character
+    instead of once per character of every page.  Newline and tab are kept.
+    """
+
+    def __missing__(self, codepoint: int) -> int:
+        if codepoint in (0x0A, 0x09) or not unicodedata.category(chr(codepoint)).startswith('C'):
+            mapped = codepoint
+        else:
+            mapped = 0x20
+        self[codepoint] = mapped
+        return mapped
+
+
+_CONTROL_CHAR_TABLE = _ControlCharTable()
+for _cp in range(0x100):  # ASCII + Latin-1 up front: the common case
+    _CONTROL_CHAR_TABLE[_cp]
+del _cp
+
+
 def _replace_control_chars(text: str) -> str:
     """Replace control characters (except newline/tab) with spaces."""
-    cleaned = []
-    for char in text:
-        if char in ('\n', '\t'):
-            cleaned.append(char)
-        elif unicodedata.category(char).startswith('C'):
-            cleaned.append(' ')
-        else:
-            cleaned.append(char)
-    return ''.join(cleaned)
+    return text.translate(_CONTROL_CHAR_TABLE)
 
 
-def _is_junk_line(stripped: str) -> bool:
-    """Return True if a line should be discarded (low printable ratio or long blob)."""
-    printable_ascii = sum(
-        1 for c in stripped
-        if (c.isascii() and c.isprintable()) or c in ('\n', '\t')
-    )
+def _is_junk_line(stripped: str, printable_ascii: Optional[int] = None) -> bool:
+    """Return True if a line should be discarded (low printable ratio or long blob).
+
+    ``printable_ascii`` may be passed in when already counted (see
+    _printable_counts_per_line); otherwise it is counted here.
+    """
+    if printable_ascii is None:
+        printable_ascii = sum(
+            1 for c in stripped
+            if (c.isascii() and c.isprintable()) or c in ('\n', '\t')
+        )
     ratio = printable_ascii / len(stripped) if stripped else 1.0
     if ratio < 0.5:
         return True
-    return any(
+    return len(stripped) > 100 and any(
         len(word) > 100 and 'http' not in word
         for word in stripped.split()
     )
 
 
+# Below this size the plain per-line count beats NumPy's setup cost
+_VECTORIZE_MIN_CHARS = 10_000
+
+
+def _printable_counts_per_line(text: str, lines: List[str]) -> Optional[List[int]]:
+    """Printable-ASCII/tab/newline count of each stripped line, vectorized.
+
+    Flags every character in one NumPy pass over the code points and takes
+    per-line differences of the running total, replacing a Python loop per
+    character.  ``lines`` must be ``text.split("\\n")``.  Returns None when
+    NumPy is unavailable or the text is too small to be worth it.
+    """
+    if np is None or len(text) < _VECTORIZE_MIN_CHARS:
+        return None
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    printable = ((codes >= 0x20) & (codes < 0x7f)) | (codes == 0x09) | (codes == 0x0a)
+    running = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(printable, out=running[1:])
+
+    starts, ends = [], []
+    offset = 0  # index of the current line's first character in text
+    for line in lines:
+        starts.append(offset + len(line) - len(line.lstrip()))
+        ends.append(offset + len(line.rstrip()))
+        offset += len(line) + 1
+    return (running[ends] - running[starts]).tolist()
+
+
 def _clean_text(text: str) -> str:
     """Normalize whitespace, strip non-printable chars, and clean extracted text."""
     text = INVISIBLE_CHARS.sub("", text)
     text = _replace_control_chars(text)
 
+    lines = text.split("\n")
+    counts = _printable_counts_per_line(text, lines)
     clean_lines = []
-    for line in text.split("\n"):
+    for i, line in enumerate(lines):
         stripped = line.strip()
         if not stripped:
             clean_lines.append("")
-        elif len(stripped) < 15 or not _is_junk_line(stripped):
+        elif len(stripped) < 15 or not _is_junk_line(
+            stripped, counts[i] if counts is not None else None,
+        ):
             clean_lines.append(stripped)
 
     text = "\n".join(clean_lines)
     text = _RE_MULTI_NEWLINE.sub("\n\n", text)
     # Only strip very short/empty markdown links, keep real ones
-    text = re.sub(r'\[]\([^)]*\)', '', text)
-    text = re.sub(r'[ \t]{2,}', ' ', text)
+    text = _RE_EMPTY_LINK.sub('', text)
+    text = _RE_MULTISPACE.sub(' ', text)
     # Remove backslash-escaping of periods in numbered headings (e.g. "## 1\. Title")
-    text = re.sub(r'^(#{1,6}\s+\d+)\\(\.)' , r'\1\2', text, flags=re.MULTILINE)
+    text = _RE_ESCAPED_HEADING.sub(r'\1\2', text)
     # Remove standalone empty headings that may survive preprocessing
-    text = re.sub(r'^#{1,6}\s*$', '', text, flags=re.MULTILINE)
+    text = _RE_EMPTY_HEADING.sub('', text)
     text = _RE_MULTI_NEWLINE.sub("\n\n", text)
     return text.strip()
 
@@ -302,7 +517,11 @@ def _discover_policy_links(html: str, base_url: str) -> List[str]:
 
     Returns a deduplicated list of absolute URLs.
     """
-    soup = BeautifulSoup(html, "lxml")
+    return _discover_policy_links_from_soup(BeautifulSoup(html, "lxml"), base_url)
+
+
+def _discover_policy_links_from_soup(soup: BeautifulSoup, base_url: str) -> List[str]:
+    """Link discovery on an already-parsed document (must not be mutated yet)."""
     parsed_base = urlparse(base_url)
     base_domain = parsed_base.netloc.lower()
     base_path = parsed_base.path.rstrip("/")
@@ -340,6 +559,101 @@ def _discover_policy_links(html: str, base_url: str) -> List[str]:
     return sorted(discovered)
 
 
+# ---------------------------------------------------------------------------
+# HTML -> markdown — lxml walker (fast path) and html2text (default)
+# ---------------------------------------------------------------------------
+
+# Elements that start a new paragraph in the markdown output
+_BLOCK_TAGS = frozenset({
+    "p", "div", "section", "article", "main", "ul", "ol", "dl", "dt", "dd",
+    "table", "blockquote", "pre", "address", "figure", "figcaption",
+    "details", "summary", "hr",
+})
+_HEADING_PREFIX = {f"h{n}": "#" * n + " " for n in range(1, 7)}
+_RE_HTML_WHITESPACE = re.compile(r"[ \t\r\n\f]+")
+
+
+def _fast_html_to_markdown(html: str, base_url: str = "") -> str:
+    """Convert an HTML fragment to lightweight markdown with lxml.
+
+    Emits what the differ relies on — ``#`` headings, paragraph breaks,
+    ``* `` list items and inline ``[text](url)`` links — in one iterwalk
+    over lxml's C tree, instead of html2text's pure-Python parser.
+    Emphasis is dropped and table rows become ``cell | cell`` lines.
+    """
+    root = lxml.html.fragment_fromstring(html, create_parent="div")
+    parts: List[str] = []
+    emit = parts.append
+
+    def text_of(value: Optional[str]) -> None:
+        if value:
+            emit(_RE_HTML_WHITESPACE.sub(" ", value))
+
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, el in walker:
+        tag = el.tag
+        if not isinstance(tag, str):  # comments / processing instructions
+            if event == "end":
+                text_of(el.tail)
+            continue
+
+        if event == "start":
+            if tag in _HEADING_PREFIX:
+                emit("\n\n" + _HEADING_PREFIX[tag])
+            elif tag in _BLOCK_TAGS:
+                emit("\n\n")
+            elif tag == "li":
+                emit("\n* ")
+            elif tag == "br":
+                emit("\n")
+            elif tag == "tr":
+                emit("\n")
+            elif tag in ("td", "th") and el.getprevious() is not None:
+                emit(" | ")
+            elif tag == "a" and _link_target(el, base_url):
+                emit("[")
+            if tag == "pre":  # keep preformatted whitespace verbatim
+                emit(el.text_content())
+                walker.skip_subtree()
+                continue
+            text_of(el.text)
+        else:
+            if tag in _HEADING_PREFIX or tag in _BLOCK_TAGS:
+                emit("\n\n")
+            elif tag == "a":
+                href = _link_target(el, base_url)
+                if href:
+                    emit(f"]({href})")
+            text_of(el.tail)
+
+    return "".join(parts)
+
+
+def _link_target(el, base_url: str) -> str:
+    """Absolute href for an <a>, or "" for internal (#anchor) and empty links."""
+    href = (el.get("href") or "").strip()
+    if not href or href.startswith("#"):
+        return ""
+    return urljoin(base_url, href) if base_url else href
+
+
+def _html2text_markdown(html: str, base_url: str = "") -> str:
+    """Convert an HTML fragment to markdown with html2text."""
+    h = html2text.HTML2Text()
+    h.ignore_links = False          # CHANGED: preserve links
+    h.ignore_images = True
+    h.ignore_emphasis = False
+    h.body_width = 0
+    h.unicode_snob = False
+    h.skip_internal_links = True     # Skip #anchor links
+    h.inline_links = True            # [text](url) format
+    h.protect_links = False
+    h.wrap_links = False
+    h.single_line_break = False
+    h.base_url = base_url            # Helps html2text resolve relative URLs
+    return h.handle(html)
+
+
 # ---------------------------------------------------------------------------
 # Content extraction — now preserves links
 # ---------------------------------------------------------------------------
@@ -355,14 +669,17 @@ def extract_policy_text(html: str, url: str = "") -> str:
     entire page body inside a <nav> element.  Noise tags are then stripped
     only from within the selected content container.
     """
-    soup = BeautifulSoup(html, "lxml")
+    return _extract_policy_text_from_soup(BeautifulSoup(html, "lxml"), url)
+
 
+def _extract_policy_text_from_soup(soup: BeautifulSoup, url: str = "") -> str:
+    """Extraction on an already-parsed document.  Mutates ``soup``."""
     # Step 1: Find the content container BEFORE removing any tags.
     # Some government sites wrap <main>/<article> inside <nav>, so removing
     # <nav> globally would destroy the actual content.
     main_content = None
-    for selector in CONTENT_SELECTORS:
-        found = soup.select_one(selector)
+    for selector in _CONTENT_SELECTORS_COMPILED:
+        found = selector.select_one(soup)
         if found and len(found.get_text(strip=True)) > 200:
             main_content = found
             break
@@ -377,20 +694,10 @@ def extract_policy_text(html: str, url: str = "") -> str:
     # Pre-process HTML before conversion (sr-only removal, link resolution, etc.)
     main_content = _preprocess_html(main_content, url)
 
-    h = html2text.HTML2Text()
-    h.ignore_links = False          # CHANGED: preserve links
-    h.ignore_images = True
-    h.ignore_emphasis = False
-    h.body_width = 0
-    h.unicode_snob = False
-    h.skip_internal_links = True     # Skip #anchor links
-    h.inline_links = True            # [text](url) format
-    h.protect_links = False
-    h.wrap_links = False
-    h.single_line_break = False
-    h.base_url = url                 # Helps html2text resolve relative URLs
-
-    text = h.handle(str(main_content))
+    # html2text stays the default: the lxml walker formats text slightly
+    # differently, so switching re-hashes every tracked page once.
+    to_markdown = _fast_html_to_markdown if settings.fast_html_extractor else _html2text_markdown
+    text = to_markdown(str(main_content), url)
     return _clean_text(text)
 
 
@@ -399,32 +706,100 @@ _extract_policy_text = extract_policy_text
 
 
 def compute_hash(content: str) -> str:
-    """Compute SHA-256 hash of content."""
+    """Compute SHA-256 hash of content.
+
+    This is the persisted identity of every snapshot (change detection,
+    Wayback de-duplication, manual uploads), so switching algorithms would
+    make every stored page look changed once.  It is also not a bottleneck:
+    OpenSSL's SHA-256 uses the CPU's SHA extensions (~1 GB/s, under a
+    millisecond per typical policy page), faster than hashlib's BLAKE2b.
+    """
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
+def _needs_browser(html: str) -> bool:
+    """Heuristic: would a headless browser likely recover more content?
+
+    True for pages that look client-rendered or JS-gated; False for pages
+    that are simply short, empty or error pages, where launching Chromium
+    (~1-2s CPU, ~150MB RAM) would not help.
+    """
+    if _BROWSER_MARKERS.search(html):
+        return True
+    script_bytes = sum(len(m.group(1)) for m in _SCRIPT_BODY.finditer(html))
+    return script_bytes > len(html) * BROWSER_SCRIPT_RATIO
+
+
+def extract_policy_text_and_hash(html: str, url: str = "") -> Tuple[str, str]:
+    """extract_policy_text() plus compute_hash() of the result (CPU-bound).
+
+    For callers that store the text as a snapshot (the Wayback seeder), so
+    extraction and hashing run as one step, e.g. in a worker thread.
+    """
+    text = extract_policy_text(html, url)
+    return text, compute_hash(text)
+
+
+def _extract_and_discover(html: str, url: str) -> Tuple[str, str, List[str]]:
+    """Extract text, hash it, and collect related links (CPU-bound).
+
+    The page is parsed once: links are discovered first, from the untouched
+    tree, and extraction then strips that same tree in place.  Run via
+    ``asyncio.to_thread`` so parsing a large page does not stall other
+    policies' network I/O on the event loop.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    discovered = _discover_policy_links_from_soup(soup, url)
+    text = _extract_policy_text_from_soup(soup, url)
+    return text, compute_hash(text), discovered
+
+
 # ---------------------------------------------------------------------------
 # Strategy 1 — httpx with retries & exponential backoff
 # ---------------------------------------------------------------------------
 
-async def _scrape_httpx(url: str, request_timeout_secs: float = 30.0, max_retries: int = 3) -> Optional[str]:
-    """Attempt to fetch the page with httpx.  Returns HTML string or None."""
-    last_error = None
+async def _scrape_httpx(
+    url: str, request_timeout_secs: float = 30.0, max_retries: int = 3,
+    conditional_headers: Optional[Dict[str, str]] = None,
+) -> Optional[httpx.Response]:
+    """Attempt to fetch the page with httpx.
+
+    Returns the successful response (status 200, or 304 when
+    ``conditional_headers`` matched), or None if every attempt failed.
+    """
     request_timeout = httpx.Timeout(request_timeout_secs, connect=10.0)
+    client, owned = _get_client()
+    try:
+        return await _fetch_with_retries(
+            client, url, request_timeout, max_retries, conditional_headers,
+        )
+    finally:
+        if owned:
+            await client.aclose()
+
+
+async def _fetch_with_retries(
+    client: httpx.AsyncClient, url: str, request_timeout: httpx.Timeout, max_retries: int,
+    conditional_headers: Optional[Dict[str, str]] = None,
+) -> Optional[httpx.Response]:
+    """Retry loop with exponential backoff; rotates headers per attempt."""
+    last_error = None
     for attempt in range(1, max_retries + 1):
         headers = _random_headers()
+        if conditional_headers:
+            headers.update(conditional_headers)
         try:
             logger.info(
                 f"[httpx] attempt {attempt}/{max_retries} for {url} "
                 f"(UA: ...{headers['User-Agent'][-30:]})"
             )
-            async with httpx.AsyncClient(
-                headers=headers, follow_redirects=True, timeout=request_timeout,
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            response = await client.get(url, headers=headers, timeout=request_timeout)
+            if response.status_code == 304:
+                logger.info(f"[httpx] {url} not modified (304)")
+                return response
+            response.raise_for_status()
             logger.info(f"[httpx] success for {url} ({len(response.text)} bytes)")
-            return response.text
+            return response
         except Exception as e:
             last_error = e
             wait = (2 ** attempt) + random.uniform(0, 1)
@@ -443,10 +818,63 @@ async def _scrape_httpx(url: str, request_timeout_secs: float = 30.0, max_retrie
 # Strategy 2 — Playwright headless Chromium fallback
 # ---------------------------------------------------------------------------
 
+# One Chromium instance shared by every fallback scrape; each scrape gets its
+# own cheap browser context.  Like the httpx client, it lives on the app's
+# event loop — other loops (Wayback seeder) launch a private one.
+_playwright = None
+_browser = None
+_browser_lock: Optional[asyncio.Lock] = None
+
+
+async def _get_browser():
+    """Return ``(browser, private_driver)``, launching the shared browser on first use.
+
+    ``private_driver`` is None for the shared browser.  Off the app's event
+    loop the caller gets a private browser and must stop the returned
+    Playwright driver (which closes the browser) when done.
+    """
+    global _playwright, _browser, _browser_lock
+    from playwright.async_api import async_playwright
+
+    loop = asyncio.get_running_loop()
+    if _client_loop is not None and _client_loop is not loop:
+        pw = await async_playwright().start()
+        try:
+            return await pw.chromium.launch(headless=True), pw
+        except Exception:
+            await pw.stop()
+            raise
+
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            logger.info("[playwright] launching shared headless Chromium")
+            _browser = await _playwright.chromium.launch(headless=True)
+    return _browser, None
+
+
+async def close_playwright() -> None:
+    """Close the shared browser and Playwright driver, if started."""
+    global _playwright, _browser
+    try:
+        if _browser is not None:
+            await _browser.close()
+        if _playwright is not None:
+            await _playwright.stop()
+    except Exception as e:
+        logger.warning(f"[playwright] error during shutdown: {e}")
+    finally:
+        _browser = None
+        _playwright = None
+
+
 async def _scrape_playwright(url: str, timeout_ms: int = 30000) -> Optional[str]:
     """Fallback: fetch page with a real headless browser via Playwright."""
     try:
-        from playwright.async_api import async_playwright
+        import playwright.async_api  # noqa: F401
     except ImportError:
         logger.warning(
             "[playwright] playwright not installed — skipping browser fallback. "
@@ -454,19 +882,21 @@ async def _scrape_playwright(url: str, timeout_ms: int = 30000) -> Optional[str]
         )
         return None
 
-    logger.info(f"[playwright] launching headless Chromium for {url}")
+    logger.info(f"[playwright] rendering {url} in headless Chromium")
+    private_driver = None
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=random.choice(USER_AGENTS), locale="en-US",
-            )
+        browser, private_driver = await _get_browser()
+        context = await browser.new_context(
+            user_agent=random.choice(USER_AGENTS), locale="en-US",
+        )
+        try:
             page = await context.new_page()
             await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
             await _dismiss_cookie_banners(page)
             await page.wait_for_timeout(1000)
             html = await page.content()
-            await browser.close()
+        finally:
+            await context.close()
 
         logger.info(f"[playwright] success for {url} ({len(html)} bytes)")
         return html
@@ -475,33 +905,28 @@ async def _scrape_playwright(url: str, timeout_ms: int = 30000) -> Optional[str]
         logger.error(f"[playwright] failed for {url}: {e}")
         return None
 
+    finally:
+        if private_driver is not None:
+            await private_driver.stop()
+
 
 async def _dismiss_cookie_banners(page) -> None:
     """Try to click common cookie-consent accept buttons."""
-    for selector in COOKIE_BANNER_SELECTORS:
-        try:
-            btn = page.locator(selector).first
-            if await btn.is_visible(timeout=500):
-                await btn.click(timeout=2000)
-                logger.info(f"[playwright] dismissed cookie banner via selector: {selector}")
-                return
-        except Exception:
-            continue
-
-    for text in COOKIE_BUTTON_TEXTS:
+    try:
+        btn = page.locator(_COOKIE_SELECTOR_UNION).first
+        if await btn.is_visible(timeout=500):
+            await btn.click(timeout=2000)
+            logger.info("[playwright] dismissed cookie banner via selector")
+            return
+    except Exception:
+        pass
+
+    for role in ("button", "link"):
         try:
-            btn = page.get_by_role("button", name=text, exact=False).first
+            btn = page.get_by_role(role, name=_COOKIE_TEXT_RE).first
             if await btn.is_visible(timeout=500):
                 await btn.click(timeout=2000)
-                logger.info(f"[playwright] dismissed cookie banner via button text: {text!r}")
-                return
-        except Exception:
-            continue
-        try:
-            link = page.get_by_role("link", name=text, exact=False).first
-            if await link.is_visible(timeout=500):
-                await link.click(timeout=2000)
-                logger.info(f"[playwright] dismissed cookie banner via link text: {text!r}")
+                logger.info(f"[playwright] dismissed cookie banner via {role} text")
                 return
         except Exception:
             continue
@@ -519,44 +944,105 @@ async def scrape_policy(url: str, request_timeout_secs: float = 30.0) -> Tuple[s
 
     Strategy:
       1. Try httpx with 3 retries + exponential backoff.
-      2. If httpx succeeds but extracted text < 200 chars, try Playwright.
+      2. If httpx succeeds but extracted text < 200 chars, try Playwright
+         when the page looks JS-rendered (_needs_browser); otherwise fail.
       3. If httpx fails entirely, try Playwright.
       4. If both fail, raise ValueError.
     """
+    text, content_hash, discovered, _ = await _scrape(url, request_timeout_secs)
+    return text, content_hash, discovered
+
+
+async def scrape_policy_if_modified(
+    url: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+    raw_hash: Optional[str] = None, request_timeout_secs: float = 30.0,
+) -> Optional[Tuple[str, str, List[str], Dict[str, Optional[str]]]]:
+    """Conditional variant of scrape_policy() for scheduled re-checks.
+
+    Sends ``etag`` / ``last_modified`` from the previous capture as
+    If-None-Match / If-Modified-Since.  Returns None when the page is known
+    to be unchanged without parsing it: either the server answers 304 Not
+    Modified, or the fetched HTML hashes to the previous ``raw_hash``.
+    Otherwise returns (extracted_text, content_hash, discovered_links,
+    validators), where validators holds the new ``etag`` / ``last_modified``
+    / ``raw_hash`` to store (all None when the content came from the
+    Playwright fallback).
+    """
+    conditional = {}
+    if etag:
+        conditional["If-None-Match"] = etag
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+    return await _scrape(url, request_timeout_secs, conditional, raw_hash)
+
+
+_NO_VALIDATORS: Dict[str, Optional[str]] = {"etag": None, "last_modified": None, "raw_hash": None}
+
+
+async def _scrape(
+    url: str, request_timeout_secs: float,
+    conditional_headers: Optional[Dict[str, str]] = None,
+    previous_raw_hash: Optional[str] = None,
+) -> Optional[Tuple[str, str, List[str], Dict[str, Optional[str]]]]:
+    """Shared implementation of scrape_policy() / scrape_policy_if_modified()."""
     logger.info(f"Scraping policy URL: {url}")
 
     # --- Strategy 1: httpx ---
-    html = await _scrape_httpx(url, request_timeout_secs=request_timeout_secs)
+    async with _get_host_semaphore(url):
+        response = await _scrape_httpx(
+            url, request_timeout_secs=request_timeout_secs,
+            conditional_headers=conditional_headers,
+        )
 
-    if html:
-        text = extract_policy_text(html, url)
-        discovered = _discover_policy_links(html, url)
+    if response is not None and response.status_code == 304:
+        return None
+
+    if response is not None:
+        raw_hash = hashlib.sha256(response.content).hexdigest()
+        if raw_hash == previous_raw_hash:
+            logger.info(f"[httpx] {url} HTML unchanged (raw hash {raw_hash[:12]}...)")
+            return None
+
+        html = response.text
+        text, content_hash, discovered = await asyncio.to_thread(_extract_and_discover, html, url)
         if len(text) >= MIN_CONTENT_LENGTH:
-            content_hash = compute_hash(text)
             logger.info(
                 f"[httpx] extracted {len(text)} chars from {url} "
                 f"(hash: {content_hash[:12]}..., {len(discovered)} related links)"
             )
-            return text, content_hash, discovered
+            validators = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "raw_hash": raw_hash,
+            }
+            return text, content_hash, discovered, validators
+        elif _needs_browser(html):
+            logger.warning(
+                f"[httpx] extracted only {len(text)} chars (< {MIN_CONTENT_LENGTH}) "
+                f"from {url} — page looks JS-rendered, trying Playwright fallback"
+            )
         else:
             logger.warning(
                 f"[httpx] extracted only {len(text)} chars (< {MIN_CONTENT_LENGTH}) "
-                f"from {url} — trying Playwright fallback"
+                f"from {url} — no JS-rendering markers, skipping Playwright fallback"
+            )
+            raise ValueError(
+                f"Failed to scrape {url}: page has only {len(text)} chars of text "
+                f"(< {MIN_CONTENT_LENGTH}) and does not look JavaScript-rendered."
             )
 
     # --- Strategy 2: Playwright fallback ---
-    html = await _scrape_playwright(url)
+    async with _get_browser_semaphore():
+        html = await _scrape_playwright(url)
 
     if html:
-        text = extract_policy_text(html, url)
-        discovered = _discover_policy_links(html, url)
+        text, content_hash, discovered = await asyncio.to_thread(_extract_and_discover, html, url)
         if len(text) >= MIN_CONTENT_LENGTH:
-            content_hash = compute_hash(text)
             logger.info(
                 f"[playwright] extracted {len(text)} chars from {url} "
                 f"(hash: {content_hash[:12]}..., {len(discovered)} related links)"
             )
-            return text, content_hash, discovered
+            return text, content_hash, discovered, _NO_VALIDATORS
         else:
             logger.error(
                 f"[playwright] extracted only {len(text)} chars from {url} "
@@ -10,21 +10,29 @@ user always has the most up-to-date snapshot regardless of Wayback coverage.
 """
 
 import asyncio
+import functools
 import json
 import logging
-from typing import List, Optional, Tuple
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import httpx
+from sqlalchemy import exists, func, insert, select
 from sqlalchemy.orm import Session
 
 from app.database import get_scoped_session
 from app.models import Policy, Snapshot, Diff
-from app.services.scraper import extract_policy_text, scrape_policy, compute_hash
+from app.services.scraper import extract_policy_text_and_hash, scrape_policy_if_modified
 from app.services.differ import compute_full_diff
-from app.services.analyzer import analyze_diff
+from app.services.analyzer import analyze_diffs_batch
 from app.services.notifier import send_alert
-from app.utils.datetime_helpers import utcnow
+from app.services import wayback_cache
+from app.utils import json_helpers
+from app.utils.datetime_helpers import ensure_utc, utcnow
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +43,74 @@ WAYBACK_BASE = "https://web.archive.org/web"
 # after text extraction, so a small number is sufficient)
 MAX_SNAPSHOTS = 3
 
-# CDX query retry attempts
+# CDX query retry attempts, with full-jitter exponential backoff capped at
+# CDX_BACKOFF_CAP_SECS between them
 CDX_MAX_RETRIES = 2
+CDX_BACKOFF_CAP_SECS = 30
+
+# Archived page fetch attempts; a retry only follows a 429, after waiting
+# for the server's Retry-After (at most RETRY_AFTER_CAP_SECS)
+PAGE_MAX_ATTEMPTS = 2
+RETRY_AFTER_CAP_SECS = 60
+
+# Archived pages fetched in parallel (replaces a fixed sleep between
+# sequential fetches as the politeness limit)
+MAX_CONCURRENT_FETCHES = 3
+
+# Captures that can never be a policy page: documents and static assets,
+# plus robots.txt (matched against the capture's original URL)
+_NON_POLICY_RE = re.compile(
+    r"\.(?:pdf|jpe?g|png|gif|svg|webp|ico|css|js|json|xml|txt|zip|woff2?)(?:[?#]|$)"
+    r"|/robots\.txt(?:[?#]|$)",
+    re.IGNORECASE,
+)
+
+# CDX answers are reused for this long, so re-seeding a policy (or seeding
+# several URLs that share variants) does not repeat identical CDX queries
+CDX_CACHE_TTL_SECS = 3600
+CDX_CACHE_MAX_ENTRIES = 1024
+
+# (variant, limit) -> (monotonic expiry time, results).  Plain values, not
+# futures: each seed runs its own event loop in a BackgroundTasks thread.
+_cdx_cache: Dict[Tuple[str, int], Tuple[float, List["CdxRow"]]] = {}
+
+try:
+    import h2  # noqa: F401 — enables httpx's HTTP/2 support
+    _WAYBACK_HTTP2 = True
+except ImportError:  # optional — fall back to HTTP/1.1 keep-alive
+    _WAYBACK_HTTP2 = False
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Client shared by every request of one seed run.
+
+    CDX queries and archived pages all live on web.archive.org, so one
+    pooled (HTTP/2 when available) connection serves the whole run instead
+    of a TCP + TLS handshake per request.
+    """
+    return httpx.AsyncClient(
+        http2=_WAYBACK_HTTP2,
+        follow_redirects=True,
+        timeout=30.0,
+        headers={
+            "User-Agent": "PolicyDiff/1.0 (privacy-policy-monitor)",
+            "Accept-Encoding": "gzip, deflate",
+        },
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+    )
+
+
+class CdxRow(NamedTuple):
+    """One CDX capture, in the column order requested via ``fl``."""
 
+    timestamp: str
+    original: str
+    statuscode: str
+    digest: str
 
-def _url_variants(url: str) -> List[str]:
+
+@functools.lru_cache(maxsize=1024)
+def _url_variants(url: str) -> Tuple[str, ...]:
     """Generate URL variants for CDX lookup.
 
     The Wayback Machine indexes URLs in specific canonical forms.  A URL with
@@ -66,11 +137,33 @@ def _url_variants(url: str) -> List[str]:
         wildcard = url.rstrip("/") + "*"
         variants.append(wildcard)
 
-    return variants
+    return tuple(variants)
+
+
+def _cached_cdx(url: str, limit: int) -> Optional[List[CdxRow]]:
+    """Unexpired cached CDX results for ``(url, limit)``, or None."""
+    cached = _cdx_cache.get((url, limit))
+    if cached is None or cached[0] < time.monotonic():
+        return None
+    return cached[1]
+
+
+def _cache_cdx(url: str, limit: int, results: List[CdxRow]) -> None:
+    """Remember CDX results for CDX_CACHE_TTL_SECS, evicting the oldest entry when full."""
+    if len(_cdx_cache) >= CDX_CACHE_MAX_ENTRIES:
+        _cdx_cache.pop(next(iter(_cdx_cache)), None)
+    _cdx_cache[(url, limit)] = (time.monotonic() + CDX_CACHE_TTL_SECS, results)
+
+
+async def _query_cdx_single(client: httpx.AsyncClient, url: str, limit: int) -> List[CdxRow]:
+    """Single CDX API call for one URL variant.  Returns parsed results.
 
+    Answers are cached in memory for CDX_CACHE_TTL_SECS.
+    """
+    cached = _cached_cdx(url, limit)
+    if cached is not None:
+        return cached
 
-async def _query_cdx_single(url: str, limit: int) -> List[dict]:
-    """Single CDX API call for one URL variant.  Returns parsed results."""
     params = {
         "url": url,
         "output": "json",
@@ -81,66 +174,114 @@ async def _query_cdx_single(url: str, limit: int) -> List[dict]:
         "sort": "reverse",          # newest first
     }
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.get(CDX_API, params=params)
-        resp.raise_for_status()
-
-    rows = resp.json()
-    if not rows or len(rows) < 2:
-        return []
-
-    header = rows[0]
-    return [dict(zip(header, row)) for row in rows[1:]]
+    resp = await client.get(CDX_API, params=params, timeout=20.0)
+    resp.raise_for_status()
+
+    rows = json_helpers.loads(resp.content)
+    # rows[0] is the header; its columns match CdxRow (the ``fl`` order).
+    # Static assets (which wildcard variants match) are dropped before the
+    # caller truncates to ``limit``, so they never take a snapshot slot --
+    # unless the tracked URL itself looks like one (e.g. a terms.txt).
+    keep_all = bool(_NON_POLICY_RE.search(url.rstrip("*")))
+    results = [
+        CdxRow(*row) for row in rows[1:]
+        if keep_all or not _NON_POLICY_RE.search(row[1])
+    ] if rows and len(rows) >= 2 else []
+    _cache_cdx(url, limit, results)
+    return results
+
+
+async def _query_cdx_variant(client: httpx.AsyncClient, variant: str, limit: int) -> List[CdxRow]:
+    """CDX results for one URL variant, retried up to CDX_MAX_RETRIES times."""
+    for attempt in range(1, CDX_MAX_RETRIES + 1):
+        try:
+            results = await _query_cdx_single(client, variant, limit)
+            if results:
+                logger.info(
+                    f"[wayback] CDX returned {len(results)} unique snapshots "
+                    f"for {variant} (attempt {attempt})"
+                )
+            return results
+        except Exception as e:
+            logger.warning(
+                f"[wayback] CDX query attempt {attempt}/{CDX_MAX_RETRIES} "
+                f"failed for {variant}: {type(e).__name__}: {e}"
+            )
+            if attempt < CDX_MAX_RETRIES:
+                retry_after = None
+                if isinstance(e, httpx.HTTPStatusError):
+                    retry_after = _retry_after_secs(e.response)
+                if retry_after is None:
+                    retry_after = random.uniform(0, min(CDX_BACKOFF_CAP_SECS, 2 ** attempt))
+                await asyncio.sleep(retry_after)
+    return []
 
 
-async def _query_cdx(url: str, limit: int = MAX_SNAPSHOTS) -> List[dict]:
+async def _query_cdx(client: httpx.AsyncClient, url: str, limit: int = MAX_SNAPSHOTS) -> List[CdxRow]:
     """Query the Wayback Machine CDX API with retries and URL variants.
 
-    Tries the original URL first.  If no results, tries canonical variants
-    (without query params, without trailing slash).  Each variant is retried
-    up to CDX_MAX_RETRIES times on transient errors.
+    The original URL is preferred; if it has no results, canonical variants
+    (without query params, without trailing slash) are used, in that order.
+    All variants are queried concurrently, so a miss on the original URL
+    costs no extra round-trips.  Each variant is retried up to
+    CDX_MAX_RETRIES times on transient errors.
     """
-    for variant in _url_variants(url):
-        for attempt in range(1, CDX_MAX_RETRIES + 1):
-            try:
-                results = await _query_cdx_single(variant, limit)
-                if results:
-                    logger.info(
-                        f"[wayback] CDX returned {len(results)} unique snapshots "
-                        f"for {variant} (attempt {attempt})"
-                    )
-                    return results[:limit]
-                break  # no results but no error — try next variant
-            except Exception as e:
-                logger.warning(
-                    f"[wayback] CDX query attempt {attempt}/{CDX_MAX_RETRIES} "
-                    f"failed for {variant}: {type(e).__name__}: {e}"
-                )
-                if attempt < CDX_MAX_RETRIES:
-                    await asyncio.sleep(2 * attempt)
+    tasks = [
+        asyncio.create_task(_query_cdx_variant(client, variant, limit))
+        for variant in _url_variants(url)
+    ]
+    try:
+        # Await in preference order: the first non-empty variant wins and
+        # the lower-priority queries still running are cancelled.
+        for task in tasks:
+            results = await task
+            if results:
+                return results[:limit]
+    finally:
+        for task in tasks:
+            task.cancel()
 
     logger.info(f"[wayback] no CDX results for any URL variant of {url}")
     return []
 
 
-async def _fetch_wayback_page(timestamp: str, original_url: str) -> Optional[str]:
+async def _fetch_wayback_page(client: httpx.AsyncClient, timestamp: str, original_url: str) -> Optional[str]:
     """Fetch an archived page from the Wayback Machine and return raw HTML."""
     wayback_url = f"{WAYBACK_BASE}/{timestamp}id_/{original_url}"
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=30.0,
-            headers={
-                "User-Agent": "PolicyDiff/1.0 (privacy-policy-monitor)",
-                "Accept-Encoding": "gzip, deflate",
-            },
-        ) as client:
+        for attempt in range(1, PAGE_MAX_ATTEMPTS + 1):
             resp = await client.get(wayback_url)
+            if resp.status_code == 429 and attempt < PAGE_MAX_ATTEMPTS:
+                wait = _retry_after_secs(resp)
+                if wait is None:
+                    wait = random.uniform(0, 2 ** attempt)
+                logger.info(f"[wayback] rate limited on {wayback_url}, retrying in {wait:.1f}s")
+                await asyncio.sleep(wait)
+                continue
             resp.raise_for_status()
-        return resp.text
+            return resp.text
     except Exception as e:
         logger.warning(f"[wayback] failed to fetch {wayback_url}: {e}")
+    return None
+
+
+def _retry_after_secs(resp: httpx.Response) -> Optional[float]:
+    """Seconds requested by a 429/503 ``Retry-After`` header, capped; None if absent."""
+    if resp.status_code not in (429, 503):
         return None
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        secs = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        # "-0000" dates parse as naive; HTTP-dates are always GMT
+        secs = (ensure_utc(when) - utcnow()).total_seconds()
+    return min(max(secs, 0.0), RETRY_AFTER_CAP_SECS)
 
 
 def _timestamp_to_datetime(ts: str):
@@ -150,46 +291,80 @@ def _timestamp_to_datetime(ts: str):
     return naive.replace(tzinfo=datetime.timezone.utc)
 
 
-async def _fetch_live_snapshot(
-    db: Session, policy: Policy, policy_id: int, existing_hashes: set,
-) -> Optional[Snapshot]:
-    """Fetch the current live page and store it as a snapshot.
+async def _scrape_live(url: str) -> Optional[Tuple[str, str, List[str], Dict[str, Optional[str]]]]:
+    """Fetch the current live page: ``(text, content_hash, links, validators)`` or None.
 
     This ensures the user always has the most up-to-date version of the policy,
     regardless of what the Wayback Machine has archived.  Uses the same scraper
-    pipeline as "Check Now".
+    pipeline as "Check Now"; the validators (ETag / Last-Modified / raw hash)
+    are stored so a later re-seed can be answered with a single HEAD request.
     """
     try:
-        text, content_hash, discovered_links = await scrape_policy(policy.url)
+        return await scrape_policy_if_modified(url)
+    except Exception as e:
+        logger.warning(f"[wayback] live fetch failed for {url}: {e}")
+        return None
 
-        if content_hash in existing_hashes:
-            logger.info(
-                f"[wayback] live page is identical to an existing snapshot "
-                f"(hash {content_hash[:12]}), skipping"
-            )
-            return None
 
-        links_json = json.dumps(discovered_links) if discovered_links else None
-        snapshot = Snapshot(
-            policy_id=policy_id,
-            content_text=text,
-            content_hash=content_hash,
-            content_length=len(text),
-            discovered_links=links_json,
-            captured_at=utcnow(),
-            is_seed=False,  # This is a live fetch, not a Wayback seed
-        )
-        db.add(snapshot)
-        db.flush()
-        existing_hashes.add(content_hash)
+def _live_snapshot_row(
+    policy_id: int, scraped: Optional[Tuple[str, str, List[str], Dict[str, Optional[str]]]],
+    existing_hashes: set,
+) -> Optional[dict]:
+    """Snapshot row for the live page, or None if it failed or is a duplicate."""
+    if scraped is None:
+        return None
+    text, content_hash, discovered_links, validators = scraped
+
+    if content_hash in existing_hashes:
         logger.info(
-            f"[wayback] live snapshot captured ({len(text)} chars, "
-            f"hash {content_hash[:12]})"
+            f"[wayback] live page is identical to an existing snapshot "
+            f"(hash {content_hash[:12]}), skipping"
         )
-        return snapshot
-    except Exception as e:
-        logger.warning(f"[wayback] live fetch failed for {policy.url}: {e}")
         return None
+    existing_hashes.add(content_hash)
+    logger.info(
+        f"[wayback] live snapshot captured ({len(text)} chars, "
+        f"hash {content_hash[:12]})"
+    )
+    return {
+        "policy_id": policy_id,
+        "content_text": text,
+        "content_hash": content_hash,
+        "content_length": len(text),
+        "discovered_links": json.dumps(discovered_links) if discovered_links else None,
+        "captured_at": utcnow(),
+        "is_seed": False,  # This is a live fetch, not a Wayback seed
+        **validators,
+    }
+
+
+async def _live_page_unchanged(client: httpx.AsyncClient, db: Session, policy: Policy) -> bool:
+    """True if a HEAD request shows the live page matches the latest snapshot.
+
+    Compares the ETag (or, failing that, Last-Modified) header against the
+    validators stored with the most recent snapshot.  Any doubt — no stored
+    validators, a failed request, a server that omits the headers — returns
+    False so the full seed runs.
+    """
+    latest = (
+        db.query(Snapshot.etag, Snapshot.last_modified)
+        .filter(Snapshot.policy_id == policy.id)
+        .order_by(Snapshot.captured_at.desc())
+        .first()
+    )
+    if latest is None or not (latest.etag or latest.last_modified):
+        return False
+    try:
+        resp = await client.head(policy.url, timeout=10.0)
+        resp.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.info(f"[wayback] HEAD {policy.url} failed ({e}), running full seed")
+        return False
+    etag = resp.headers.get("etag")
+    if latest.etag and etag:
+        return etag == latest.etag
+    last_modified = resp.headers.get("last-modified")
+    return bool(latest.last_modified and last_modified == latest.last_modified)
 
 
 async def seed_from_wayback(policy_id: int) -> dict:
@@ -203,6 +378,12 @@ async def seed_from_wayback(policy_id: int) -> dict:
 
     Returns a status dict.
     """
+    async with _new_client() as client:
+        return await _seed_policy(client, policy_id)
+
+
+async def _seed_policy(client: httpx.AsyncClient, policy_id: int) -> dict:
+    """seed_from_wayback() body; every Wayback request goes through ``client``."""
     with get_scoped_session() as db:
         try:
             policy = db.query(Policy).filter(Policy.id == policy_id).first()
@@ -210,6 +391,16 @@ async def seed_from_wayback(policy_id: int) -> dict:
                 logger.error(f"[wayback] policy {policy_id} not found")
                 return {"status": "error", "message": "Policy not found"}
 
+            # Re-seed of an already-seeded policy: skip CDX, Wayback fetches
+            # and diffs entirely when the live page has not changed.
+            if policy.seed_status == "seeded" and await _live_page_unchanged(client, db, policy):
+                logger.info(f"[wayback] {policy.url} unchanged since last seed, skipping")
+                return {
+                    "status": "unchanged",
+                    "message": "Policy content is already up to date",
+                    "snapshots_added": 0,
+                }
+
             # Mark as seeding
             policy.seed_status = "seeding"
             db.commit()
@@ -225,31 +416,29 @@ async def seed_from_wayback(policy_id: int) -> dict:
                 .all()
             }
 
-            # Step 1: Query CDX for historical snapshots
-            cdx_results = await _query_cdx(policy_url)
-            new_snapshots: List[Snapshot] = []
+            # Step 1: Network only — archived captures (CDX + pages) and the
+            # CURRENT live page are fetched concurrently, and nothing is
+            # written until both are in, so no write transaction is held open
+            # while waiting on remote servers (SQLite has a single writer).
+            # The live page is always fetched so the user gets the latest
+            # version regardless of Wayback Machine coverage.
+            captures, live = await asyncio.gather(
+                _fetch_history(client, db, policy_url, policy_id),
+                _scrape_live(policy_url),
+            )
 
-            if cdx_results:
-                new_snapshots = await _fetch_and_store_snapshots(
-                    db, policy, policy_id, cdx_results, existing_hashes
-                )
-                db.commit()
-                logger.info(
-                    f"[wayback] historical phase: {len(new_snapshots)} snapshots "
-                    f"from {len(cdx_results)} CDX results"
-                )
-            else:
-                logger.info(f"[wayback] no Wayback snapshots found for {policy_url}")
-
-            # Step 2: Always fetch the CURRENT live page
-            # This is the key fix — the user gets the latest version regardless
-            # of Wayback Machine coverage
-            live_snap = await _fetch_live_snapshot(
-                db, policy, policy_id, existing_hashes
+            # Step 2: Store every new snapshot (historical, then live) in one
+            # transaction
+            rows = _historical_snapshot_rows(db, policy_url, policy_id, captures, existing_hashes)
+            logger.info(
+                f"[wayback] historical phase: {len(rows)} snapshots "
+                f"from {len(captures)} archived captures"
             )
-            if live_snap:
-                new_snapshots.append(live_snap)
-            db.commit()
+            live_row = _live_snapshot_row(policy_id, live, existing_hashes)
+            if live_row:
+                rows.append(live_row)
+            new_snapshots = _insert_snapshots(db, rows)
+            live_snap = new_snapshots[-1] if live_row else None
 
             if not new_snapshots:
                 # No Wayback snapshots AND live fetch returned a duplicate
@@ -260,9 +449,10 @@ async def seed_from_wayback(policy_id: int) -> dict:
                     "message": "Policy content is already up to date",
                     "snapshots_added": 0,
                 }
+            db.commit()
 
             # Step 3: Compute diffs between consecutive snapshots
-            diffs_created = await _compute_seeded_diffs(db, policy, policy_id)
+            diffs_created, latest_diff = await _compute_seeded_diffs(db, policy, policy_id)
 
             policy.seed_status = "seeded"
             db.commit()
@@ -273,7 +463,9 @@ async def seed_from_wayback(policy_id: int) -> dict:
             )
 
             # Notify followers about seeding results
-            await _notify_seed_results(db, policy, policy_id, new_snapshots, diffs_created)
+            await _notify_seed_results(
+                db, policy, policy_id, new_snapshots, diffs_created, latest_diff,
+            )
 
             return {
                 "status": "seeded",
@@ -300,143 +492,286 @@ async def seed_from_wayback(policy_id: int) -> dict:
             return {"status": "error", "message": str(e)}
 
 
-async def _fetch_and_store_snapshots(
-    db: Session, policy: Policy, policy_id: int,
-    cdx_results: List[dict], existing_hashes: set,
-) -> List[Snapshot]:
-    """Fetch Wayback pages and store new snapshots. Returns list of new snapshots."""
-    new_snapshots: List[Snapshot] = []
+async def _fetch_and_extract(
+    client: httpx.AsyncClient, cdx_results: List[CdxRow], default_url: str,
+) -> List[Optional[Tuple[str, str]]]:
+    """Fetch every archived page concurrently and extract its text.
 
-    for entry in cdx_results:
-        ts = entry["timestamp"]
-        original = entry.get("original", policy.url)
+    Returns ``(text, content_hash)`` (or None if the fetch failed) per
+    entry.  At most MAX_CONCURRENT_FETCHES requests are in flight at once,
+    to stay polite to the Wayback Machine.  Each page is parsed in a worker
+    thread as soon as it arrives, so parsing overlaps the other fetches
+    instead of blocking the event loop after all of them.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
 
-        html = await _fetch_wayback_page(ts, original)
+    async def _fetch(entry: CdxRow) -> Optional[Tuple[str, str]]:
+        original = entry.original or default_url
+        async with semaphore:
+            html = await _fetch_wayback_page(client, entry.timestamp, original)
         if not html:
-            continue
+            return None
+        return await asyncio.to_thread(extract_policy_text_and_hash, html, original)
+
+    return await asyncio.gather(*(_fetch(entry) for entry in cdx_results))
+
+
+async def _fetch_history(
+    client: httpx.AsyncClient, db: Session, policy_url: str, policy_id: int,
+) -> List[Tuple[CdxRow, str, str, bool]]:
+    """Query CDX and fetch + extract the archived captures (no DB writes).
+
+    Returns ``(entry, text, content_hash, cached)`` per usable capture, in
+    CDX order.  Captures already stored for this policy, or repeated within
+    this batch (URL variants can reintroduce them), are skipped by CDX
+    digest.  Those in the wayback cache are neither fetched nor re-extracted.
+    """
+    cdx_results = await _query_cdx(client, policy_url)
+    if not cdx_results:
+        logger.info(f"[wayback] no Wayback snapshots found for {policy_url}")
+        return []
+
+    seen_digests = {
+        digest for (digest,) in db.query(Snapshot.wayback_digest).filter(
+            Snapshot.policy_id == policy_id, Snapshot.wayback_digest.isnot(None),
+        )
+    }
+    unique = []
+    for entry in cdx_results:
+        if entry.digest:
+            if entry.digest in seen_digests:
+                logger.info(f"[wayback] capture {entry.timestamp} already seeded (digest {entry.digest}), skipping")
+                continue
+            seen_digests.add(entry.digest)
+        unique.append(entry)
+    cdx_results = unique
+
+    extracted = {}
+    for i, entry in enumerate(cdx_results):
+        if entry.digest:
+            hit = wayback_cache.get(db, entry.digest, entry.original or policy_url)
+            if hit is not None:
+                extracted[i] = (*hit, True)
+    misses = [i for i in range(len(cdx_results)) if i not in extracted]
+    fetched = await _fetch_and_extract(client, [cdx_results[i] for i in misses], policy_url)
+    for i, result in zip(misses, fetched):
+        if result is not None:
+            extracted[i] = (*result, False)
+
+    return [
+        (entry, *extracted[i])
+        for i, entry in enumerate(cdx_results)
+        if i in extracted
+    ]
+
+
+def _historical_snapshot_rows(
+    db: Session, policy_url: str, policy_id: int,
+    captures: List[Tuple[CdxRow, str, str, bool]], existing_hashes: set,
+) -> List[dict]:
+    """Snapshot rows for new archived captures; caches freshly extracted text."""
+    rows = []
+    for entry, text, content_hash, cached in captures:
+        ts = entry.timestamp
+        if not cached and entry.digest:
+            wayback_cache.put(db, entry.digest, entry.original or policy_url, text, content_hash)
 
-        text = extract_policy_text(html, original)
         if len(text) < 100:
             logger.warning(f"[wayback] snapshot {ts} too short ({len(text)} chars), skipping")
             continue
 
-        content_hash = compute_hash(text)
-
         if content_hash in existing_hashes:
             logger.info(f"[wayback] snapshot {ts} is a duplicate (hash {content_hash[:12]}), skipping")
             continue
         existing_hashes.add(content_hash)
 
-        captured_at = _timestamp_to_datetime(ts)
-
-        snapshot = Snapshot(
-            policy_id=policy_id,
-            content_text=text,
-            content_hash=content_hash,
-            content_length=len(text),
-            captured_at=captured_at,
-            is_seed=True,
-        )
-        db.add(snapshot)
-        db.flush()
-        new_snapshots.append(snapshot)
+        rows.append({
+            "policy_id": policy_id,
+            "content_text": text,
+            "content_hash": content_hash,
+            "content_length": len(text),
+            "captured_at": _timestamp_to_datetime(ts),
+            "is_seed": True,
+            "wayback_digest": entry.digest or None,
+        })
         logger.info(
             f"[wayback] seeded snapshot {ts} ({len(text)} chars, "
             f"hash {content_hash[:12]})"
         )
+    return rows
+
+
+def _insert_snapshots(db: Session, rows: List[dict]) -> List[Snapshot]:
+    """One executemany INSERT ... RETURNING for every new snapshot."""
+    if not rows:
+        return []
+    return list(db.scalars(
+        insert(Snapshot).returning(Snapshot, sort_by_parameter_order=True), rows,
+    ))
+
 
-        # Be polite to the Wayback Machine
-        await asyncio.sleep(1.5)
+COSMETIC_CHANGE_ANALYSIS = {
+    "summary": "Minor textual change (cosmetic); no clauses were added, removed or modified.",
+    "severity": "informational",
+    "severity_score": 0.0,
+    "key_changes": "[]",
+    "recommendation": "No review needed.",
+}
 
-    return new_snapshots
 
+def _is_cosmetic(diff_data: dict) -> bool:
+    """True if a diff changed no clause wording (nothing for the LLM to explain).
 
-async def _compute_seeded_diffs(db: Session, policy: Policy, policy_id: int) -> int:
-    """Compute diffs between consecutive snapshots. Returns count of diffs created."""
-    all_snapshots = (
-        db.query(Snapshot)
-        .filter(Snapshot.policy_id == policy_id)
-        .order_by(Snapshot.captured_at.asc())
-        .all()
+    That is: no clause was added or removed, and every modified clause only
+    differs in whitespace.  Digits are deliberately significant, since a
+    retention period going from 30 to 90 days is exactly what users want
+    analysed; the same goes for small diffs relative to the page size.
+    """
+    counts = diff_data["change_summary"]
+    if counts["added_count"] or counts["removed_count"]:
+        return False
+    if not counts["modified_count"]:
+        return True
+    return all(
+        clause.get("whitespace_only", False)
+        for clause in json.loads(diff_data["clauses_modified"])
     )
 
-    diffs_created = 0
-    if len(all_snapshots) < 2:
-        return 0
 
-    for i in range(len(all_snapshots) - 1):
-        old_snap = all_snapshots[i]
-        new_snap = all_snapshots[i + 1]
+def _pending_seed_pairs(policy_id: int):
+    """Consecutive snapshot pairs (by captured_at) that still need a diff.
 
-        # Skip if diff already exists
-        exists = (
-            db.query(Diff)
-            .filter(
-                Diff.old_snapshot_id == old_snap.id,
-                Diff.new_snapshot_id == new_snap.id,
-            )
-            .first()
+    LAG() pairs each snapshot with its predecessor inside the database, and
+    pairs with identical content or an existing Diff are filtered out there
+    too, so only the texts that will actually be diffed are loaded.
+    """
+    window = {"order_by": (Snapshot.captured_at, Snapshot.id)}
+    ordered = (
+        select(
+            Snapshot.id,
+            Snapshot.content_hash,
+            Snapshot.content_text,
+            Snapshot.captured_at,
+            func.lag(Snapshot.id).over(**window).label("prev_id"),
+            func.lag(Snapshot.content_hash).over(**window).label("prev_hash"),
+            func.lag(Snapshot.content_text).over(**window).label("prev_text"),
         )
-        if exists:
-            continue
-
-        # Skip if content is identical
-        if old_snap.content_hash == new_snap.content_hash:
-            continue
+        .where(Snapshot.policy_id == policy_id)
+        .subquery()
+    )
+    already_diffed = exists().where(
+        Diff.old_snapshot_id == ordered.c.prev_id,
+        Diff.new_snapshot_id == ordered.c.id,
+    )
+    return (
+        select(
+            ordered.c.prev_id, ordered.c.id, ordered.c.prev_text,
+            ordered.c.content_text, ordered.c.captured_at,
+        )
+        .where(
+            ordered.c.prev_id.isnot(None),
+            ordered.c.prev_hash != ordered.c.content_hash,
+            ~already_diffed,
+        )
+        .order_by(ordered.c.captured_at, ordered.c.id)
+    )
 
-        try:
-            diff_data = compute_full_diff(old_snap.content_text, new_snap.content_text)
 
-            analysis = await analyze_diff(
-                policy_name=policy.name,
-                company=policy.company,
-                policy_type=policy.policy_type,
-                diff_text=diff_data["diff_text"],
-                clauses_added=diff_data["clauses_added"],
-                clauses_removed=diff_data["clauses_removed"],
-                clauses_modified=diff_data["clauses_modified"],
-            )
+async def _compute_seeded_diffs(
+    db: Session, policy: Policy, policy_id: int,
+) -> Tuple[int, Optional[Diff]]:
+    """Compute diffs between consecutive snapshots.
 
-            diff_record = Diff(
-                policy_id=policy_id,
-                old_snapshot_id=old_snap.id,
-                new_snapshot_id=new_snap.id,
-                diff_html=diff_data["diff_html"],
-                diff_text=diff_data["diff_text"],
-                clauses_added=diff_data["clauses_added"],
-                clauses_removed=diff_data["clauses_removed"],
-                clauses_modified=diff_data["clauses_modified"],
-                summary=analysis.get("summary"),
-                severity=analysis.get("severity", "informational"),
-                severity_score=analysis.get("severity_score", 0.0),
-                key_changes=analysis.get("key_changes"),
-                recommendation=analysis.get("recommendation"),
-                created_at=new_snap.captured_at,  # date it to when the change happened
-            )
-            db.add(diff_record)
-            diffs_created += 1
-            logger.info(
-                f"[wayback] diff between snapshot {old_snap.id} -> {new_snap.id}: "
-                f"severity={analysis.get('severity')}"
-            )
-        except Exception as e:
-            logger.warning(f"[wayback] failed to compute diff {old_snap.id}->{new_snap.id}: {e}")
+    Returns the count of diffs created and the newest of them (None if none).
+    """
+    pairs = db.execute(_pending_seed_pairs(policy_id)).all()
+    if not pairs:
+        return 0, None
+
+    # The pairs are independent: diff them all in worker threads at once,
+    # then analyse them together (analyze_diffs_batch shares LLM requests
+    # and respects the analyzer's concurrency limit).
+    diff_results = await asyncio.gather(*(
+        asyncio.to_thread(compute_full_diff, pair.prev_text, pair.content_text)
+        for pair in pairs
+    ), return_exceptions=True)
+
+    diffed = []
+    for pair, diff_data in zip(pairs, diff_results):
+        if isinstance(diff_data, Exception):
+            logger.warning(f"[wayback] failed to compute diff {pair.prev_id}->{pair.id}: {diff_data}")
+            continue
+        diffed.append((pair, diff_data))
+    if not diffed:
+        return 0, None
+
+    # Archived histories are full of formatting-only edits (whitespace,
+    # markup): no clause wording changed, so there is nothing for the LLM
+    # to explain.  Only the rest are analysed.
+    analyses: List[dict] = [COSMETIC_CHANGE_ANALYSIS] * len(diffed)
+    substantive = [i for i, (_, diff_data) in enumerate(diffed) if not _is_cosmetic(diff_data)]
+    if len(substantive) < len(diffed):
+        logger.info(f"[wayback] {len(diffed) - len(substantive)} seeded diffs are cosmetic, skipping analysis")
+    try:
+        results = await analyze_diffs_batch([
+            {
+                "policy_name": policy.name,
+                "company": policy.company,
+                "policy_type": policy.policy_type,
+                "diff_text": diffed[i][1]["diff_excerpt"],
+                "clauses_added": diffed[i][1]["clauses_added"],
+                "clauses_removed": diffed[i][1]["clauses_removed"],
+                "clauses_modified": diffed[i][1]["clauses_modified"],
+            }
+            for i in substantive
+        ])
+    except Exception as e:
+        logger.warning(f"[wayback] failed to analyze {len(substantive)} seeded diffs: {e}")
+        return 0, None
+    for i, analysis in zip(substantive, results):
+        analyses[i] = analysis
+
+    rows = []
+    for (pair, diff_data), analysis in zip(diffed, analyses):
+        rows.append({
+            "policy_id": policy_id,
+            "old_snapshot_id": pair.prev_id,
+            "new_snapshot_id": pair.id,
+            "diff_html": diff_data["diff_html"],
+            "diff_text": diff_data["diff_text"],
+            "clauses_added": diff_data["clauses_added"],
+            "clauses_removed": diff_data["clauses_removed"],
+            "clauses_modified": diff_data["clauses_modified"],
+            "summary": analysis.get("summary"),
+            "severity": analysis.get("severity", "informational"),
+            "severity_score": analysis.get("severity_score", 0.0),
+            "key_changes": analysis.get("key_changes"),
+            "recommendation": analysis.get("recommendation"),
+            "created_at": pair.captured_at,  # date it to when the change happened
+        })
+        logger.info(
+            f"[wayback] diff between snapshot {pair.prev_id} -> {pair.id}: "
+            f"severity={analysis.get('severity')}"
+        )
 
-    return diffs_created
+    # One executemany INSERT ... RETURNING; pairs are in captured_at order,
+    # so the last record is the newest diff
+    diff_records = list(db.scalars(
+        insert(Diff).returning(Diff, sort_by_parameter_order=True), rows,
+    ))
+    return len(diff_records), diff_records[-1]
 
 
 async def _notify_seed_results(
     db: Session, policy: Policy, policy_id: int,
-    new_snapshots: List[Snapshot], diffs_created: int,
+    new_snapshots: List[Snapshot], diffs_created: int, latest_diff: Optional[Diff],
 ):
-    """Send notifications about seeding results."""
+    """Send notifications about seeding results.
+
+    ``latest_diff`` is the newest diff created by this seed (from
+    _compute_seeded_diffs), so it is not queried again.
+    """
     if diffs_created > 0:
-        latest_diff = (
-            db.query(Diff)
-            .filter(Diff.policy_id == policy_id)
-            .order_by(Diff.created_at.desc())
-            .first()
-        )
         if latest_diff:
             alert_ok = await send_alert(
                 policy_name=policy.name,
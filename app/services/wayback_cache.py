@@ -0,0 +1,46 @@
+"""Cache of extracted text for archived Wayback captures.
+
+A capture's CDX ``digest`` identifies its exact archived bytes, so the text
+extracted from it can be stored once and reused by every later seed.  The
+key also covers the page URL (relative links are resolved against it) and
+the HTML extractor in use, both of which change the extracted text.
+"""
+
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import WaybackExtraction
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(digest: str, url: str) -> str:
+    """SHA-256 over the inputs that determine a capture's extracted text."""
+    h = hashlib.sha256()
+    for part in (digest, url, "fast" if settings.fast_html_extractor else "html2text"):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def get(db: Session, digest: str, url: str) -> Optional[Tuple[str, str]]:
+    """Return ``(text, content_hash)`` for a cached capture, or None."""
+    try:
+        row = db.get(WaybackExtraction, cache_key(digest, url))
+    except Exception as e:
+        logger.warning(f"[wayback] cache lookup failed for digest {digest}: {e}")
+        return None
+    if row is None:
+        return None
+    return row.content_text, row.content_hash
+
+
+def put(db: Session, digest: str, url: str, text: str, content_hash: str) -> None:
+    """Stage a capture's extracted text; committed with the caller's transaction."""
+    db.merge(WaybackExtraction(
+        key=cache_key(digest, url), content_text=text, content_hash=content_hash,
+    ))
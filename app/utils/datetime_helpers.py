@@ -5,9 +5,12 @@ user's preferred timezone happens at the API/frontend boundary.
 """
 
 import datetime
+from functools import lru_cache
 from typing import Optional
 from zoneinfo import ZoneInfo, available_timezones
 
+_UTC = datetime.timezone.utc
+_now = datetime.datetime.now
 
 # Common timezone aliases for user-friendly display
 TIMEZONE_ALIASES = {
@@ -23,10 +26,14 @@ TIMEZONE_ALIASES = {
     "UTC": "UTC",
 }
 
+# Every accepted timezone name.  tzdata does not change while the process
+# runs, so the zoneinfo directory is walked once instead of per call.
+_AVAILABLE_TZS = frozenset(available_timezones()) | frozenset(TIMEZONE_ALIASES)
+
 
 def utcnow() -> datetime.datetime:
     """Return the current UTC time as a timezone-aware datetime."""
-    return datetime.datetime.now(datetime.timezone.utc)
+    return _now(_UTC)
 
 
 def ensure_utc(dt: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
@@ -34,8 +41,8 @@ def ensure_utc(dt: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
     if dt is None:
         return None
     if dt.tzinfo is None:
-        return dt.replace(tzinfo=datetime.timezone.utc)
-    return dt.astimezone(datetime.timezone.utc)
+        return dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC)
 
 
 def to_timezone(dt: Optional[datetime.datetime], tz_name: str) -> Optional[datetime.datetime]:
@@ -48,19 +55,30 @@ def to_timezone(dt: Optional[datetime.datetime], tz_name: str) -> Optional[datet
     if dt is None:
         return None
     dt = ensure_utc(dt)
-    iana_name = TIMEZONE_ALIASES.get(tz_name.upper(), tz_name)
-    try:
-        target_tz = ZoneInfo(iana_name)
-    except (KeyError, ValueError):
+    target_tz = _get_zoneinfo(_resolve_timezone_name(tz_name))
+    if target_tz is None:
         return dt  # Unknown timezone — return UTC
     return dt.astimezone(target_tz)
 
 
+@lru_cache(maxsize=512)
+def _resolve_timezone_name(tz_name: str) -> str:
+    """Map a common abbreviation to its IANA name (other names pass through)."""
+    return TIMEZONE_ALIASES.get(tz_name.upper(), tz_name)
+
+
+@lru_cache(maxsize=512)
+def _get_zoneinfo(iana_name: str) -> Optional[ZoneInfo]:
+    """Cached ZoneInfo for an IANA name, or None if it is unknown."""
+    try:
+        return ZoneInfo(iana_name)
+    except (KeyError, ValueError):
+        return None
+
+
 def is_valid_timezone(tz_name: str) -> bool:
     """Check if a timezone name is valid (IANA or alias)."""
-    if tz_name.upper() in TIMEZONE_ALIASES:
-        return True
-    return tz_name in available_timezones()
+    return tz_name in _AVAILABLE_TZS or tz_name.upper() in TIMEZONE_ALIASES
 
 
 def format_datetime(dt: Optional[datetime.datetime], tz_name: str = "UTC") -> Optional[str]:
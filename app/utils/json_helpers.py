@@ -0,0 +1,35 @@
+"""Fast JSON helpers for hot paths.
+
+Backed by orjson when it is installed (several times faster than the stdlib
+and serializes straight to bytes), falling back to the stdlib json module.
+Output is compact JSON either way; decode errors are always ``ValueError``.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional accelerator — fall back to stdlib json
+    orjson = None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (e.g. for an HTTP body)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a JSON string (e.g. for a TEXT column)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from ``str`` or ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
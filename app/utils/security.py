@@ -7,6 +7,7 @@ import hashlib
 import hmac
 import secrets
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Optional
 
 import jwt
@@ -17,14 +18,46 @@ def generate_api_key() -> str:
     return f"pd_{secrets.token_urlsafe(32)}"
 
 
+# API keys are 256-bit random tokens, so a 160-bit BLAKE2b digest keeps a
+# huge security margin while hashing faster than SHA-256.
+_API_KEY_DIGEST_SIZE = 20
+_LEGACY_SHA256_HEX_LEN = 64
+
+
 def hash_api_key(key: str) -> str:
-    """Hash an API key for safe storage using SHA-256."""
-    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    """Hash an API key for safe storage using BLAKE2b-160.
+
+    Deliberately not memoized: a cache would keep plaintext keys in memory
+    as its keys, and the digest of a short key is already sub-microsecond.
+    """
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=_API_KEY_DIGEST_SIZE).hexdigest()
 
 
 def verify_api_key(plain_key: str, hashed_key: str) -> bool:
-    """Constant-time comparison of a plain API key against its stored hash."""
-    return hmac.compare_digest(hash_api_key(plain_key), hashed_key)
+    """Constant-time comparison of a plain API key against its stored hash.
+
+    Accepts current BLAKE2b hashes and legacy SHA-256 ones, told apart by
+    length.
+    """
+    if len(hashed_key) == _LEGACY_SHA256_HEX_LEN:
+        candidate = hashlib.sha256(plain_key.encode("utf-8")).hexdigest()
+    else:
+        candidate = hash_api_key(plain_key)
+    return hmac.compare_digest(candidate, hashed_key)
+
+
+@lru_cache(maxsize=4)
+def _secret_bytes(secret: str) -> bytes:
+    """A signing secret as HMAC key bytes, encoded once rather than per token.
+
+    Room for a few entries so current and previous secrets during a
+    rotation don't evict each other.
+    """
+    return secret.encode("utf-8")
+
+
+# Only the claims generate_bearer_token() issues are checked
+_JWT_DECODE_OPTIONS = {"require": ["exp", "sub"], "verify_aud": False, "verify_iss": False}
 
 
 def generate_bearer_token(user_id: int, secret: str, expires_hours: int = 24) -> str:
@@ -41,13 +74,20 @@ def generate_bearer_token(user_id: int, secret: str, expires_hours: int = 24) ->
         "exp": now + timedelta(hours=expires_hours),
         "iat": now,
     }
-    return jwt.encode(payload, secret, algorithm="HS256")
+    return jwt.encode(payload, _secret_bytes(secret), algorithm="HS256")
 
 
 def verify_bearer_token(token: str, secret: str) -> Optional[int]:
     """Verify a JWT bearer token and return the user_id, or None if invalid/expired."""
+    # A compact JWS is exactly three dot-separated segments; reject anything
+    # else (e.g. a static API key tried as a bearer token) before PyJWT
+    # base64- and JSON-decodes it.
+    if token.count(".") != 2:
+        return None
     try:
-        payload = jwt.decode(token, secret, algorithms=["HS256"])
+        payload = jwt.decode(
+            token, _secret_bytes(secret), algorithms=["HS256"], options=_JWT_DECODE_OPTIONS,
+        )
         return int(payload["sub"])
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, KeyError, ValueError):
         return None
@@ -7,12 +7,16 @@ cloud metadata endpoints, and non-HTTP(S) schemes.
 import ipaddress
 import logging
 import socket
-from typing import Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
 ALLOWED_SCHEMES = {"http", "https"}
+_ALLOWED_PREFIXES = tuple(f"{scheme}://" for scheme in sorted(ALLOWED_SCHEMES))
 
 # Private/reserved IP ranges that must be blocked to prevent SSRF
 BLOCKED_NETWORKS = [
@@ -40,7 +44,25 @@ BLOCKED_NETWORKS = [
     ipaddress.ip_network("ff00::/8"),
 ]
 
-BLOCKED_HOSTNAMES = {"localhost", "metadata.google.internal"}
+BLOCKED_HOSTNAMES = frozenset({"localhost", "metadata.google.internal"})
+
+
+def _prefix_index(version: int) -> Tuple[Tuple[int, FrozenSet[int]], ...]:
+    """Group BLOCKED_NETWORKS of one IP version as (shift, {network >> shift}).
+
+    An address is inside a network when ``int(ip) >> shift`` equals the
+    network's own prefix, so each distinct prefix length costs one shift
+    and one set probe instead of a test per network.
+    """
+    by_shift: Dict[int, Set[int]] = {}
+    for network in BLOCKED_NETWORKS:
+        if network.version == version:
+            shift = network.max_prefixlen - network.prefixlen
+            by_shift.setdefault(shift, set()).add(int(network.network_address) >> shift)
+    return tuple((shift, frozenset(prefixes)) for shift, prefixes in sorted(by_shift.items()))
+
+
+_BLOCKED_PREFIXES = {4: _prefix_index(4), 6: _prefix_index(6)}
 
 
 def _is_ip_blocked(ip_str: str) -> bool:
@@ -49,7 +71,39 @@ def _is_ip_blocked(ip_str: str) -> bool:
         ip = ipaddress.ip_address(ip_str)
     except ValueError:
         return True  # Unparseable IPs are blocked
-    return any(ip in network for network in BLOCKED_NETWORKS)
+    ip_int = int(ip)
+    return any(ip_int >> shift in prefixes for shift, prefixes in _BLOCKED_PREFIXES[ip.version])
+
+
+# Successful DNS answers are reused for this long; failures are not cached.
+DNS_CACHE_TTL_SECS = 60
+DNS_CACHE_MAX_ENTRIES = 1024
+_dns_cache: Dict[str, Tuple[float, List[str]]] = {}
+_dns_cache_lock = threading.Lock()
+
+
+def _resolve(hostname: str) -> List[str]:
+    """Return the IP addresses ``hostname`` resolves to (TTL-cached).
+
+    Raises socket.gaierror if it does not resolve.
+    """
+    now = time.monotonic()
+    with _dns_cache_lock:
+        entry = _dns_cache.get(hostname)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    # One lookup covers both families; getaddrinfo can still repeat an
+    # address, so each is kept (and blocklist-checked) once.
+    addrinfo = socket.getaddrinfo(
+        hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM, socket.IPPROTO_TCP,
+    )
+    ips = list(dict.fromkeys(info[4][0] for info in addrinfo))
+    with _dns_cache_lock:
+        if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+            _dns_cache.clear()
+        _dns_cache[hostname] = (now + DNS_CACHE_TTL_SECS, ips)
+    return ips
 
 
 def validate_policy_url(url: str) -> Tuple[bool, Optional[str]]:
@@ -64,39 +118,57 @@ def validate_policy_url(url: str) -> Tuple[bool, Optional[str]]:
     if len(url) > 2048:
         return False, "URL exceeds maximum length of 2048 characters"
 
+    # Scheme check — a prefix test rejects ftp:, javascript: etc. before
+    # paying for urlparse (schemes are case-insensitive)
+    if not url[:8].lower().startswith(_ALLOWED_PREFIXES):
+        scheme = url.partition(":")[0].lower() if ":" in url else ""
+        if scheme in ALLOWED_SCHEMES:  # e.g. "http:/path"
+            return False, "URL must include a hostname"
+        return False, f"URL scheme must be http or https, got '{scheme}'"
+
     try:
         parsed = urlparse(url)
     except Exception:
         return False, "Invalid URL format"
 
-    # Scheme check
-    if parsed.scheme not in ALLOWED_SCHEMES:
-        return False, f"URL scheme must be http or https, got '{parsed.scheme}'"
-
     hostname = parsed.hostname
     if not hostname:
         return False, "URL must include a hostname"
 
     # Block known dangerous hostnames
-    hostname_lower = hostname.lower()
-    if hostname_lower in BLOCKED_HOSTNAMES:
+    # (urlparse already lower-cases .hostname)
+    if hostname in BLOCKED_HOSTNAMES:
         return False, f"Hostname '{hostname}' is not allowed"
 
-    # Block raw IP addresses in common private ranges (fast check before DNS)
+    # IP literals need no DNS lookup: the blocklist check is the whole answer
     try:
         ip = ipaddress.ip_address(hostname)
-        if _is_ip_blocked(str(ip)):
-            return False, "URL points to a private or reserved IP address"
     except ValueError:
         pass  # Not an IP literal — will resolve via DNS below
+    else:
+        if _is_ip_blocked(str(ip)):
+            return False, "URL points to a private or reserved IP address"
+        return True, None
 
     # DNS resolution check — ensure hostname doesn't resolve to private IP
     try:
-        addrinfo = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
-        for _family, _type, _proto, _canonname, sockaddr in addrinfo:
-            if _is_ip_blocked(sockaddr[0]):
-                return False, "URL resolves to a private or reserved IP address"
+        ips = _resolve(hostname)
     except socket.gaierror:
         return False, f"Could not resolve hostname '{hostname}'"
+    if any(_is_ip_blocked(ip) for ip in ips):
+        return False, "URL resolves to a private or reserved IP address"
 
     return True, None
+
+
+def validate_policy_urls(urls: Iterable[str], max_workers: int = 8) -> List[Tuple[bool, Optional[str]]]:
+    """validate_policy_url() for many URLs, resolving hostnames concurrently.
+
+    getaddrinfo releases the GIL, so a batch takes about as long as its
+    slowest lookup rather than the sum of them.  Results are in input order.
+    """
+    urls = list(urls)
+    if len(urls) <= 1:
+        return [validate_policy_url(url) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(validate_policy_url, urls))
@@ -0,0 +1,32 @@
+"""Optional native build of the differ's string-processing core.
+
+PolicyDiff runs fine as plain Python.  To compile ``app/services/differ_core.py``
+with mypyc for faster clause splitting and heading detection:
+
+    pip install mypy
+    python scripts/build_differ_core.py
+
+The resulting extension module sits next to the ``.py`` file and takes
+precedence over it on import, so rebuild after editing ``differ_core.py``
+(``app.services.differ`` warns at startup when the build is older than the
+source).  Delete the ``.so``/``.pyd`` to go back to the pure-Python version.
+"""
+
+import os
+import sys
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    sys.exit("mypyc is not installed — run `pip install mypy` first")
+
+from setuptools import setup
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+setup(
+    name="policydiff-differ-core",
+    py_modules=[],
+    ext_modules=mypycify(["app/services/differ_core.py"]),
+    script_args=["build_ext", "--inplace"],
+)
@@ -20,20 +20,46 @@ os.environ["API_KEY"] = ""  # Disable auth for tests
 os.environ["GOOGLE_CLIENT_ID"] = ""  # Disable Google OAuth for tests
 os.environ["GOOGLE_CLIENT_SECRET"] = ""
 
+from sqlalchemy import event
+
 from app.database import Base, get_db, engine, SessionLocal
 from app.main import app
 from app.models import Policy, Snapshot, Diff
 from app.utils.datetime_helpers import utcnow
 
 
-@pytest.fixture(autouse=True)
-def _reset_tables():
-    """Drop and recreate all tables before each test for isolation."""
+@event.listens_for(engine, "connect")
+def _skip_fsync(dbapi_connection, connection_record):
+    """The test DB is throwaway: don't fsync on every commit."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.close()
+
+
+engine.dispose()  # connections opened during import predate the listener
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    """Create the schema once for the whole test session."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
     yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_tables(_schema):
+    """Empty every table before each test for isolation.
+
+    Rows are deleted rather than rolled back because the code under test
+    opens its own sessions (``get_scoped_session``) and commits.
+    """
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Provide a DB session for direct data manipulation in tests."""
@@ -43,9 +69,26 @@ def db_session():
     session.close()
 
 
-@pytest.fixture(scope="function")
-def client():
-    """FastAPI TestClient — uses the app's own engine and SessionLocal."""
+@pytest.fixture(scope="session")
+def _session_client(_schema):
+    """One TestClient (and one lifespan startup) for the whole session."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def client(_session_client):
+    """FastAPI TestClient — uses the app's own engine and SessionLocal.
+
+    Shared across tests; tables are emptied between tests by _reset_tables.
+    """
+    _session_client.cookies.clear()
+    return _session_client
+
+
+@pytest.fixture
+def fresh_client():
+    """A TestClient with its own lifespan, for tests that need a fresh app."""
     with TestClient(app) as c:
         yield c
 
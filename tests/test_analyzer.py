@@ -0,0 +1,71 @@
+"""Tests for LLM diff analysis."""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services import analyzer
+
+
+def _item(name, diff_text):
+    return {
+        "policy_name": name, "company": "TestCo", "policy_type": "privacy",
+        "diff_text": diff_text, "clauses_added": "[]", "clauses_removed": "[]", "clauses_modified": "[]",
+    }
+
+
+def _analysis(summary):
+    return {
+        "summary": summary, "severity": "concerning", "severity_score": 0.5,
+        "key_changes": "[]", "recommendation": "Review it",
+    }
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Fake LLM: records each batched request and answers per policy name."""
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(analyzer, "ANALYSIS_BATCH_SIZE", 2)
+    state = {"batches": [], "single": [], "fail": False}
+
+    async def call_batch(items):
+        state["batches"].append([item["policy_name"] for item in items])
+        if state["fail"]:
+            return None
+        return [_analysis(f"batched {item['policy_name']}") for item in items]
+
+    async def call_single(policy_name, *args):
+        state["single"].append(policy_name)
+        return _analysis(f"single {policy_name}")
+
+    monkeypatch.setattr(analyzer, "_call_llm_batch", call_batch)
+    monkeypatch.setattr(analyzer, "_call_llm", call_single)
+    return state
+
+
+class TestAnalyzeDiffsBatch:
+    def test_results_follow_input_order_around_cache_hits(self, llm):
+        items = [_item(f"P{i}", f"diff {i}") for i in range(4)]
+        analyzer._store_analyses({analyzer._item_cache_key(items[1]): _analysis("cached P1")})
+
+        results = asyncio.run(analyzer.analyze_diffs_batch(items))
+
+        assert [r["summary"] for r in results] == ["batched P0", "cached P1", "batched P2", "single P3"]
+        assert llm["batches"] == [["P0", "P2"]]
+        # The lone item in the last batch goes through the per-item path
+        assert llm["single"] == ["P3"]
+
+    def test_fresh_results_are_cached(self, llm):
+        items = [_item("P0", "diff 0"), _item("P1", "diff 1")]
+        asyncio.run(analyzer.analyze_diffs_batch(items))
+        again = asyncio.run(analyzer.analyze_diffs_batch(items))
+        assert [r["summary"] for r in again] == ["batched P0", "batched P1"]
+        assert llm["batches"] == [["P0", "P1"]]
+
+    def test_unusable_batch_falls_back_to_per_item_calls(self, llm):
+        llm["fail"] = True
+        items = [_item("P0", "diff 0"), _item("P1", "diff 1")]
+        results = asyncio.run(analyzer.analyze_diffs_batch(items))
+        assert [r["summary"] for r in results] == ["single P0", "single P1"]
+        assert sorted(llm["single"]) == ["P0", "P1"]
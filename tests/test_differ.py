@@ -5,13 +5,22 @@ import pytest
 from app.services.differ import compute_full_diff
 
 
+_TEXT = "# Privacy Policy\n\nWe collect your data.\n"
+
+
 class TestDiffComputation:
     def test_identical_texts_produce_minimal_diff(self):
-        text = "# Privacy Policy\n\nWe collect your data.\n"
-        result = compute_full_diff(text, text)
+        result = compute_full_diff(_TEXT, _TEXT)
         assert result["clauses_added"] == "[]" or json.loads(result["clauses_added"]) == []
         assert result["clauses_removed"] == "[]" or json.loads(result["clauses_removed"]) == []
 
+    def test_identical_texts_skip_diffing(self, monkeypatch):
+        from app.services import differ
+        monkeypatch.setattr(differ, "compute_clause_changes", pytest.fail)
+        result = differ._compute_full_diff_uncached(_TEXT, _TEXT)
+        assert result["diff_text"] == "" and result["diff_excerpt"] == ""
+        assert result["change_summary"]["modified_count"] == 0
+
     def test_added_section_detected(self):
         old = "# Privacy Policy\n\nWe collect your data.\n"
         new = "# Privacy Policy\n\nWe collect your data.\n\n## New Section\n\nNew content here.\n"
@@ -38,3 +47,74 @@ class TestDiffComputation:
         new = "Line one.\nLine three.\n"
         result = compute_full_diff(old, new)
         assert "---" in result["diff_text"] or "@@" in result["diff_text"] or result["diff_text"]
+
+    def test_sanitize_preview_strips_non_printable(self):
+        from app.services.differ import _sanitize_preview
+        text = "We\u200b collect\x00 your\u00a0data.\n\n\tAnd  share it.\ufeff"
+        assert _sanitize_preview(text) == "We collect yourdata.\n And share it."
+
+    def test_renamed_section_detected_as_modified(self):
+        old = "# Policy\n\n## Data We Collect\n\nWe collect your email and name for account purposes.\n"
+        new = "# Policy\n\n## Information We Collect\n\nWe collect your email, name and location for account purposes.\n"
+        result = compute_full_diff(old, new)
+        modified = json.loads(result["clauses_modified"])
+        assert [c["section"] for c in modified] == ["Data We Collect → Information We Collect"]
+        assert json.loads(result["clauses_added"]) == []
+        assert json.loads(result["clauses_removed"]) == []
+
+    @pytest.mark.parametrize("old_heading, old_body, new_heading, new_body", [
+        ("Data We Collect", "We collect your email and name for account purposes.",
+         "Information We Collect", "We collect your email, name and location for account purposes."),
+        ("Data We Collect",
+         "We collect your name, email address, phone number and location when you create an account. " * 4,
+         "Information We Gather",
+         "We may collect your full name, e-mail address, telephone number and approximate location "
+         "whenever you register. " * 4),
+        ("Cookies", "We use cookies.", "Children", "Our service is not directed at children under 13."),
+    ])
+    def test_fuzzy_pairing_same_with_and_without_rapidfuzz(
+        self, monkeypatch, old_heading, old_body, new_heading, new_body,
+    ):
+        from app.services import differ
+        if differ.process is None:
+            pytest.skip("rapidfuzz not installed")
+        args = ([old_heading, "Retention"], [old_body, "We keep data for 30 days."],
+                ["Retention Period", new_heading], ["We keep data for 90 days.", new_body])
+        with_rapidfuzz = differ._fuzzy_match_pairs(*args)
+        monkeypatch.setattr(differ, "process", None)
+        assert differ._fuzzy_match_pairs(*args) == with_rapidfuzz
+
+    def test_indel_ratio_matches_rapidfuzz(self):
+        from app.services import differ
+        if differ.process is None:
+            pytest.skip("rapidfuzz not installed")
+        pairs = [("", ""), ("abc", ""), ("kitten", "sitting"), ("We collect data.", "We sell your data!")]
+        for a, b in pairs:
+            assert differ._indel_ratio(a, b) == pytest.approx(differ.fuzz.ratio(a, b))
+
+    def test_full_diff_is_memoized_by_content(self):
+        from app.services import differ
+        differ.clear_diff_cache()
+        old = "# Policy\n\nOld text.\n"
+        new = "# Policy\n\nNew text.\n"
+        first = compute_full_diff(old, new)
+        assert len(differ._diff_cache) == 1
+        assert compute_full_diff(old, new) == first
+        assert len(differ._diff_cache) == 1
+        differ.clear_diff_cache()
+        assert len(differ._diff_cache) == 0
+
+    def test_unified_diff_excerpt_matches_truncated_full_diff(self):
+        from app.services.analyzer import _truncate
+        from app.services.differ import compute_unified_diff, compute_unified_diff_excerpt
+        old = "".join(f"Clause {i}: we keep data.\n" for i in range(500))
+        new = "".join(f"Clause {i}: we sell data.\n" for i in range(500))
+        full = compute_unified_diff(old, new)
+        assert compute_unified_diff_excerpt(old, new, 3000) == _truncate(full, 3000)
+        assert compute_unified_diff_excerpt("a\n", "b\n", 3000) == compute_unified_diff("a\n", "b\n")
+
+    def test_diff_excerpt_keeps_only_changed_lines(self):
+        old = "Intro.\nWe keep data.\nOutro.\n"
+        new = "Intro.\nWe sell data.\nOutro.\n"
+        lines = compute_full_diff(old, new)["diff_excerpt"].splitlines()
+        assert lines == ["@@ -1,3 +1,3 @@", "-We keep data.", "+We sell data."]
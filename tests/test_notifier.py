@@ -0,0 +1,74 @@
+"""Tests for alert delivery."""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import settings
+from app.services import notifier
+
+
+class _HookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the client pools connections
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_url(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HookHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/hook"
+    monkeypatch.setattr(settings, "webhook_url", url)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def _send():
+    return notifier._send_webhook(
+        "Privacy Policy", "TestCo", "concerning", "Summary", ["Change"], "Review it", 1,
+    )
+
+
+class TestWebhook:
+    def test_webhook_from_another_event_loop(self, webhook_url):
+        app_loop = asyncio.new_event_loop()
+        try:
+            assert app_loop.run_until_complete(_send()) is True
+            # The Wayback seeder sends alerts from its own asyncio.run() loop
+            assert asyncio.run(_send()) is True
+            assert app_loop.run_until_complete(_send()) is True
+        finally:
+            app_loop.run_until_complete(notifier.close_notifier())
+            app_loop.close()
+
+    def test_other_event_loop_gets_private_client(self):
+        async def get():
+            return notifier._get_webhook_client()
+
+        app_loop = asyncio.new_event_loop()
+        try:
+            shared, owned = app_loop.run_until_complete(get())
+            assert owned is False
+            assert app_loop.run_until_complete(get()) == (shared, False)
+
+            async def from_seeder_loop():
+                client, owned = notifier._get_webhook_client()
+                await client.aclose()
+                return client, owned
+            private, owned = asyncio.run(from_seeder_loop())
+            assert owned is True and private is not shared
+        finally:
+            app_loop.run_until_complete(notifier.close_notifier())
+            app_loop.close()
@@ -0,0 +1,124 @@
+"""Tests for the scrape -> diff -> analyze -> notify pipeline."""
+
+import asyncio
+
+import pytest
+
+from app.models import Diff, Policy, Snapshot
+from app.services import pipeline
+from app.services.scraper import compute_hash
+
+
+NO_VALIDATORS = {"etag": None, "last_modified": None, "raw_hash": None}
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Fake live page plus recorded alerts; the pipeline's network calls are patched."""
+    state = {"text": "# Policy\n\nWe collect your email.\n", "validators": dict(NO_VALIDATORS), "alerts": []}
+
+    async def scrape(url, etag=None, last_modified=None, raw_hash=None):
+        return state["text"], compute_hash(state["text"]), [], dict(state["validators"])
+
+    async def alert(**kwargs):
+        state["alerts"].append(kwargs)
+        return True
+
+    async def analyze(**kwargs):
+        return {"summary": "Changed", "severity": "concerning", "severity_score": 0.5, "key_changes": "[]"}
+
+    monkeypatch.setattr(pipeline, "scrape_policy_if_modified", scrape)
+    monkeypatch.setattr(pipeline, "send_alert", alert)
+    monkeypatch.setattr(pipeline, "analyze_diff", analyze)
+    state["analyze"] = analyze
+    return state
+
+
+def _reschedule_all():
+    with pipeline.get_scoped_session() as db:
+        db.query(Policy).update({Policy.next_check_at: None})
+        db.commit()
+
+
+def _check(policy):
+    return asyncio.run(pipeline.check_policy(
+        policy.id, policy.url, policy.name, policy.company, policy.policy_type,
+    ))
+
+
+class TestSnapshotAndDiffAtomicity:
+    def test_interrupted_check_stores_no_diffless_snapshot(self, db_session, make_policy, site, monkeypatch):
+        policy = make_policy()
+        assert _check(policy)["status"] == "first_snapshot"
+
+        site["text"] = "# Policy\n\nWe sell your email.\n"
+
+        async def cancelled(**kwargs):
+            raise asyncio.CancelledError()
+        monkeypatch.setattr(pipeline, "analyze_diff", cancelled)
+        with pytest.raises(asyncio.CancelledError):
+            _check(policy)
+        assert db_session.query(Snapshot).count() == 1
+
+        async def failing(**kwargs):
+            raise RuntimeError("LLM unavailable")
+        monkeypatch.setattr(pipeline, "analyze_diff", failing)
+        assert _check(policy)["status"] == "error"
+        assert db_session.query(Snapshot).count() == 1
+
+        # The change is still detected, diffed and reported on the next check
+        monkeypatch.setattr(pipeline, "analyze_diff", site["analyze"])
+        site["alerts"].clear()
+        result = _check(policy)
+        assert result["status"] == "changed"
+        db_session.expire_all()
+        diff = db_session.get(Diff, result["diff_id"])
+        assert diff.new_snapshot.content_hash == compute_hash(site["text"])
+        assert [a["diff_id"] for a in site["alerts"]] == [diff.id]
+
+    def test_failed_batch_analysis_leaves_changes_pending(self, db_session, make_policy, site, monkeypatch):
+        for i in range(2):
+            make_policy(url=f"https://example{i}.com/privacy", name=f"Policy {i}")
+        results = asyncio.run(pipeline.check_all_policies())
+        assert {r["status"] for r in results} == {"first_snapshot"}
+
+        site["text"] = "# Policy\n\nWe sell your email.\n"
+        _reschedule_all()
+
+        async def failing(items):
+            raise RuntimeError("LLM unavailable")
+        monkeypatch.setattr(pipeline, "analyze_diffs_batch", failing)
+        results = asyncio.run(pipeline.check_all_policies())
+        assert [r["status"] for r in results] == ["error", "error"]
+        assert db_session.query(Snapshot).count() == 2
+        # Failed checks are retried after a backoff, not on the next run
+        assert asyncio.run(pipeline.check_all_policies()) == []
+        _reschedule_all()
+
+        async def batch(items):
+            return [await site["analyze"](**item) for item in items]
+        monkeypatch.setattr(pipeline, "analyze_diffs_batch", batch)
+        results = asyncio.run(pipeline.check_all_policies())
+        assert [r["status"] for r in results] == ["changed", "changed"]
+        assert db_session.query(Snapshot).count() == 4
+        assert db_session.query(Diff).count() == 2
+
+
+class TestConditionalCheck:
+    def test_not_modified_reuses_validators_and_reschedules(self, db_session, make_policy, site, monkeypatch):
+        policy = make_policy()
+        site["validators"] = {"etag": '"v1"', "last_modified": None, "raw_hash": "abc"}
+        assert _check(policy)["status"] == "first_snapshot"
+
+        sent = []
+
+        async def not_modified(url, etag=None, last_modified=None, raw_hash=None):
+            sent.append({"etag": etag, "last_modified": last_modified, "raw_hash": raw_hash})
+            return None
+        monkeypatch.setattr(pipeline, "scrape_policy_if_modified", not_modified)
+        _reschedule_all()
+        assert _check(policy)["status"] == "unchanged"
+        assert sent == [site["validators"]]
+        db_session.expire_all()
+        assert db_session.get(Policy, policy.id).next_check_at is not None
+        assert db_session.query(Snapshot).count() == 1
@@ -0,0 +1,106 @@
+"""Tests for the in-process policy check scheduler."""
+
+import asyncio
+import contextlib
+from datetime import timedelta
+
+import pytest
+
+from app.database import SessionLocal
+from app.models import Policy
+from app.services import pipeline, scheduler
+from app.utils.datetime_helpers import utcnow
+
+
+@pytest.fixture
+def fast_loop(monkeypatch):
+    """Shrink the scheduler's sleeps and count its database wake-ups."""
+    monkeypatch.setattr(scheduler, "MAX_SLEEP_SECS", 0.01)
+    monkeypatch.setattr(scheduler, "MIN_RUN_GAP_SECS", 0.01)
+    wakeups = []
+
+    @contextlib.contextmanager
+    def session_factory():
+        wakeups.append(utcnow())
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def run(check_callback, seconds=0.3):
+        async def drive():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(scheduler.scheduler_loop(check_callback, session_factory), seconds)
+        asyncio.run(drive())
+        return wakeups
+    return run
+
+
+def _next_check(db_session, policy):
+    db_session.expire_all()
+    return db_session.get(Policy, policy.id)
+
+
+class TestSchedulerLoop:
+    def test_runs_due_policies_once_then_sleeps(self, db_session, make_policy, fast_loop):
+        policy = make_policy()
+        runs = []
+
+        async def check():
+            runs.append(utcnow())
+            with SessionLocal() as db:
+                pipeline._update_next_check(db, policy.id)
+                db.commit()
+
+        wakeups = fast_loop(check)
+        assert len(runs) == 1
+        # Still polling for newly added policies, without running checks
+        assert len(wakeups) > 2
+
+    def test_idle_without_active_policies(self, make_policy, fast_loop):
+        make_policy(is_active=False)
+        runs = []
+
+        async def check():
+            runs.append(utcnow())
+
+        fast_loop(check)
+        assert runs == []
+
+    def test_failing_policy_backs_off_instead_of_retrying(self, db_session, make_policy, fast_loop, monkeypatch):
+        policy = make_policy()
+        scrapes = []
+
+        async def broken(url, **validators):
+            scrapes.append(url)
+            raise RuntimeError("connection refused")
+        monkeypatch.setattr(pipeline, "scrape_policy_if_modified", broken)
+
+        fast_loop(pipeline.check_all_policies)
+
+        assert scrapes == [policy.url]
+        stored = _next_check(db_session, policy)
+        assert stored.consecutive_failures == 1
+        delay = stored.next_check_at.replace(tzinfo=utcnow().tzinfo) - utcnow()
+        assert timedelta(minutes=14) < delay <= pipeline.FAILURE_BACKOFF
+
+
+class TestFailureBackoff:
+    def test_backoff_doubles_up_to_the_check_interval(self, db_session, make_policy):
+        policy = make_policy(check_interval_hours=1)
+        delays = []
+        for _ in range(4):
+            pipeline._record_failure(policy.id)
+            stored = _next_check(db_session, policy)
+            delays.append(stored.next_check_at.replace(tzinfo=utcnow().tzinfo) - utcnow())
+        assert [round(d / timedelta(minutes=15)) for d in delays] == [1, 2, 4, 4]
+        assert stored.consecutive_failures == 4
+
+    def test_success_resets_backoff(self, db_session, make_policy):
+        policy = make_policy()
+        pipeline._record_failure(policy.id)
+        with SessionLocal() as db:
+            pipeline._update_next_check(db, policy.id)
+            db.commit()
+        assert _next_check(db_session, policy).consecutive_failures == 0
@@ -0,0 +1,92 @@
+"""Tests for the policy scraper."""
+
+import asyncio
+
+import httpx
+
+from app.services import scraper
+
+
+POLICY_HTML = (
+    "<html><body><main><h1>Privacy Policy</h1><p>"
+    + "We collect your email address to run your account. " * 10
+    + "</p></main></body></html>"
+)
+
+
+class TestConcurrencyLimits:
+    def test_host_semaphore_is_per_event_loop(self):
+        url = "https://example.com/privacy"
+        limit = max(scraper.MAX_REQUESTS_PER_HOST, scraper.MAX_STREAMS_PER_HOST_HTTP2)
+
+        async def contend():
+            sem = scraper._get_host_semaphore(url)
+
+            async def hold():
+                async with sem:
+                    await asyncio.sleep(0.01)
+            # More holders than permits, so some have to wait on the semaphore
+            await asyncio.gather(*(hold() for _ in range(limit + 1)))
+            return sem
+
+        # App loop, then the Wayback seeder's own asyncio.run() loop
+        assert asyncio.run(contend()) is not asyncio.run(contend())
+
+    def test_browser_semaphore_is_per_event_loop(self):
+        async def get():
+            return scraper._get_browser_semaphore()
+
+        async def twice():
+            return await get(), await get()
+
+        first, again = asyncio.run(twice())
+        assert first is again
+        assert asyncio.run(get()) is not first
+
+
+class TestConditionalScrape:
+    def _serve(self, monkeypatch, etag='"v1"'):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304)
+            return httpx.Response(
+                200, text=POLICY_HTML,
+                headers={"content-type": "text/html", "etag": etag, "last-modified": "Tue, 01 Oct 2024 00:00:00 GMT"},
+            )
+
+        def get_client():
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler)), True
+        monkeypatch.setattr(scraper, "_get_client", get_client)
+        return requests
+
+    def test_first_fetch_returns_validators(self, monkeypatch):
+        self._serve(monkeypatch)
+        text, content_hash, _, validators = asyncio.run(
+            scraper.scrape_policy_if_modified("https://example.com/privacy")
+        )
+        assert "We collect your email address" in text
+        assert validators["etag"] == '"v1"'
+        assert validators["last_modified"] == "Tue, 01 Oct 2024 00:00:00 GMT"
+        assert validators["raw_hash"]
+
+    def test_not_modified_returns_none(self, monkeypatch):
+        requests = self._serve(monkeypatch)
+        result = asyncio.run(scraper.scrape_policy_if_modified(
+            "https://example.com/privacy", etag='"v1"', last_modified="Tue, 01 Oct 2024 00:00:00 GMT",
+        ))
+        assert result is None
+        assert requests[-1].headers["if-none-match"] == '"v1"'
+        assert requests[-1].headers["if-modified-since"] == "Tue, 01 Oct 2024 00:00:00 GMT"
+
+    def test_identical_body_returns_none(self, monkeypatch):
+        self._serve(monkeypatch)
+        _, _, _, validators = asyncio.run(scraper.scrape_policy_if_modified("https://example.com/privacy"))
+        # Server ignores validators (new ETag), but the HTML is byte-identical
+        self._serve(monkeypatch, etag='"v2"')
+        result = asyncio.run(scraper.scrape_policy_if_modified(
+            "https://example.com/privacy", etag='"v1"', raw_hash=validators["raw_hash"],
+        ))
+        assert result is None
@@ -89,6 +89,14 @@ class TestAPIKeySecurity:
         key = "test_key_123"
         assert hash_api_key(key) == hash_api_key(key)
 
+    def test_verify_legacy_sha256_hash(self):
+        import hashlib
+        key = generate_api_key()
+        legacy = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        assert hash_api_key(key) != legacy
+        assert verify_api_key(key, legacy) is True
+        assert verify_api_key("wrong_key", legacy) is False
+
 
 class TestBearerToken:
     def test_generate_and_verify(self):
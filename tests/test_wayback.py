@@ -0,0 +1,324 @@
+"""Tests for Wayback Machine seeding helpers."""
+
+import asyncio
+import re
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from app.models import Diff
+from app.services import wayback
+from app.services.differ import compute_full_diff
+from app.services.scraper import compute_hash
+from app.services.wayback import _is_cosmetic
+from app.utils.datetime_helpers import utcnow
+
+
+_PADDING = "We describe how personal information is handled in this section. " * 10
+
+POLICY_URL = "https://example.com/privacy"
+
+
+def _page(sentence):
+    return f"<html><body><main><h1>Privacy Policy</h1><p>{sentence * 10}</p></main></body></html>"
+
+
+class FakeArchive:
+    """Wayback Machine (CDX + archived pages) and live-site HEAD, on a MockTransport."""
+
+    _PAGE_RE = re.compile(r"/web/(\d{14})id_/")
+
+    def __init__(self):
+        self.cdx = {}      # URL variant -> [(timestamp, digest)], or an async callable returning them
+        self.pages = {}    # timestamp -> archived HTML
+        self.etag = None   # live page ETag answered to HEAD
+        self.queued = {"cdx": [], "page": []}  # responses served before the normal ones
+        self.requests = []  # (kind, detail) in arrival order
+
+    def calls(self, kind):
+        return [detail for k, detail in self.requests if k == kind]
+
+    async def handle(self, request):
+        if request.method == "HEAD":
+            self.requests.append(("head", str(request.url)))
+            return httpx.Response(200, headers={"etag": self.etag} if self.etag else {})
+        if request.url.path.startswith("/cdx/"):
+            variant = request.url.params["url"]
+            self.requests.append(("cdx", variant))
+            if self.queued["cdx"]:
+                return self.queued["cdx"].pop(0)
+            rows = self.cdx.get(variant, [])
+            if callable(rows):
+                rows = await rows()
+            header = ["timestamp", "original", "statuscode", "digest"]
+            return httpx.Response(200, json=[header, *([ts, POLICY_URL, "200", d] for ts, d in rows)])
+        timestamp = self._PAGE_RE.search(request.url.path).group(1)
+        self.requests.append(("page", timestamp))
+        if self.queued["page"]:
+            return self.queued["page"].pop(0)
+        return httpx.Response(200, text=self.pages[timestamp], headers={"content-type": "text/html"})
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle), follow_redirects=True)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cdx_cache():
+    wayback._cdx_cache.clear()
+    yield
+    wayback._cdx_cache.clear()
+
+
+@pytest.fixture
+def archive(monkeypatch):
+    """A FakeArchive wired into seed_from_wayback, with the live scrape and alerts stubbed."""
+    fake = FakeArchive()
+    live = "# Privacy Policy\n\n" + "We sell your email address to partners. " * 10
+
+    async def scrape_live(url, *args, **kwargs):
+        return live, compute_hash(live), [], {"etag": '"v1"', "last_modified": None, "raw_hash": "r"}
+
+    async def alert(**kwargs):
+        return True
+
+    monkeypatch.setattr(wayback, "_new_client", fake.client)
+    monkeypatch.setattr(wayback, "scrape_policy_if_modified", scrape_live)
+    monkeypatch.setattr(wayback, "send_alert", alert)
+    return fake
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record asyncio.sleep() delays instead of waiting them out."""
+    recorded = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        recorded.append(delay)
+        await real_sleep(0)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return recorded
+
+
+def _query(archive, coro_fn):
+    async def run():
+        async with archive.client() as client:
+            return await coro_fn(client)
+    return asyncio.run(run())
+
+
+class TestCosmeticDiffs:
+    def test_whitespace_only_change_is_cosmetic(self):
+        old = f"# Policy\n\n## Retention\n\n{_PADDING}We keep logs for 30 days.\n"
+        new = f"# Policy\n\n## Retention\n\n{_PADDING}We  keep logs\tfor 30 days.\n"
+        assert _is_cosmetic(compute_full_diff(old, new)) is True
+
+    def test_wording_change_past_preview_limit_is_not_cosmetic(self):
+        assert len(_PADDING) > 500
+        old = f"# Policy\n\n## Retention\n\n{_PADDING}We keep logs for 30 days.\n"
+        new = f"# Policy\n\n## Retention\n\n{_PADDING}We keep logs forever and sell them.\n"
+        assert _is_cosmetic(compute_full_diff(old, new)) is False
+
+    def test_added_clause_is_not_cosmetic(self):
+        old = "# Policy\n\n## Retention\n\nWe keep logs for 30 days.\n"
+        new = old + "\n## Sharing\n\nWe share logs with partners.\n"
+        assert _is_cosmetic(compute_full_diff(old, new)) is False
+
+
+class TestSeededDiffs:
+    def test_cosmetic_diffs_skip_analysis(self, db_session, make_policy, make_snapshot, monkeypatch):
+        policy = make_policy()
+        start = utcnow() - timedelta(days=30)
+        versions = [
+            f"# Policy\n\n## Retention\n\n{_PADDING}We keep logs for 30 days.\n",
+            f"# Policy\n\n## Retention\n\n{_PADDING}We  keep logs\tfor 30 days.\n",
+            f"# Policy\n\n## Retention\n\n{_PADDING}We keep logs for 90 days.\n",
+        ]
+        for day, text in enumerate(versions):
+            make_snapshot(policy.id, content=text, captured_at=start + timedelta(days=day), is_seed=True)
+
+        analysed = []
+
+        async def batch(items):
+            analysed.extend(item["diff_text"] for item in items)
+            return [{"summary": "Retention extended", "severity": "concerning"} for _ in items]
+        monkeypatch.setattr(wayback, "analyze_diffs_batch", batch)
+
+        created, newest = asyncio.run(wayback._compute_seeded_diffs(db_session, policy, policy.id))
+        db_session.commit()
+
+        assert created == 2
+        assert len(analysed) == 1 and "90 days" in analysed[0]
+        summaries = [d.summary for d in db_session.query(Diff).order_by(Diff.created_at)]
+        assert summaries == [wayback.COSMETIC_CHANGE_ANALYSIS["summary"], "Retention extended"]
+        assert newest.summary == "Retention extended"
+
+
+class TestRetryAfter:
+    @pytest.mark.parametrize("value, expected", [
+        ("7", 7.0),
+        ("3600", wayback.RETRY_AFTER_CAP_SECS),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ("Wed, 21 Oct 2015 07:28:00 -0000", 0.0),  # parses as a naive datetime
+        ("soon", None),
+    ])
+    def test_header_values(self, value, expected):
+        assert wayback._retry_after_secs(httpx.Response(429, headers={"Retry-After": value})) == expected
+
+    def test_ignored_outside_429_and_503(self):
+        assert wayback._retry_after_secs(httpx.Response(500, headers={"Retry-After": "7"})) is None
+
+    @pytest.mark.parametrize("retry_after, wait", [("7", 7.0), ("Wed, 21 Oct 2015 07:28:00 -0000", 0.0)])
+    def test_cdx_retry_waits_for_retry_after(self, archive, sleeps, retry_after, wait):
+        archive.cdx[POLICY_URL] = [("20200101000000", "D1")]
+        archive.queued["cdx"].append(httpx.Response(429, headers={"Retry-After": retry_after}))
+        rows = _query(archive, lambda client: wayback._query_cdx(client, POLICY_URL))
+        assert [r.digest for r in rows] == ["D1"]
+        assert archive.calls("cdx") == [POLICY_URL, POLICY_URL]
+        assert sleeps == [wait]
+
+    def test_page_retry_with_naive_http_date(self, archive, sleeps):
+        archive.pages["20200101000000"] = _page("We collect your email address. ")
+        archive.queued["page"].append(
+            httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 -0000"}),
+        )
+        html = _query(archive, lambda client: wayback._fetch_wayback_page(client, "20200101000000", POLICY_URL))
+        assert "We collect your email address" in html
+        assert sleeps == [0.0]
+
+
+class TestCdxVariants:
+    URL = "https://example.com/legal/privacy/?lang=en"
+
+    def test_variants_are_queried_concurrently_and_original_wins(self, archive):
+        original, no_query = wayback._url_variants(self.URL)[:2]
+        no_query_asked = asyncio.Event()
+
+        async def original_rows():
+            # Only answers once a lower-priority variant was asked too
+            await asyncio.wait_for(no_query_asked.wait(), 1)
+            return [("20200101000000", "ORIG")]
+
+        async def no_query_rows():
+            no_query_asked.set()
+            return [("20210101000000", "NOQUERY")]
+
+        archive.cdx[original] = original_rows
+        archive.cdx[no_query] = no_query_rows
+        rows = _query(archive, lambda client: wayback._query_cdx(client, self.URL))
+        assert [r.digest for r in rows] == ["ORIG"]
+        assert set(archive.calls("cdx")) == set(wayback._url_variants(self.URL))
+
+    def test_first_non_empty_variant_wins_and_the_rest_are_cancelled(self, archive):
+        variants = wayback._url_variants(self.URL)
+        cancelled = []
+
+        async def never():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        archive.cdx[variants[0]] = []
+        archive.cdx[variants[1]] = [("20210101000000", "NOQUERY")]
+        archive.cdx[variants[-1]] = never
+        rows = _query(archive, lambda client: wayback._query_cdx(client, self.URL))
+        assert [r.digest for r in rows] == ["NOQUERY"]
+        assert cancelled == [True]
+
+
+class TestDigestSkip:
+    def test_already_seeded_and_repeated_digests_are_not_fetched(
+        self, archive, db_session, make_policy, make_snapshot,
+    ):
+        policy = make_policy()
+        make_snapshot(policy.id, is_seed=True, wayback_digest="D1")
+        archive.cdx[POLICY_URL] = [
+            ("20220101000000", "D2"), ("20210101000000", "D1"), ("20200101000000", "D2"),
+        ]
+        archive.pages["20220101000000"] = _page("We sell your email address. ")
+
+        captures = _query(archive, lambda client: wayback._fetch_history(client, db_session, POLICY_URL, policy.id))
+
+        assert [entry.digest for entry, *_ in captures] == ["D2"]
+        assert archive.calls("page") == ["20220101000000"]
+
+    def test_reseed_fetches_only_new_captures(self, archive, db_session, make_policy):
+        policy = make_policy()
+        archive.cdx[POLICY_URL] = [("20200101000000", "D1")]
+        archive.pages["20200101000000"] = _page("We collect your email address. ")
+        assert asyncio.run(wayback.seed_from_wayback(policy.id))["status"] == "seeded"
+
+        wayback._cdx_cache.clear()
+        archive.cdx[POLICY_URL] = [("20210101000000", "D2"), ("20200101000000", "D1")]
+        archive.pages["20210101000000"] = _page("We collect your email address and phone. ")
+        archive.etag = '"v2"'  # live page changed, so the HEAD check does not short-circuit
+        result = asyncio.run(wayback.seed_from_wayback(policy.id))
+
+        assert result["snapshots_added"] == 1
+        assert archive.calls("page") == ["20200101000000", "20210101000000"]
+
+
+class TestCdxCache:
+    def _query_single(self, archive, url=POLICY_URL):
+        return _query(archive, lambda client: wayback._query_cdx_single(client, url, wayback.MAX_SNAPSHOTS))
+
+    def test_repeat_query_is_served_from_cache(self, archive):
+        archive.cdx[POLICY_URL] = [("20200101000000", "D1")]
+        first = self._query_single(archive)
+        archive.cdx[POLICY_URL] = [("20210101000000", "D2")]
+        assert self._query_single(archive) == first
+        assert archive.calls("cdx") == [POLICY_URL]
+
+    def test_expired_entry_is_refetched(self, archive):
+        archive.cdx[POLICY_URL] = [("20200101000000", "D1")]
+        self._query_single(archive)
+        key = (POLICY_URL, wayback.MAX_SNAPSHOTS)
+        expiry, rows = wayback._cdx_cache[key]
+        wayback._cdx_cache[key] = (expiry - wayback.CDX_CACHE_TTL_SECS - 1, rows)
+
+        archive.cdx[POLICY_URL] = [("20210101000000", "D2")]
+        assert [r.digest for r in self._query_single(archive)] == ["D2"]
+        assert archive.calls("cdx") == [POLICY_URL, POLICY_URL]
+
+    def test_oldest_entry_is_evicted_when_full(self, archive, monkeypatch):
+        monkeypatch.setattr(wayback, "CDX_CACHE_MAX_ENTRIES", 2)
+        urls = [f"https://example.com/privacy{i}" for i in range(3)]
+        for url in urls:
+            self._query_single(archive, url)
+        assert [url for url, _ in wayback._cdx_cache] == urls[1:]
+
+
+class TestReseedHeadCheck:
+    def _seeded_policy(self, archive, make_policy):
+        policy = make_policy()
+        archive.cdx[POLICY_URL] = [("20200101000000", "D1")]
+        archive.pages["20200101000000"] = _page("We collect your email address. ")
+        assert asyncio.run(wayback.seed_from_wayback(policy.id))["status"] == "seeded"
+        wayback._cdx_cache.clear()
+        archive.requests.clear()
+        return policy
+
+    def test_unchanged_live_page_skips_the_seed(self, archive, make_policy):
+        policy = self._seeded_policy(archive, make_policy)
+        archive.etag = '"v1"'  # matches the live snapshot's stored ETag
+        result = asyncio.run(wayback.seed_from_wayback(policy.id))
+        assert result["status"] == "unchanged"
+        assert [kind for kind, _ in archive.requests] == ["head"]
+
+    def test_changed_live_page_runs_the_full_seed(self, archive, make_policy):
+        policy = self._seeded_policy(archive, make_policy)
+        archive.etag = '"v2"'
+        result = asyncio.run(wayback.seed_from_wayback(policy.id))
+        assert result["status"] == "seeded"
+        assert archive.calls("head") == [POLICY_URL]
+        assert archive.calls("cdx") == [POLICY_URL]
+
+    def test_no_head_request_without_stored_validators(self, archive, db_session, make_policy, make_snapshot):
+        policy = make_policy(seed_status="seeded")
+        make_snapshot(policy.id)
+        asyncio.run(wayback.seed_from_wayback(policy.id))
+        assert archive.calls("head") == []
+        assert archive.calls("cdx") == [POLICY_URL]